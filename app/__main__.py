@@ -0,0 +1,5 @@
+"""``python -m app``: headless CLI (GUI는 main.py)."""
+
+from app.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,368 @@
+"""Headless command-line interface.
+
+GUI 없이 ProcessManager로 렌더링/배치/번역/Premiere XML 내보내기/캐시 관리를 실행한다.
+진행 상황은 한 줄에 JSON 하나씩(NDJSON) 출력하여 다른 스케줄러나 대시보드가 그대로 읽을 수 있게 하고,
+기존 [DEBUG] 로그와 ffmpeg 출력은 stderr로 보낸다.
+
+사용 예::
+
+    python -m app render --title 제목 --artist 가수 --album-art-url URL --youtube-url URL --lrc song.lrc
+    python -m app batch --jobs batch_jobs.json --cpu 2
+    python -m app translate --lrc song.lrc --artist 가수 --title 제목
+    python -m app cache stats
+
+이벤트 공통 필드: ``event``, ``ts``(유닉스 시각), ``elapsed``(명령 시작 후 초).
+작업 이벤트는 ``job``을, 단계/작업 완료 이벤트는 결과 파일 ``path``와 ``bytes``를 포함한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+
+class ProgressStream:
+    """NDJSON 이벤트 출력 (여러 스레드에서 호출해도 줄이 섞이지 않음)"""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        record: Dict[str, Any] = {
+            "event": event,
+            "ts": round(time.time(), 3),
+            "elapsed": round(time.perf_counter() - self._started, 3),
+        }
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def open_event_stream(target: str) -> ProgressStream:
+    """이벤트 출력 대상 열기 ("-"이면 stdout을 이벤트 전용으로 쓰고 나머지 출력은 stderr로 돌림)"""
+    if target != "-":
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        return ProgressStream(open(target, "a", encoding="utf-8", buffering=1))
+
+    sys.stdout.flush()
+    event_fd = os.dup(1)
+    # print()와 ffmpeg 등 하위 프로세스가 fd 1에 쓰는 내용이 이벤트 사이에 섞이지 않도록 함
+    os.dup2(2, 1)
+    return ProgressStream(os.fdopen(event_fd, "w", encoding="utf-8", buffering=1))
+
+
+def _file_size(path: Optional[str]) -> Optional[int]:
+    if path and os.path.isfile(path):
+        return os.path.getsize(path)
+    return None
+
+
+class JobReporter:
+    """ProcessManager의 진행률/단계 콜백을 작업 이름이 붙은 이벤트로 변환"""
+
+    def __init__(self, events: ProgressStream, job: str):
+        self.events = events
+        self.job = job
+        # 마지막으로 시작한 단계 (실패 시 보고용)
+        self.current_stage: Optional[str] = None
+        self._active: List[str] = []
+
+    def progress(self, message: str, percent: int) -> None:
+        stage = self._active[-1] if self._active else None
+        self.events.emit("progress", job=self.job, stage=stage, message=message, percent=percent)
+
+    def stage(self, event) -> None:
+        if event.status == "started":
+            self.current_stage = event.stage
+            self._active.append(event.stage)
+            self.events.emit("stage_started", job=self.job, stage=event.stage)
+        else:
+            if event.stage in self._active:
+                self._active.remove(event.stage)
+            self.events.emit("stage_done", job=self.job, stage=event.stage, seconds=round(event.seconds, 3),
+                             path=event.path, bytes=_file_size(event.path))
+
+
+def _rounded(timings: Dict[str, float]) -> Dict[str, float]:
+    return {name: round(seconds, 3) for name, seconds in timings.items()}
+
+
+def _sources(args: argparse.Namespace):
+    from app.pipeline.sources import offline_sources
+
+    if getattr(args, "offline", False) or getattr(args, "synthetic", 0):
+        latency = getattr(args, "latency", 0.0)
+        return offline_sources(args.audio_seconds, download_latency=latency, translation_latency=latency)
+    return None
+
+
+async def _run_single(args: argparse.Namespace, output_mode: str, events: ProgressStream) -> int:
+    from app.pipeline.process_manager import ProcessConfig, ProcessManager
+
+    config = ProcessConfig(
+        title=args.title,
+        artist=args.artist,
+        album_art_url=args.album_art_url,
+        youtube_url=args.youtube_url,
+        output_mode=output_mode,
+        lrc_path=args.lrc,
+        genie_song_id=args.genie_id,
+        prefer_youtube=args.prefer_youtube,
+        encode_profile=getattr(args, "profile", "standard"),
+        preview_window=tuple(args.window) if getattr(args, "window", None) else None,
+        use_artifact_cache=not args.no_cache,
+        trace_dir=args.trace,
+        workspace_cleanup=args.workspace_cleanup,
+        segment_workers=getattr(args, "segment_workers", None),
+    )
+    job = f"{config.artist} - {config.title}"
+    reporter = JobReporter(events, job)
+    manager = ProcessManager(reporter.progress, sources=_sources(args), on_stage=reporter.stage)
+
+    validation_error = manager.validate_config(config)
+    if validation_error:
+        events.emit("job_failed", job=job, error=validation_error)
+        return 1
+
+    events.emit("job_started", job=job, mode=output_mode)
+    started = time.perf_counter()
+    try:
+        output_path = await manager.process_async(config)
+    except Exception as e:
+        events.emit("job_failed", job=job, error=str(e), stage=reporter.current_stage,
+                    stage_timings=_rounded(manager.stage_timings))
+        return 1
+    events.emit("job_done", job=job, path=output_path, bytes=_file_size(output_path),
+                seconds=round(time.perf_counter() - started, 3), stage_timings=_rounded(manager.stage_timings))
+    return 0
+
+
+async def _run_batch(args: argparse.Namespace, events: ProgressStream) -> int:
+    from app.pipeline.batch_scheduler import (
+        BatchScheduler,
+        apply_journal,
+        load_batch_jobs,
+        resumable_batch_jobs,
+        synthetic_batch_jobs,
+    )
+    from app.pipeline.job_journal import JobJournal
+    from app.pipeline.metrics import get_metrics, translation_dedupe_stats
+    from app.pipeline.resources import RESOURCE_KINDS, ResourceLimits
+
+    journal = None if args.no_journal else JobJournal(args.journal)
+    if args.resume:
+        if journal is None:
+            events.emit("batch_failed", error="--resume은 작업 기록이 필요합니다.")
+            return 1
+        jobs = resumable_batch_jobs(journal)
+    elif args.synthetic:
+        jobs = synthetic_batch_jobs(args.synthetic, args.output_mode)
+    elif not os.path.exists(args.jobs):
+        events.emit("batch_failed", error=f"{args.jobs} not found.")
+        return 1
+    else:
+        jobs = load_batch_jobs(args.jobs, args.output_mode)
+    if journal:
+        apply_journal(jobs, journal, args.fresh)
+
+    reporters = {job.name: JobReporter(events, job.name) for job in jobs}
+
+    def on_job_done(result) -> None:
+        event = {"success": "job_done", "failed": "job_failed", "skipped": "job_skipped"}[result.status]
+        events.emit(event, job=result.name, path=result.output_path, bytes=_file_size(result.output_path),
+                    error=result.error, seconds=round(result.elapsed, 3), queued=round(result.queued, 3),
+                    stage_timings=_rounded(result.stage_timings))
+
+    scheduler = BatchScheduler(
+        ResourceLimits(network=args.network, llm=args.llm, cpu=args.cpu),
+        max_active_jobs=args.max_active,
+        sources=_sources(args),
+        on_progress=lambda name, message, percent: reporters[name].progress(message, percent),
+        journal=journal,
+        on_stage=lambda name, event: reporters[name].stage(event),
+        on_job_done=on_job_done,
+        trace_dir=args.trace,
+        workspace_cleanup=args.workspace_cleanup,
+        segment_workers=args.segment_workers,
+    )
+    events.emit("batch_started", jobs=len(jobs))
+    started = time.perf_counter()
+    lines_before = get_metrics().translation_line_counts()
+    results = await scheduler.run(jobs)
+
+    counts = {status: sum(1 for r in results if r.status == status) for status in ("success", "failed", "skipped")}
+    resources = {
+        kind: {
+            "limit": getattr(scheduler.pools.limits, kind),
+            "acquisitions": scheduler.pools.usage[kind].acquisitions,
+            "busy_seconds": round(scheduler.pools.usage[kind].busy_seconds, 3),
+            "wait_seconds": round(scheduler.pools.usage[kind].wait_seconds, 3),
+        }
+        for kind in RESOURCE_KINDS
+    }
+    translation = translation_dedupe_stats(lines_before, get_metrics().translation_line_counts())
+    events.emit("batch_done", seconds=round(time.perf_counter() - started, 3), resources=resources,
+                translation=translation, **counts)
+    return 1 if counts["failed"] else 0
+
+
+async def _run_translate(args: argparse.Namespace, events: ProgressStream) -> int:
+    from app.config.paths import TEMP_DIR, ensure_data_dirs
+    from app.pipeline.metrics import get_metrics, translation_dedupe_stats
+    from app.pipeline.sources import default_sources
+
+    ensure_data_dirs()
+    sources = _sources(args) or default_sources()
+    output_path = args.output or os.path.join(
+        TEMP_DIR, f"{os.path.splitext(os.path.basename(args.lrc))[0]}_lyrics.json"
+    )
+    job = f"{args.artist} - {args.title}" if args.artist or args.title else os.path.basename(args.lrc)
+    if not os.path.exists(args.lrc):
+        events.emit("job_failed", job=job, error=f"LRC 파일을 찾을 수 없습니다: {args.lrc}")
+        return 1
+
+    events.emit("job_started", job=job, mode="translate")
+    events.emit("stage_started", job=job, stage="translation")
+    started = time.perf_counter()
+    lines_before = get_metrics().translation_line_counts()
+    try:
+        result_path = await sources.translate_lrc(args.lrc, output_path, args.duration, args.artist, args.title)
+    except Exception as e:
+        events.emit("job_failed", job=job, error=str(e), stage="translation")
+        return 1
+    seconds = round(time.perf_counter() - started, 3)
+    events.emit("stage_done", job=job, stage="translation", seconds=seconds, path=result_path,
+                bytes=_file_size(result_path))
+    events.emit("job_done", job=job, path=result_path, bytes=_file_size(result_path), seconds=seconds,
+                translation=translation_dedupe_stats(lines_before, get_metrics().translation_line_counts()))
+    return 0
+
+
+def _add_job_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--title", required=True)
+    parser.add_argument("--artist", required=True)
+    parser.add_argument("--album-art-url", required=True)
+    parser.add_argument("--youtube-url", required=True)
+    parser.add_argument("--lrc", help="LRC 파일 경로 (없으면 가사 색인에서 Genie 곡 ID/아티스트/제목으로 찾음)")
+    parser.add_argument("--genie-id", help="가사 색인 조회용 Genie 곡 ID")
+    parser.add_argument("--prefer-youtube", action="store_true", help="spotDL 대신 YouTube에서 오디오 다운로드")
+    parser.add_argument("--no-cache", action="store_true", help="아티팩트 저장소의 이전 결과를 재사용하지 않음")
+    _add_trace_argument(parser)
+    _add_offline_arguments(parser)
+
+
+def _add_trace_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--trace", metavar="DIR",
+                        help="단계별 구간 기록(JSON)과 Chrome trace를 저장할 폴더")
+    parser.add_argument("--workspace-cleanup", default="always", choices=("always", "on_success", "never"),
+                        help="작업 폴더(TEMP_DIR/jobs/<ID>) 정리 정책 (on_success: 실패/취소 시 중간 파일 유지)")
+
+
+def _add_segment_workers_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--segment-workers", type=int, metavar="N",
+                        help="구간 병렬 인코딩 FFmpeg 프로세스 수 (기본값: 설정/LYRIC_SEGMENT_WORKERS, 1이면 단일 인코딩)")
+
+
+def _add_offline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--offline", action="store_true",
+                        help="네트워크/LLM 없이 합성 오디오·앨범 아트·번역으로 실행")
+    parser.add_argument("--audio-seconds", type=float, default=30.0, help="오프라인 합성 오디오 길이")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from app.config.paths import BATCH_JOURNAL_PATH
+
+    parser = argparse.ArgumentParser(prog="python -m app", description="리릭 비디오 메이커 헤드리스 CLI")
+    parser.add_argument("--events", default="-", metavar="PATH",
+                        help="진행 이벤트(NDJSON) 출력 경로, 기본값은 stdout (로그는 stderr)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="실행 중 Prometheus 지표를 http://127.0.0.1:PORT/metrics 로 제공")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="Prometheus 텍스트 형식 지표를 주기적으로 기록할 파일 (textfile collector용)")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, help="지표 파일 기록 간격(초)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="리릭 비디오 렌더링 (Premiere XML도 함께 생성)")
+    _add_job_arguments(render)
+    render.add_argument("--profile", default="standard", choices=("standard", "still", "preview"),
+                        help="인코딩 프로필")
+    render.add_argument("--preview", action="store_true", help="480p 빠른 미리보기로 렌더링")
+    render.add_argument("--window", type=float, nargs=2, metavar=("START", "END"),
+                        help="미리보기 구간(초), --preview와 함께 사용")
+    _add_segment_workers_argument(render)
+
+    export_xml = commands.add_parser("export-xml", help="Premiere XML만 내보내기")
+    _add_job_arguments(export_xml)
+
+    batch = commands.add_parser("batch", help="작업 목록의 곡들을 동시에 처리")
+    batch.add_argument("--jobs", default="batch_jobs.json", help="작업 목록 JSON 경로")
+    batch.add_argument("--network", type=int, default=4, help="동시 다운로드 수")
+    batch.add_argument("--llm", type=int, default=2, help="동시 번역 호출 수")
+    batch.add_argument("--cpu", type=int, default=1, help="동시 렌더링/인코딩 수")
+    batch.add_argument("--max-active", type=int, default=8, help="동시에 진행 중인 곡 수 상한")
+    batch.add_argument("--output-mode", default="video", choices=("video", "premiere_xml", "preview"))
+    _add_offline_arguments(batch)
+    batch.add_argument("--synthetic", type=int, default=0,
+                       help="작업 파일 대신 가짜 작업 N개 생성 (--offline 포함)")
+    batch.add_argument("--latency", type=float, default=0.0,
+                       help="오프라인 모드에서 다운로드/번역 지연 시간(초)")
+    batch.add_argument("--journal", default=BATCH_JOURNAL_PATH, help="작업 기록(JSONL) 경로")
+    batch.add_argument("--no-journal", action="store_true", help="작업 기록 없이 실행")
+    batch.add_argument("--resume", action="store_true", help="작업 기록에서 중단/실패한 작업을 이어서 처리")
+    batch.add_argument("--fresh", action="store_true", help="완료/중단 기록을 무시하고 모든 단계를 다시 실행")
+    _add_trace_argument(batch)
+    _add_segment_workers_argument(batch)
+
+    translate = commands.add_parser("translate", help="LRC 가사를 번역하여 가사 JSON 생성")
+    translate.add_argument("--lrc", required=True, help="LRC 파일 경로")
+    translate.add_argument("--artist", default="")
+    translate.add_argument("--title", default="")
+    translate.add_argument("--output", help="가사 JSON 저장 경로 (기본값: TEMP_DIR/<LRC 이름>_lyrics.json)")
+    translate.add_argument("--duration", type=float, default=0.0,
+                           help="타임스탬프 없는 가사를 배분할 곡 길이(초)")
+    _add_offline_arguments(translate)
+
+    cache = commands.add_parser("cache", help="아티팩트 저장소 조회/정리 (list, stats, prune, clear)")
+    cache.add_argument("cache_args", nargs=argparse.REMAINDER, help="artifact_store CLI 인자")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "cache":
+        from app.pipeline.artifact_store import main as cache_main
+        return cache_main(args.cache_args)
+
+    from app.pipeline.metrics import start_metrics_exporters
+    from app.pipeline.worker import get_pipeline_worker
+
+    events = open_event_stream(args.events)
+    stop_metrics = start_metrics_exporters(args.metrics_port, args.metrics_file, args.metrics_interval)
+    if args.command in ("render", "export-xml"):
+        mode = "premiere_xml" if args.command == "export-xml" else ("preview" if args.preview else "video")
+        command = _run_single(args, mode, events)
+    elif args.command == "batch":
+        command = _run_batch(args, events)
+    else:
+        command = _run_translate(args, events)
+
+    worker = get_pipeline_worker()
+    try:
+        return worker.run(command)
+    finally:
+        worker.shutdown()
+        stop_metrics()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,10 @@ from app.config.paths import CONFIG_FILE_PATH, ensure_data_dirs
 
 DEFAULT_CONFIG = {
     "translation_model": "gpt-4o-mini",
+    # "partial": 캐시에 없는 줄만 주변 문맥과 함께 번역 / "full": 한 줄이라도 없으면 곡 전체 재번역
+    "translation_mode": "partial",
+    # 부분 번역 시 번역할 줄 앞뒤로 함께 보내는 문맥 줄 수
+    "translation_context_lines": 3,
     "last_artist": "",
     "last_title": "",
     "youtube_upload_enabled": False,
@@ -64,6 +68,27 @@ class ConfigManager:
         """Set translation model"""
         self.set("translation_model", model_id)
 
+    def get_translation_mode(self) -> str:
+        """번역 방식 ("partial" 또는 "full", LYRIC_TRANSLATION_MODE 환경 변수가 우선)"""
+        mode = os.getenv("LYRIC_TRANSLATION_MODE") or self.config.get("translation_mode", "partial")
+        return mode if mode in ("partial", "full") else "partial"
+
+    def get_translation_context_lines(self) -> int:
+        """부분 번역 문맥 줄 수 (LYRIC_TRANSLATION_CONTEXT 환경 변수가 우선)"""
+        value = os.getenv("LYRIC_TRANSLATION_CONTEXT") or self.config.get("translation_context_lines", 3)
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return 3
+
+    def get_segment_workers(self) -> int:
+        """구간 병렬 인코딩에 쓸 FFmpeg 프로세스 수, 1이면 단일 인코딩 (LYRIC_SEGMENT_WORKERS 환경 변수가 우선)"""
+        value = os.getenv("LYRIC_SEGMENT_WORKERS") or self.config.get("segment_workers", 1)
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 1
+
 
 # Global config instance
 _config_manager: Optional[ConfigManager] = None
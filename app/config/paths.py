@@ -7,14 +7,26 @@ from typing import Iterable
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
-DATA_DIR = os.path.join(BASE_DIR, "data")
+# LYRIC_DATA_DIR로 실행 데이터(캐시, 작업 폴더, 출력, 기록) 위치를 바꿀 수 있음 (테스트, 여러 작업 환경 분리)
+DATA_DIR = os.path.abspath(os.getenv("LYRIC_DATA_DIR") or os.path.join(BASE_DIR, "data"))
 TEMP_DIR = os.path.join(DATA_DIR, "temp")
 OUTPUT_DIR = os.path.join(DATA_DIR, "output")
 LYRICS_DIR = os.path.join(DATA_DIR, "lyrics")
 CACHE_DIR = os.path.join(DATA_DIR, "cache")
 CONFIG_DIR = os.path.join(DATA_DIR, "config")
-
-TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translation_cache.json")
+ARTIFACT_DIR = os.path.join(DATA_DIR, "artifacts")
+JOURNAL_DIR = os.path.join(DATA_DIR, "journal")
+BATCH_JOURNAL_PATH = os.path.join(JOURNAL_DIR, "batch.jsonl")
+QUEUE_JOURNAL_PATH = os.path.join(JOURNAL_DIR, "gui_queue.jsonl")
+# 작업별 임시 작업 폴더 (TEMP_DIR/jobs/<작업 ID>)
+JOB_WORKSPACE_DIR = os.path.join(TEMP_DIR, "jobs")
+
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translation_cache.sqlite3")
+# 예전 JSON 번역 캐시 (처음 실행할 때 SQLite로 옮긴 뒤 .migrated로 이름 변경)
+LEGACY_TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translation_cache.json")
+BASE_FRAME_CACHE_DIR = os.path.join(CACHE_DIR, "base_frames")
+LYRICS_INDEX_PATH = os.path.join(CACHE_DIR, "lyrics_index.sqlite3")
+MEDIA_PROBE_CACHE_PATH = os.path.join(CACHE_DIR, "media_probe.sqlite3")
 CONFIG_FILE_PATH = os.path.join(CONFIG_DIR, "config.json")
 
 # FFMPEG paths
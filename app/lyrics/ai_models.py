@@ -3,18 +3,47 @@ AI Model Abstraction Layer for Lyrics Translation
 Supports: OpenAI, DeepSeek, Gemini
 """
 
+import asyncio
 import json
 import os
-from typing import List, Optional
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
 
 
+@dataclass(frozen=True)
+class ContextLine:
+    """부분 번역 시 함께 보내는 주변 줄
+
+    index가 있으면 번역할 줄(lyrics[index])의 위치, 없으면 읽기 전용 문맥 줄이다.
+    translated는 이미 번역된(캐시된) 문맥 줄의 번역문.
+    """
+    text: str
+    translated: Optional[str] = None
+    index: Optional[int] = None
+
+
+# 번역할 줄 주변을 이어 붙인 구간 목록
+TranslationContext = Sequence[Sequence[ContextLine]]
+
+CONTEXT_PROMPT = (
+    "\n"
+    "PARTIAL TRANSLATION:\n"
+    "- 'lyrics' contains ONLY the lines you must translate; the output rules above apply to them.\n"
+    "- 'passages' shows where those lines sit in the song. Entries with 'translate_index' are the lines\n"
+    "  from 'lyrics' with that index. Other entries are READ-ONLY context: use their 'text' (and existing\n"
+    "  'translated' version) to keep meaning, tone and enjambment consistent, but DO NOT output them.\n"
+)
+
+
 class TranslationModel(ABC):
     """Base class for translation models"""
     
     @abstractmethod
-    async def translate(self, lyrics: List[str], artist: str, title: str) -> List[str]:
-        """Translate lyrics using the model"""
+    async def translate(self, lyrics: List[str], artist: str, title: str,
+                        context: Optional[TranslationContext] = None) -> List[str]:
+        """Translate lyrics using the model (context: 번역하지 않는 주변 줄, 부분 번역용)"""
         pass
     
     @abstractmethod
@@ -22,6 +51,33 @@ class TranslationModel(ABC):
         """Check if the model is available (API key exists)"""
         pass
 
+    def _system_prompt(self, context: Optional[TranslationContext]) -> str:
+        prompt = self._get_system_prompt()
+        return prompt + CONTEXT_PROMPT if context else prompt
+
+    @staticmethod
+    def _user_content(lyrics: List[str], artist: str, title: str,
+                      context: Optional[TranslationContext]) -> Dict[str, Any]:
+        # Create indexed lyrics for better AI guidance
+        user_content: Dict[str, Any] = {
+            "context": f"Artist: {artist}, Title: {title}",
+            "lyrics": [{"index": i, "text": line} for i, line in enumerate(lyrics)],
+        }
+        if context:
+            user_content["passages"] = [
+                [{"translate_index": line.index} if line.index is not None
+                 else {"text": line.text, **({"translated": line.translated} if line.translated else {})}
+                 for line in passage]
+                for passage in context
+            ]
+        return user_content
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections held by the client"""
+        close = getattr(self.client, "close", None) if getattr(self, "client", None) else None
+        if close and asyncio.iscoroutinefunction(close):
+            await close()
+
 
 class OpenAIModel(TranslationModel):
     """OpenAI GPT models"""
@@ -41,19 +97,13 @@ class OpenAIModel(TranslationModel):
     def is_available(self) -> bool:
         return self.client is not None
     
-    async def translate(self, lyrics: List[str], artist: str, title: str) -> List[str]:
+    async def translate(self, lyrics: List[str], artist: str, title: str,
+                        context: Optional[TranslationContext] = None) -> List[str]:
         if not self.client:
             return lyrics
         
-        system_prompt = self._get_system_prompt()
-        
-        # Create indexed lyrics for better AI guidance
-        indexed_lyrics = [{"index": i, "text": line} for i, line in enumerate(lyrics)]
-        
-        user_content = {
-            "context": f"Artist: {artist}, Title: {title}",
-            "lyrics": indexed_lyrics
-        }
+        system_prompt = self._system_prompt(context)
+        user_content = self._user_content(lyrics, artist, title, context)
         
         try:
             response = await self.client.chat.completions.create(
@@ -156,19 +206,13 @@ class DeepSeekModel(TranslationModel):
     def is_available(self) -> bool:
         return self.client is not None
     
-    async def translate(self, lyrics: List[str], artist: str, title: str) -> List[str]:
+    async def translate(self, lyrics: List[str], artist: str, title: str,
+                        context: Optional[TranslationContext] = None) -> List[str]:
         if not self.client:
             return lyrics
         
-        system_prompt = self._get_system_prompt()
-        
-        # Create indexed lyrics for better AI guidance
-        indexed_lyrics = [{"index": i, "text": line} for i, line in enumerate(lyrics)]
-        
-        user_content = {
-            "context": f"Artist: {artist}, Title: {title}",
-            "lyrics": indexed_lyrics
-        }
+        system_prompt = self._system_prompt(context)
+        user_content = self._user_content(lyrics, artist, title, context)
         
         try:
             response = await self.client.chat.completions.create(
@@ -263,19 +307,13 @@ class GeminiModel(TranslationModel):
     def is_available(self) -> bool:
         return self.client is not None
     
-    async def translate(self, lyrics: List[str], artist: str, title: str) -> List[str]:
+    async def translate(self, lyrics: List[str], artist: str, title: str,
+                        context: Optional[TranslationContext] = None) -> List[str]:
         if not self.client:
             return lyrics
         
-        system_prompt = self._get_system_prompt()
-        
-        # Create indexed lyrics for better AI guidance
-        indexed_lyrics = [{"index": i, "text": line} for i, line in enumerate(lyrics)]
-        
-        user_content = {
-            "context": f"Artist: {artist}, Title: {title}",
-            "lyrics": indexed_lyrics
-        }
+        system_prompt = self._system_prompt(context)
+        user_content = self._user_content(lyrics, artist, title, context)
         
         prompt = f"{system_prompt}\n\n{json.dumps(user_content, ensure_ascii=False)}"
         
@@ -376,3 +414,41 @@ def create_model(model_id: str) -> Optional[TranslationModel]:
         _, factory = AVAILABLE_MODELS[model_id]
         return factory()
     return None
+
+
+# 이벤트 루프별로 재사용하는 모델 인스턴스 (AsyncOpenAI의 HTTP 연결 풀은 생성된 루프에 묶임)
+_model_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, TranslationModel]]" = (
+    weakref.WeakKeyDictionary()
+)
+_KEY_ENV_VARS = ("OPENAI_API_KEY", "DEEPSEEK_API_KEY", "DEEPSEEK_BASE_URL", "GEMINI_API_KEY")
+
+
+def get_model(model_id: str) -> Optional[TranslationModel]:
+    """Return a model instance pooled for the running event loop
+
+    같은 루프(파이프라인 워커)에서 번역하는 곡들은 클라이언트와 연결을 공유한다.
+    API 키가 바뀌면 새 인스턴스를 만든다.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return create_model(model_id)
+
+    pool = _model_pools.setdefault(loop, {})
+    key = (model_id,) + tuple(os.getenv(name, "") for name in _KEY_ENV_VARS)
+    model = pool.get(key)
+    if model is None:
+        model = create_model(model_id)
+        if model is not None and model.is_available():
+            pool[key] = model
+    return model
+
+
+async def close_pooled_models() -> None:
+    """Close every model pooled for the running event loop"""
+    pool = _model_pools.pop(asyncio.get_running_loop(), {})
+    for model in pool.values():
+        try:
+            await model.aclose()
+        except Exception as e:
+            print(f"[WARN] 번역 모델 클라이언트 종료 실패: {e}")
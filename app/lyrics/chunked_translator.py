@@ -0,0 +1,115 @@
+"""Chunked, concurrent translation on top of TranslationModel.
+
+긴 가사를 한 번의 요청으로 보내면 출력 길이 제한에 걸려 줄 수가 맞지 않고("Translation count mismatch"),
+응답 시간도 곡 길이에 비례해 늘어난다. 가사를 ``chunk_lines``줄씩 나누고 앞뒤로 ``overlap``줄을 겹쳐
+보내(경계에서 끊긴 문장의 문맥 유지) 최대 ``concurrency``개를 동시에 번역한 뒤, 각 구간에서 겹친 줄을 버리고
+자기 몫의 줄만 인덱스대로 이어 붙인다. 곡이 길어져도 지연 시간은 구간 하나를 번역하는 시간 수준으로 유지된다.
+
+구간 크기/겹침/동시 요청 수는 ``LYRIC_TRANSLATION_CHUNK_LINES``, ``LYRIC_TRANSLATION_CHUNK_OVERLAP``,
+``LYRIC_TRANSLATION_CONCURRENCY`` 환경 변수로 바꿀 수 있다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+from app.lyrics.ai_models import ContextLine, TranslationContext, TranslationModel
+from app.pipeline.timing import span
+
+DEFAULT_CHUNK_LINES = 40
+DEFAULT_CHUNK_OVERLAP = 4
+DEFAULT_CONCURRENCY = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    env_value = os.getenv(name)
+    if env_value and env_value.strip().isdigit():
+        return int(env_value)
+    return default
+
+
+@dataclass(frozen=True)
+class ChunkingOptions:
+    """구간 나누기 설정"""
+    chunk_lines: int = DEFAULT_CHUNK_LINES
+    overlap: int = DEFAULT_CHUNK_OVERLAP
+    concurrency: int = DEFAULT_CONCURRENCY
+
+    @classmethod
+    def from_env(cls) -> "ChunkingOptions":
+        return cls(
+            chunk_lines=max(1, _env_int("LYRIC_TRANSLATION_CHUNK_LINES", DEFAULT_CHUNK_LINES)),
+            overlap=_env_int("LYRIC_TRANSLATION_CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP),
+            concurrency=max(1, _env_int("LYRIC_TRANSLATION_CONCURRENCY", DEFAULT_CONCURRENCY)),
+        )
+
+
+def chunk_windows(line_count: int, chunk_lines: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """(요청 시작, 요청 끝, 사용할 시작, 사용할 끝) 목록, 사용할 구간은 서로 겹치지 않고 전체를 덮음"""
+    windows = []
+    for start in range(0, line_count, chunk_lines):
+        end = min(line_count, start + chunk_lines)
+        windows.append((max(0, start - overlap), min(line_count, end + overlap), start, end))
+    return windows
+
+
+def _window_context(context: Optional[TranslationContext], start: int, end: int) -> Optional[TranslationContext]:
+    """부분 번역 문맥 중 이 구간의 줄이 들어 있는 구절만 골라 인덱스를 구간 기준으로 바꿈"""
+    if not context:
+        return None
+    passages = []
+    for passage in context:
+        if not any(line.index is not None and start <= line.index < end for line in passage):
+            continue
+        passages.append([
+            replace(line, index=line.index - start) if line.index is not None and start <= line.index < end
+            # 다른 구간에서 번역하는 줄은 이 요청에서는 원문만 보이는 문맥
+            else ContextLine(line.text, translated=line.translated)
+            for line in passage
+        ])
+    return passages or None
+
+
+class ChunkedTranslator:
+    """TranslationModel 앞에서 가사를 겹치는 구간으로 나눠 동시에 번역"""
+
+    def __init__(self, model: TranslationModel, options: Optional[ChunkingOptions] = None):
+        self.model = model
+        self.options = options or ChunkingOptions.from_env()
+
+    async def translate(self, lyrics: List[str], artist: str, title: str,
+                        context: Optional[TranslationContext] = None) -> List[str]:
+        options = self.options
+        if len(lyrics) <= options.chunk_lines:
+            return await self.model.translate(lyrics, artist, title, context=context)
+
+        windows = chunk_windows(len(lyrics), options.chunk_lines, options.overlap)
+        print(f"[DEBUG] 가사 {len(lyrics)}줄을 {len(windows)}개 구간으로 나눠 번역 "
+              f"(구간 {options.chunk_lines}줄, 겹침 {options.overlap}줄, 동시 {options.concurrency}개)")
+        semaphore = asyncio.Semaphore(options.concurrency)
+
+        async def translate_window(window: Tuple[int, int, int, int]) -> List[str]:
+            request_start, request_end, keep_start, keep_end = window
+            lines = lyrics[request_start:request_end]
+            async with semaphore:
+                with span("translate_chunk", lines=len(lines)):
+                    translated = await self.model.translate(
+                        lines, artist, title, context=_window_context(context, request_start, request_end))
+            if len(translated) != len(lines):
+                # 이 구간만 번역 없이 둠 (빈 문자열은 캐시에 저장되지 않고 원문으로 표시됨)
+                print(f"[WARN] Translation count mismatch in lines {keep_start}-{keep_end - 1}: "
+                      f"Input {len(lines)} vs Output {len(translated)}")
+                return [""] * (keep_end - keep_start)
+            return translated[keep_start - request_start:keep_end - request_start]
+
+        results = await asyncio.gather(*(translate_window(window) for window in windows), return_exceptions=True)
+        stitched: List[str] = []
+        for (_, _, keep_start, keep_end), result in zip(windows, results):
+            if isinstance(result, BaseException):
+                print(f"[ERROR] 구간 번역 실패 (lines {keep_start}-{keep_end - 1}): {result}")
+                result = [""] * (keep_end - keep_start)
+            stitched.extend(result)
+        return stitched
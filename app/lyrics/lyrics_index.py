@@ -0,0 +1,280 @@
+"""SQLite index of the local LRC library.
+
+LRC 파일을 Genie 곡 ID, 정규화한 아티스트/제목, 내용 해시로 찾을 수 있도록
+``CACHE_DIR/lyrics_index.sqlite3``에 기록한다. GUI에서 Genie 가사를 받거나 싱크 창에서 LRC를 저장할 때
+바로 등록하므로, 작업마다 가사 폴더 전체를 listdir/stat/정렬하지 않고 색인 조회 한 번으로 정확한 파일을 찾는다.
+
+앱 밖에서 가사 폴더에 넣은 파일은 폴더 수정 시각이 바뀌었을 때만 새 이름/사라진 이름을 반영한다.
+파일 이름이 ``<숫자>.lrc``면 Genie 곡 ID로, ``<아티스트> - <제목>.lrc``면 아티스트/제목으로 등록한다.
+
+CLI: ``python -m app.lyrics.lyrics_index {scan,find,stats}``
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config.paths import LEGACY_LYRICS_DIR, LYRICS_DIR, LYRICS_INDEX_PATH
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lrc_files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    genie_song_id TEXT,
+    artist_key TEXT,
+    title_key TEXT,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lrc_files_genie ON lrc_files (genie_song_id);
+CREATE INDEX IF NOT EXISTS lrc_files_song ON lrc_files (artist_key, title_key);
+CREATE INDEX IF NOT EXISTS lrc_files_hash ON lrc_files (content_hash);
+CREATE INDEX IF NOT EXISTS lrc_files_indexed_at ON lrc_files (indexed_at);
+CREATE TABLE IF NOT EXISTS scanned_dirs (
+    dir TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+def song_key(value: Optional[str]) -> Optional[str]:
+    """아티스트/제목 비교용 정규화 (대소문자, 공백 차이 무시)"""
+    if not value:
+        return None
+    normalized = " ".join(value.split()).casefold()
+    return normalized or None
+
+
+def lrc_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _keys_from_filename(path: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """파일 이름에서 (Genie 곡 ID, 아티스트, 제목) 추정"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.isdigit():
+        return stem, None, None
+    if " - " in stem:
+        artist, title = stem.split(" - ", 1)
+        return None, artist, title
+    return None, None, None
+
+
+class LyricsIndex:
+    """LRC 파일 색인 (여러 스레드에서 하나의 연결을 잠금으로 공유)"""
+
+    def __init__(self, path: str = LYRICS_INDEX_PATH, lyrics_dirs: Optional[Sequence[str]] = None):
+        self.path = path
+        self.lyrics_dirs = list(lyrics_dirs) if lyrics_dirs is not None else [LYRICS_DIR, LEGACY_LYRICS_DIR]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript("DROP TABLE IF EXISTS lrc_files; DROP TABLE IF EXISTS scanned_dirs;")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # 등록 ------------------------------------------------------------------
+
+    def register(self, path: str, genie_song_id: Optional[str] = None, artist: Optional[str] = None,
+                 title: Optional[str] = None) -> None:
+        """LRC 파일을 색인에 추가/갱신 (저장 직후 호출)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        guessed_id, guessed_artist, guessed_title = _keys_from_filename(path)
+        genie_song_id = str(genie_song_id) if genie_song_id else guessed_id
+        artist_key = song_key(artist) or song_key(guessed_artist)
+        title_key = song_key(title) or song_key(guessed_title)
+        content_hash = lrc_digest(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lrc_files "
+                "(path, dir, genie_song_id, artist_key, title_key, content_hash, size, mtime, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, os.path.dirname(path), genie_song_id, artist_key, title_key, content_hash,
+                 stat.st_size, stat.st_mtime, time.time()),
+            )
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lrc_files WHERE path = ?", (os.path.abspath(path),))
+
+    def refresh(self, force: bool = False) -> int:
+        """수정 시각이 바뀐 가사 폴더만 다시 읽어 새 파일 등록/사라진 파일 삭제, 반영한 파일 수 반환"""
+        changed = 0
+        for lyrics_dir in self.lyrics_dirs:
+            lyrics_dir = os.path.abspath(lyrics_dir)
+            try:
+                dir_mtime = os.stat(lyrics_dir).st_mtime
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                row = self._conn.execute("SELECT mtime FROM scanned_dirs WHERE dir = ?", (lyrics_dir,)).fetchone()
+            if row and row[0] == dir_mtime and not force:
+                continue
+            changed += self._scan_dir(lyrics_dir, force)
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO scanned_dirs (dir, mtime) VALUES (?, ?)",
+                                   (lyrics_dir, dir_mtime))
+        return changed
+
+    def _scan_dir(self, lyrics_dir: str, rehash: bool) -> int:
+        on_disk = {os.path.join(lyrics_dir, name) for name in os.listdir(lyrics_dir) if name.endswith(".lrc")}
+        with self._lock:
+            indexed = {path for (path,) in
+                       self._conn.execute("SELECT path FROM lrc_files WHERE dir = ?", (lyrics_dir,))}
+        changed = 0
+        for path in sorted(on_disk - indexed if not rehash else on_disk):
+            try:
+                self._register_scanned(path, rehash)
+                changed += 1
+            except OSError as e:
+                print(f"[WARN] 가사 색인 등록 실패 ({path}): {e}")
+        for path in indexed - on_disk:
+            self.remove(path)
+            changed += 1
+        if changed:
+            print(f"[DEBUG] 가사 색인 갱신: {lyrics_dir} ({changed}개)")
+        return changed
+
+    def _register_scanned(self, path: str, rehash: bool) -> None:
+        """폴더 검사로 찾은 파일 등록 (GUI가 등록한 Genie ID/아티스트/제목은 유지)"""
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime FROM lrc_files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            self.register(path)
+            return
+        stat = os.stat(path)
+        if not rehash and tuple(row) == (stat.st_size, stat.st_mtime):
+            return
+        with self._lock:
+            self._conn.execute("UPDATE lrc_files SET content_hash = ?, size = ?, mtime = ?, indexed_at = ? "
+                               "WHERE path = ?", (lrc_digest(path), stat.st_size, stat.st_mtime, time.time(), path))
+
+    # 조회 ------------------------------------------------------------------
+
+    def find(self, genie_song_id: Optional[str] = None, artist: Optional[str] = None,
+             title: Optional[str] = None, content_hash: Optional[str] = None) -> Optional[str]:
+        """Genie 곡 ID → 아티스트/제목 → 내용 해시 순으로 찾은 가장 최근 LRC 경로 (없으면 None)"""
+        self.refresh()
+        queries: List[Tuple[str, Tuple[object, ...]]] = []
+        if genie_song_id:
+            queries.append(("genie_song_id = ?", (str(genie_song_id),)))
+        if song_key(artist) and song_key(title):
+            queries.append(("artist_key = ? AND title_key = ?", (song_key(artist), song_key(title))))
+        if content_hash:
+            queries.append(("content_hash = ?", (content_hash,)))
+        for where, params in queries:
+            path = self._first_existing(where, params)
+            if path:
+                return path
+        return None
+
+    def latest(self) -> Optional[str]:
+        """가장 최근에 등록된 LRC 경로"""
+        self.refresh()
+        return self._first_existing("1 = 1", ())
+
+    def content_hash(self, path: str) -> str:
+        """색인된 크기/수정 시각이 그대로면 저장된 내용 해시, 아니면 다시 계산 (색인된 파일이면 갱신)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash, size, mtime FROM lrc_files WHERE path = ?",
+                                     (path,)).fetchone()
+        if row is None:
+            # 가사 폴더 밖의 파일(임시 LRC 등)은 최근 파일 조회에 섞이지 않도록 등록하지 않음
+            return lrc_digest(path)
+        if (row[1], row[2]) != (stat.st_size, stat.st_mtime):
+            self._register_scanned(path, rehash=True)
+            return self.content_hash(path)
+        return row[0]
+
+    def _first_existing(self, where: str, params: Tuple[object, ...]) -> Optional[str]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT path FROM lrc_files WHERE {where} ORDER BY indexed_at DESC",
+                                      params).fetchall()
+        for (path,) in rows:
+            if os.path.exists(path):
+                return path
+            # 앱이 실행 중인 동안 지워진 파일
+            self.remove(path)
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            total, with_id, with_song = self._conn.execute(
+                "SELECT COUNT(*), COUNT(genie_song_id), COUNT(title_key) FROM lrc_files").fetchone()
+        return {"files": total, "genie_song_id": with_id, "artist_title": with_song}
+
+
+_lyrics_index: Optional[LyricsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lyrics_index() -> LyricsIndex:
+    """프로세스 전역 가사 색인"""
+    global _lyrics_index
+    with _index_lock:
+        if _lyrics_index is None:
+            _lyrics_index = LyricsIndex()
+        return _lyrics_index
+
+
+def register_lrc(path: str, genie_song_id: Optional[str] = None, artist: Optional[str] = None,
+                 title: Optional[str] = None) -> None:
+    """LRC 저장 직후 색인 등록 (실패해도 저장 흐름은 계속)"""
+    try:
+        get_lyrics_index().register(path, genie_song_id=genie_song_id, artist=artist, title=title)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARN] 가사 색인 등록 실패 ({path}): {e}")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.lyrics.lyrics_index", description="가사(LRC) 색인 관리")
+    parser.add_argument("--index", default=LYRICS_INDEX_PATH, help="색인 파일 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("scan", help="가사 폴더 전체를 다시 검사 (내용 해시 재계산)")
+    find_parser = commands.add_parser("find", help="곡 ID 또는 아티스트/제목으로 LRC 찾기")
+    find_parser.add_argument("--genie-id")
+    find_parser.add_argument("--artist")
+    find_parser.add_argument("--title")
+    commands.add_parser("stats", help="색인된 파일 수")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    index = LyricsIndex(args.index)
+    if args.command == "scan":
+        print(f"{index.refresh(force=True)}개 파일 반영")
+    elif args.command == "find":
+        path = index.find(args.genie_id, args.artist, args.title)
+        print(path or "찾을 수 없습니다")
+        return 0 if path else 1
+    else:
+        for name, count in index.stats().items():
+            print(f"{name:<14} {count:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,26 +2,32 @@ import json
 import os
 import re
 import traceback
+from dataclasses import replace
 from itertools import zip_longest
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Literal, Optional, Tuple
 
-from app.config.paths import TRANSLATION_CACHE_PATH, ensure_data_dirs
+from app.lyrics.ai_models import ContextLine, TranslationContext
+from app.lyrics.chunked_translator import ChunkedTranslator
+from app.lyrics.translation_cache import get_translation_cache
+from app.pipeline.metrics import get_metrics
+from app.pipeline.timing import span
 
 try:
     from dotenv import load_dotenv
 except ImportError:  # pragma: no cover - 선택적 의존성
     load_dotenv = lambda: None
 
-try:
-    from pydub import AudioSegment  # 오디오 길이 측정을 위해 필요 (pip install pydub)
-except ImportError:  # pragma: no cover - 선택적 의존성
-    AudioSegment = None
-
 try:
     from openai import AsyncOpenAI
 except ImportError:  # pragma: no cover - 선택적 의존성
     AsyncOpenAI = None
 
+# (가사 줄 목록, 아티스트, 제목) -> 번역 줄 목록
+Translator = Callable[[List[str], Optional[str], Optional[str]], Awaitable[List[str]]]
+TranslationMode = Literal["partial", "full"]
+# clean_translation이 한글만 남은 결과(번역 실패)에 돌려주는 값
+TRANSLATION_ERROR = "Translation Error"
+
 # 환경변수(.env) 로드 및 OpenAI API 키 설정
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -29,55 +35,37 @@ client = None
 if AsyncOpenAI and OPENAI_API_KEY:
     client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
-_translation_cache: Optional[Dict[str, str]] = None
-
-def _ensure_cache_loaded() -> None:
-    global _translation_cache
-    if _translation_cache is not None:
-        return
-
-    ensure_data_dirs()
-    try:
-        if os.path.exists(TRANSLATION_CACHE_PATH):
-            with open(TRANSLATION_CACHE_PATH, "r", encoding="utf-8") as cache_file:
-                _translation_cache = json.load(cache_file)
-        else:
-            _translation_cache = {}
-    except Exception:
-        _translation_cache = {}
-
-
-def _save_cache() -> None:
-    if _translation_cache is None:
-        return
-
-    ensure_data_dirs()
-    os.makedirs(os.path.dirname(TRANSLATION_CACHE_PATH), exist_ok=True)
-    with open(TRANSLATION_CACHE_PATH, "w", encoding="utf-8") as cache_file:
-        json.dump(_translation_cache, cache_file, ensure_ascii=False, indent=2)
 
+async def translate_lyrics(lyrics: List[str], artist: Optional[str] = None,
+                           title: Optional[str] = None, mode: Optional[TranslationMode] = None,
+                           context_lines: Optional[int] = None) -> List[str]:
+    """가사를 문맥 기반으로 자연스럽게 영어 의역 (artist/title이 없으면 환경 변수 사용)
 
-def _get_cached_translation(lyric: str) -> Optional[str]:
-    _ensure_cache_loaded()
-    assert _translation_cache is not None
-    return _translation_cache.get(lyric)
-
-
-def _update_cache(original: str, translated: str) -> None:
-    _ensure_cache_loaded()
-    assert _translation_cache is not None
-    _translation_cache[original] = translated
-
-
-async def translate_lyrics(lyrics: List[str]) -> List[str]:
-    """가사를 문맥 기반으로 자연스럽게 영어 의역"""
+    mode="partial"(기본값)이면 캐시에 없는 줄만 앞뒤 context_lines줄의 원문/번역을 읽기 전용 문맥으로
+    붙여 번역하고, mode="full"이면 한 줄이라도 캐시에 없을 때 곡 전체를 다시 번역한다.
+    None이면 설정(get_translation_mode / get_translation_context_lines)을 따른다.
+    """
     if not lyrics:
         return []
 
+    if mode is None or context_lines is None:
+        from app.config.config_manager import get_config
+
+        config = get_config()
+        mode = mode or config.get_translation_mode()
+        context_lines = config.get_translation_context_lines() if context_lines is None else context_lines
+
     # 1. Check cache and identify pending lines
     results: List[Optional[str]] = []
     pending_indices: List[int] = []
     pending_lyrics: List[str] = []
+    translatable = 0
+
+    # 곡에 필요한 줄만 한 번에 조회
+    cache = get_translation_cache()
+    cached_lines = cache.get_many(
+        lyric.strip() for lyric in lyrics if lyric.strip() and not is_english(lyric.strip())
+    )
 
     for idx, lyric in enumerate(lyrics):
         stripped = lyric.strip()
@@ -89,10 +77,9 @@ async def translate_lyrics(lyrics: List[str]) -> List[str]:
             results.append(stripped)
             continue
 
-        # For better context, we might want to re-translate even if cached,
-        # but to save costs/time, we'll use cache if available.
-        # If the user wants to force re-translation, they can clear the cache.
-        cached = _get_cached_translation(stripped)
+        translatable += 1
+        cached = cached_lines.get(stripped)
+        get_metrics().translation_cache.inc(result="hit" if cached else "miss")
         if cached:
             results.append(cached)
             continue
@@ -101,60 +88,40 @@ async def translate_lyrics(lyrics: List[str]) -> List[str]:
         pending_indices.append(idx)
         pending_lyrics.append(stripped)
 
-    # 2. Translate pending lines with full context
+    # 2. Translate pending lines
     if pending_lyrics and client:
         try:
-            # We send the *full* original lyrics as context, but ask to translate only the pending ones?
-            # Actually, to get the best context, we should probably send the whole song
-            # and ask for the whole song back, or at least the relevant parts.
-            # But that might be expensive if we only need a few lines.
-            # However, the user asked for "better context".
-            # Let's try to translate the *pending* lines, but provide the *surrounding* lines as context if possible.
-            # Or simpler: Just send the list of pending lyrics.
-            # Wait, if we just send pending lyrics [Line 1, Line 5, Line 10], we lose context.
-            # The best way for "context" is to send the WHOLE block of lyrics that needs translation.
-            # If the cache is sparse (some lines cached, some not), it's tricky.
-            # Let's assume for "better translation" we should prioritize the batch translation.
-            
-            # Strategy: If there are pending lines, we will send the *entire* input list to the LLM
-            # to ensure full context, but we only *use* (and pay attention to) the lines we need?
-            # No, that's wasteful if 90% is cached.
-            
-            # Compromise: Send the pending lyrics list. 
-            # BUT the user specifically asked for "context-aware".
-            # If I just send isolated pending lines, I lose context.
-            # Let's try to send the *entire* lyrics list to the API if we have *any* pending lines,
-            # and just update the cache for all of them. 
-            # This ensures consistency.
-            
-            # However, to avoid re-translating already English lines or empty lines,
-            # we can filter those out or just include them and let the LLM handle it.
-            
-            # Let's go with: Send ALL lyrics to OpenAI to get the best flow.
-            # We will ignore the cache for the purpose of generating the translation context,
-            # but we can still respect the cache if we want. 
-            # Given the user request "fix translation to be more natural", 
-            # re-translating everything is probably safer to ensure flow.
-            # Let's overwrite the results with the new full-context translation.
-            
-            translations = await _translate_with_openai(lyrics)
-            
-            # Update results and cache
-            # We map back to the original indices
-            if len(translations) == len(lyrics):
-                results = translations
-                for original, translated in zip(lyrics, translations):
-                    if original.strip() and not is_english(original.strip()):
-                        _update_cache(original.strip(), translated)
+            if mode == "full" or len(pending_lyrics) == translatable:
+                # 곡 전체를 한 번에 보내 흐름을 맞춤 (전부 캐시에 없으면 부분 번역과 같은 요청)
+                translations = await _translate_with_openai(lyrics, artist, title)
+                if translations is None:
+                    print("[WARN] 번역 실패, 캐시에 있는 번역과 원문 유지")
+                elif len(translations) == len(lyrics):
+                    # 번역하지 못한 줄(빈 결과)은 기존 캐시 번역/원문 유지
+                    results = [translated or current for translated, current in zip(translations, results)]
+                    cache.put_many(_cacheable_translations(
+                        (original.strip(), translated)
+                        for original, translated in zip(lyrics, translations)
+                        if original.strip() and not is_english(original.strip())
+                    ))
+                else:
+                    print(f"[WARN] Translation count mismatch: Input {len(lyrics)} vs Output {len(translations)}")
+                    results = translations[:len(lyrics)] + [lyrics[i] for i in range(len(translations), len(lyrics))]
             else:
-                # Fallback if counts don't match: try to map pending only?
-                # If counts don't match, we might have an issue.
-                # Let's just fill in what we can or fallback to original.
-                print(f"[WARN] Translation count mismatch: Input {len(lyrics)} vs Output {len(translations)}")
-                # Try to use what we have? Or just return original for mismatch.
-                # Let's try to use the pending logic as a fallback if the full batch fails?
-                # No, let's just return the translations we got, padded or truncated.
-                results = translations[:len(lyrics)] + [lyrics[i] for i in range(len(translations), len(lyrics))]
+                context = _context_passages(lyrics, results, pending_indices, context_lines)
+                context_size = sum(len(passage) for passage in context) - len(pending_lyrics)
+                print(f"[DEBUG] 부분 번역: {len(pending_lyrics)}/{translatable}줄 (문맥 {context_size}줄)")
+                translations = await _translate_with_openai(pending_lyrics, artist, title, context=context or None)
+                if translations is None:
+                    print("[WARN] 번역 실패, 캐시에 없는 줄은 원문 유지")
+                elif len(translations) == len(pending_lyrics):
+                    for idx, translated in zip(pending_indices, translations):
+                        results[idx] = translated or None
+                    cache.put_many(_cacheable_translations(zip(pending_lyrics, translations)))
+                else:
+                    # 줄 수가 맞지 않으면 어느 줄의 번역인지 알 수 없으므로 원문 유지
+                    print(f"[WARN] Translation count mismatch: Input {len(pending_lyrics)} "
+                          f"vs Output {len(translations)}")
 
         except Exception as exc:
             print(f"[DEBUG] Translation service failed: {exc}")
@@ -169,35 +136,110 @@ async def translate_lyrics(lyrics: List[str]) -> List[str]:
         else:
             final_output.append(res)
 
-    if pending_indices or (client and lyrics): # Save if we did anything
-        _save_cache()
-
     return final_output
 
 
-async def _translate_with_openai(lyrics: List[str]) -> List[str]:
-    """Translate lyrics using selected AI model"""
+def _cacheable_translations(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """실제로 번역된 줄만 캐시에 저장 (빈 결과, 원문 그대로, 번역 실패 표시는 다음 실행 때 다시 번역)"""
+    return [
+        (source, translated) for source, translated in pairs
+        if translated and translated.strip() != source.strip() and translated != TRANSLATION_ERROR
+    ]
+
+
+def _context_passages(lyrics: List[str], results: List[Optional[str]], pending_indices: List[int],
+                      context_lines: int) -> List[List[ContextLine]]:
+    """번역할 줄마다 앞뒤 context_lines줄을 붙이고, 겹치거나 맞닿은 구간은 하나로 합침"""
+    if context_lines <= 0:
+        return []
+    position = {idx: pos for pos, idx in enumerate(pending_indices)}
+    ranges: List[List[int]] = []
+    for idx in pending_indices:
+        start, end = max(0, idx - context_lines), min(len(lyrics), idx + context_lines + 1)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+
+    passages: List[List[ContextLine]] = []
+    for start, end in ranges:
+        passage = []
+        for idx in range(start, end):
+            text = lyrics[idx].strip()
+            if not text:
+                continue
+            if idx in position:
+                passage.append(ContextLine(text, index=position[idx]))
+            else:
+                passage.append(ContextLine(text, translated=results[idx] if results[idx] != text else None))
+        passages.append(passage)
+    return passages
+
+
+def normalize_lyric_line(text: str) -> str:
+    """중복 비교용 정규화 (앞뒤/연속 공백, 대소문자 차이 무시)"""
+    return " ".join(text.split()).casefold()
+
+
+def dedupe_lyric_lines(lyrics: List[str], context: Optional[TranslationContext] = None
+                       ) -> Tuple[List[str], List[int], Optional[TranslationContext]]:
+    """정규화하면 같은 줄을 첫 번째 줄 하나로 합침
+
+    (고유 줄 목록, 원래 줄마다 고유 줄 위치, 고유 줄 기준으로 바꾼 문맥)을 반환한다.
+    문맥에서는 첫 번째로 나온 줄만 번역 대상으로 남기고 반복된 줄은 읽기 전용 문맥으로 바꾼다.
+    """
+    first_slot: Dict[str, int] = {}
+    unique: List[str] = []
+    slots: List[int] = []
+    for line in lyrics:
+        key = normalize_lyric_line(line)
+        if key not in first_slot:
+            first_slot[key] = len(unique)
+            unique.append(line)
+        slots.append(first_slot[key])
+    if not context or len(unique) == len(lyrics):
+        return unique, slots, context
+
+    first_index = {slot: idx for idx, slot in reversed(list(enumerate(slots)))}
+    passages = []
+    for passage in context:
+        remapped = [
+            replace(line, index=slots[line.index])
+            if line.index is not None and first_index[slots[line.index]] == line.index
+            else replace(line, index=None)
+            for line in passage
+        ]
+        # 반복된 줄만 있던 구절은 보낼 필요 없음
+        if any(line.index is not None for line in remapped):
+            passages.append(remapped)
+    return unique, slots, passages or None
+
+
+async def _translate_with_openai(lyrics: List[str], artist: Optional[str] = None,
+                                 title: Optional[str] = None,
+                                 context: Optional[TranslationContext] = None) -> Optional[List[str]]:
+    """Translate lyrics using selected AI model (모델을 쓸 수 없거나 호출이 실패하면 None)"""
     if not lyrics:
         return []
 
-    artist = os.getenv('CURRENT_ARTIST', 'Unknown Artist')
-    title = os.getenv('CURRENT_TITLE', 'Unknown Song')
+    artist = artist or os.getenv('CURRENT_ARTIST', 'Unknown Artist')
+    title = title or os.getenv('CURRENT_TITLE', 'Unknown Song')
 
     # Get selected model from config
     from app.config.config_manager import get_config
-    from app.lyrics.ai_models import create_model
+    from app.lyrics.ai_models import get_model
     
     config = get_config()
     model_id = config.get_translation_model()
     
     print(f"[DEBUG] Configured translation model ID: {model_id}")
     
-    # Create model instance
-    model = create_model(model_id)
+    # Reuse the model instance (and its HTTP connections) pooled for this event loop
+    model = get_model(model_id)
     
     if not model:
         print(f"[ERROR] Failed to create model instance for {model_id}")
-        return lyrics
+        return None
         
     if not model.is_available():
         print(f"[WARN] Model {model_id} created but reports is_available=False. Checking keys...")
@@ -206,12 +248,23 @@ async def _translate_with_openai(lyrics: List[str]) -> List[str]:
             print(f"[DEBUG] GEMINI_API_KEY status: {'Present' if os.getenv('GEMINI_API_KEY') else 'Missing'}")
         elif "gpt" in model_id:
             print(f"[DEBUG] OPENAI_API_KEY status: {'Present' if os.getenv('OPENAI_API_KEY') else 'Missing'}")
-        return lyrics
+        return None
     
     try:
         print(f"[DEBUG] Starting translation with {model_id}...")
-        translated = await model.translate(lyrics, artist, title)
+        # 반복되는 후렴/같은 줄은 한 번만 보내고 결과를 모든 위치에 펼침
+        unique_lyrics, slots, unique_context = dedupe_lyric_lines(lyrics, context)
+        get_metrics().record_translation_lines(len(lyrics), len(unique_lyrics))
+        if len(unique_lyrics) < len(lyrics):
+            print(f"[DEBUG] 중복 줄 제거: {len(lyrics)}줄 → {len(unique_lyrics)}줄 "
+                  f"({1 - len(unique_lyrics) / len(lyrics):.0%} 감소)")
+        with span("llm_translate", lines=len(lyrics), unique=len(unique_lyrics)):
+            # 긴 가사는 겹치는 구간으로 나눠 동시에 번역
+            translated = await ChunkedTranslator(model).translate(unique_lyrics, artist, title,
+                                                                  context=unique_context)
         print(f"[DEBUG] Translation returned {len(translated)} lines.")
+        if len(translated) == len(unique_lyrics):
+            translated = [translated[slot] for slot in slots]
         
         # Clean up translations
         from app.lyrics.openai_handler import clean_translation
@@ -221,7 +274,7 @@ async def _translate_with_openai(lyrics: List[str]) -> List[str]:
     except Exception as e:
         print(f"[ERROR] Translation execution failed: {e}")
         traceback.print_exc()
-        return lyrics
+        return None
 
 def is_english(text: str) -> bool:
     """텍스트가 100% 영어로만 이루어져 있는지 확인 (숫자, 특수문자 포함)"""
@@ -256,7 +309,7 @@ def clean_translation(text: str) -> str:
             return cleaned
             
         # 한글만 있는 경우 (번역 실패)
-        return "Translation Error"
+        return TRANSLATION_ERROR
         
     return text.strip()
 
@@ -284,7 +337,15 @@ def seconds_to_srt_timestamp(seconds):
     milliseconds = int((seconds - int(seconds)) * 1000)
     return f"{hours:02d}:{minutes:02d}:{sec:02d},{milliseconds:03d}"
 
-async def parse_lrc_and_translate(lrc_filepath: str, json_filepath: str, duration: float = 0.0) -> str:
+def lrc_has_timestamps(lrc_filepath: str) -> bool:
+    """LRC 파일에 타임스탬프 줄이 있는지 확인 (없으면 가사를 오디오 길이에 맞춰 배분해야 함)"""
+    with open(lrc_filepath, 'r', encoding='utf-8') as f:
+        return any(line.startswith('[') and ']' in line for line in f)
+
+
+async def parse_lrc_and_translate(lrc_filepath: str, json_filepath: str, duration: float = 0.0,
+                                  artist: Optional[str] = None, title: Optional[str] = None,
+                                  translator: Optional[Translator] = None) -> str:
     try:
         # LRC 파일 존재 확인
         if not os.path.exists(lrc_filepath):
@@ -306,9 +367,9 @@ async def parse_lrc_and_translate(lrc_filepath: str, json_filepath: str, duratio
                 except:
                     continue
         
-        # 환경 변수에서 아티스트와 제목 가져오기
-        artist = os.getenv('CURRENT_ARTIST', '아티스트')
-        title = os.getenv('CURRENT_TITLE', '제목')
+        # 인자가 없으면 환경 변수에서 아티스트와 제목 가져오기
+        artist = artist or os.getenv('CURRENT_ARTIST', '아티스트')
+        title = title or os.getenv('CURRENT_TITLE', '제목')
         
         # 아티스트-제목 형식의 가사 추가
         if first_lyric_time:
@@ -363,7 +424,8 @@ async def parse_lrc_and_translate(lrc_filepath: str, json_filepath: str, duratio
                     })
                     pending_texts.append(line)
 
-        translations = await translate_lyrics(pending_texts) if pending_texts else []
+        translator = translator or translate_lyrics
+        translations = await translator(pending_texts, artist, title) if pending_texts else []
 
         for entry, translated_text in zip_longest(lyrics_data, translations, fillvalue=""):
             if entry is None:
@@ -400,12 +462,9 @@ async def generate_srt_from_lrc(lrc_filepath, srt_filepath, audio_filepath=None,
     """
     # 오디오 파일 길이 측정 (옵션)
     total_duration = None
-    if audio_filepath and os.path.exists(audio_filepath) and AudioSegment:
-        try:
-            audio = AudioSegment.from_file(audio_filepath)
-            total_duration = len(audio) / 1000.0  # 초 단위
-        except Exception as e:
-            print("오디오 길이 측정 실패:", e)
+    if audio_filepath and os.path.exists(audio_filepath):
+        from app.media.media_probe import get_audio_duration  # 지연 import (번역만 쓰는 경우 미디어 모듈 불필요)
+        total_duration = get_audio_duration(audio_filepath) or None
     
     # LRC 파일 읽기
     with open(lrc_filepath, "r", encoding="utf-8") as f:
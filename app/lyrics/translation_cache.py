@@ -0,0 +1,175 @@
+"""SQLite translation cache.
+
+원문 가사 한 줄 → 번역 결과를 ``CACHE_DIR/translation_cache.sqlite3``(WAL)에 줄 단위로 저장한다.
+곡마다 캐시 전체를 JSON으로 읽고 다시 쓰던 방식과 달리, 곡에 필요한 줄만 기본 키로 조회하고
+새 번역만 upsert하므로 캐시가 커져도 작업당 I/O가 늘지 않고 여러 프로세스가 동시에 써도 안전하다.
+
+예전 ``translation_cache.json``이 있으면 처음 열 때 한 번 가져온 뒤 ``.migrated``로 이름을 바꾼다.
+
+CLI: ``python -m app.lyrics.translation_cache {stats,clear}``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config.paths import LEGACY_TRANSLATION_CACHE_PATH, TRANSLATION_CACHE_PATH
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT PRIMARY KEY,
+    translation TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# SQLite 바인딩 변수 개수 제한(기본 999) 안에서 IN 조회를 나눌 크기
+_LOOKUP_CHUNK = 500
+
+
+class TranslationCache:
+    """줄 단위 번역 캐시 (여러 스레드에서 하나의 연결을 잠금으로 공유)"""
+
+    def __init__(self, path: str = TRANSLATION_CACHE_PATH,
+                 legacy_json_path: Optional[str] = LEGACY_TRANSLATION_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # 다른 프로세스가 쓰는 중이면 잠깐 기다림 (배치와 GUI가 동시에 번역하는 경우)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate(legacy_json_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _migrate(self, legacy_json_path: Optional[str]) -> None:
+        """예전 JSON 캐시를 한 번만 가져오기 (user_version으로 완료 여부 기록)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+                imported = 0
+                if version < SCHEMA_VERSION and legacy_json_path and os.path.exists(legacy_json_path):
+                    imported = self._import_json(legacy_json_path)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if imported:
+            os.replace(legacy_json_path, legacy_json_path + ".migrated")
+            print(f"[DEBUG] JSON 번역 캐시 {imported}줄을 SQLite로 이전: {self.path}")
+
+    def _import_json(self, json_path: str) -> int:
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] 예전 번역 캐시를 읽을 수 없어 건너뜀 ({json_path}): {e}")
+            return 0
+        now = time.time()
+        rows = [(source, translation, now) for source, translation in data.items()
+                if isinstance(source, str) and isinstance(translation, str) and translation]
+        # 이전 이후에 저장된 번역이 있으면 그쪽을 유지
+        self._conn.executemany("INSERT OR IGNORE INTO translations (source, translation, updated_at) "
+                               "VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    # 조회/저장 --------------------------------------------------------------
+
+    def get(self, source: str) -> Optional[str]:
+        return self.get_many([source]).get(source)
+
+    def get_many(self, sources: Iterable[str]) -> Dict[str, str]:
+        """필요한 줄만 기본 키로 조회, 캐시에 있는 것만 {원문: 번역}으로 반환"""
+        unique: List[str] = list(dict.fromkeys(sources))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(
+                    f"SELECT source, translation FROM translations WHERE source IN ({placeholders})", chunk))
+        return found
+
+    def put(self, source: str, translation: str) -> None:
+        self.put_many([(source, translation)])
+
+    def put_many(self, pairs: Sequence[Tuple[str, str]]) -> None:
+        """새 번역만 한 트랜잭션으로 upsert"""
+        now = time.time()
+        rows = [(source, translation, now) for source, translation in pairs if source and translation]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO translations (source, translation, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET translation = excluded.translation, "
+                    "updated_at = excluded.updated_at", rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM translations").rowcount
+            self._conn.execute("VACUUM")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (lines,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        size = sum(os.path.getsize(self.path + suffix) for suffix in ("", "-wal")
+                   if os.path.exists(self.path + suffix))
+        return {"lines": lines, "bytes": size}
+
+
+_translation_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """프로세스 전역 번역 캐시"""
+    global _translation_cache
+    with _cache_lock:
+        if _translation_cache is None:
+            _translation_cache = TranslationCache()
+        return _translation_cache
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.lyrics.translation_cache", description="번역 캐시 관리")
+    parser.add_argument("--cache", default=TRANSLATION_CACHE_PATH, help="캐시 파일 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="저장된 번역 줄 수와 파일 크기")
+    commands.add_parser("clear", help="번역 캐시 비우기")
+
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    # 다른 경로를 지정하면 기본 위치의 예전 JSON 캐시를 가져오지 않음
+    legacy = LEGACY_TRANSLATION_CACHE_PATH if args.cache == TRANSLATION_CACHE_PATH else None
+    cache = TranslationCache(args.cache, legacy)
+    if args.command == "clear":
+        print(f"{cache.clear()}줄 삭제")
+    else:
+        for name, value in cache.stats().items():
+            print(f"{name:<8} {value:10d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Persistent cache for prepared lyric background frames.
+
+앨범 아트 바이트와 레이아웃 파라미터의 해시를 키로, 블러/오버레이/앨범 아트 합성을 마친
+배경 프레임을 ``CACHE_DIR/base_frames``에 PNG로 저장한다. 같은 앨범의 재렌더링이나
+미리보기는 이 단계를 건너뛴다. 전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from typing import Callable, Iterable, Optional
+
+from PIL import Image
+
+from app.config.paths import BASE_FRAME_CACHE_DIR
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _max_cache_bytes() -> int:
+    env_value = os.getenv("LYRIC_BASE_FRAME_CACHE_MB")
+    if env_value and env_value.strip().isdigit():
+        return int(env_value) * 1024 * 1024
+    return DEFAULT_MAX_BYTES
+
+
+def base_frame_cache_key(album_art_path: str, layout_params: Iterable[object]) -> str:
+    """앨범 아트 파일 내용 + 레이아웃 파라미터로 캐시 키 생성"""
+    digest = hashlib.sha256()
+    with open(album_art_path, "rb") as art_file:
+        for chunk in iter(lambda: art_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest.update(repr(tuple(layout_params)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"{key}.png")
+
+
+def load_cached_base_frame(key: str, cache_dir: str = BASE_FRAME_CACHE_DIR) -> Optional[Image.Image]:
+    path = _entry_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with Image.open(path) as cached:
+            frame = cached.convert("RGBA")
+        # LRU 판단용으로 마지막 사용 시각 갱신
+        os.utime(path, None)
+        return frame
+    except Exception as e:
+        print(f"[WARN] 배경 프레임 캐시 읽기 실패 ({path}): {e}")
+        return None
+
+
+def store_base_frame(key: str, frame: Image.Image, cache_dir: str = BASE_FRAME_CACHE_DIR,
+                     max_bytes: Optional[int] = None) -> None:
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = _entry_path(key, cache_dir)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        frame.save(tmp_path, format="PNG", compress_level=1)
+        os.replace(tmp_path, path)
+        evict_base_frames(cache_dir, _max_cache_bytes() if max_bytes is None else max_bytes)
+    except Exception as e:
+        print(f"[WARN] 배경 프레임 캐시 저장 실패: {e}")
+
+
+def evict_base_frames(cache_dir: str = BASE_FRAME_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> int:
+    """캐시 크기가 max_bytes 이하가 될 때까지 오래된 항목 삭제, 삭제한 개수 반환"""
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".png"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def get_or_create_base_frame(album_art_path: str, layout_params: Iterable[object],
+                             factory: Callable[[], Image.Image],
+                             cache_dir: str = BASE_FRAME_CACHE_DIR) -> Image.Image:
+    """캐시에 있으면 불러오고, 없으면 factory로 만든 뒤 저장"""
+    try:
+        key = base_frame_cache_key(album_art_path, layout_params)
+    except OSError as e:
+        print(f"[WARN] 배경 프레임 캐시 키 생성 실패: {e}")
+        return factory()
+
+    cached = load_cached_base_frame(key, cache_dir)
+    if cached is not None:
+        print(f"[DEBUG] 배경 프레임 캐시 사용: {key[:12]}")
+        return cached
+
+    frame = factory()
+    store_base_frame(key, frame, cache_dir)
+    return frame
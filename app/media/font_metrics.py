@@ -0,0 +1,113 @@
+"""Font metric cache used by lyric text wrapping.
+
+줄바꿈 시 매 단어/글자마다 늘어나는 접두 문자열 전체를 다시 측정하던 방식 대신,
+폰트(경로, 크기)별로 문자열 폭과 글자 쌍 커닝 보정값을 LRU로 캐시하고
+폭을 증분 계산한다. 공백 없는 긴 한국어 줄에서도 측정 호출이 선형으로 유지된다.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from PIL import ImageFont
+
+DEFAULT_MAX_ENTRIES = 8192
+
+
+def _font_key(font: ImageFont.ImageFont) -> Hashable:
+    path = getattr(font, "path", None)
+    size = getattr(font, "size", None)
+    if path and size:
+        # 같은 .ttc 파일의 다른 글꼴(face)은 index로 구분
+        return (str(path), getattr(font, "index", 0), size)
+    # 기본 비트맵 폰트 등 경로가 없는 폰트는 인스턴스 단위로 구분
+    return ("id", id(font))
+
+
+def _measure(text: str, font: ImageFont.ImageFont) -> float:
+    if hasattr(font, "getlength"):
+        return float(font.getlength(text))
+    bbox = font.getbbox(text)
+    return float(bbox[2] - bbox[0])
+
+
+class FontMetricsCache:
+    """폰트별 문자열 폭 / 커닝 보정값 LRU 캐시 (hit/miss 카운터 포함)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[Hashable, str, str], float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 여러 렌더링 스레드가 동시에 사용하므로 OrderedDict 조작만 잠금 (측정은 잠금 밖에서)
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Tuple[Hashable, str, str], compute) -> float:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def text_width(self, text: str, font: ImageFont.ImageFont) -> float:
+        """문자열 전체 폭 (커닝 포함)"""
+        if not text:
+            return 0.0
+        return self._lookup((_font_key(font), "w", text), lambda: _measure(text, font))
+
+    def pair_kerning(self, left: str, right: str, font: ImageFont.ImageFont) -> float:
+        """두 글자를 이어 붙일 때의 커닝 보정값"""
+        pair = left + right
+        return self._lookup(
+            (_font_key(font), "k", pair),
+            lambda: self.text_width(pair, font) - self.text_width(left, font) - self.text_width(right, font),
+        )
+
+    def joined_width(self, left: str, left_width: float, right: str, font: ImageFont.ImageFont) -> float:
+        """이미 폭을 아는 left 뒤에 right를 붙였을 때의 폭을 증분 계산"""
+        if not left:
+            return self.text_width(right, font)
+        if not right:
+            return left_width
+        return left_width + self.text_width(right, font) + self.pair_kerning(left[-1], right[0], font)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+_metrics_cache: Optional[FontMetricsCache] = None
+
+
+def get_font_metrics_cache() -> FontMetricsCache:
+    """프로세스 전역 폰트 메트릭 캐시 반환"""
+    global _metrics_cache
+    if _metrics_cache is None:
+        _metrics_cache = FontMetricsCache()
+    return _metrics_cache
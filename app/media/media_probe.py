@@ -0,0 +1,302 @@
+"""Cached ffprobe media information.
+
+오디오 파일 하나를 번역 단계(ProcessManager), 렌더링(make_lyric_video), Premiere XML 내보내기,
+SRT 생성이 각각 ffprobe/pydub로 다시 읽던 것을 ffprobe JSON 한 번으로 합친다.
+길이, 컨테이너/코덱, 샘플레이트, 비트레이트, 스트림 구성을 (경로, 크기, 수정 시각) 키로 메모리와
+``CACHE_DIR/media_probe.sqlite3``에 보관하므로 같은 파일은 프로세스가 바뀌어도 다시 검사하지 않는다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.config.paths import FFPROBE_PATH, MEDIA_PROBE_CACHE_PATH
+from app.pipeline.timing import span
+
+# 메모리/디스크 캐시 항목 수 상한 (작업 폴더의 임시 파일은 경로가 매번 달라 계속 쌓이므로 오래된 것부터 삭제)
+MEMORY_CACHE_ENTRIES = 512
+DISK_CACHE_ENTRIES = 5000
+
+ProbeKey = Tuple[str, int, int]
+
+
+class MediaProbeError(RuntimeError):
+    """ffprobe 실행 또는 결과 해석 실패"""
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    index: int
+    codec_type: str
+    codec_name: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    channel_layout: Optional[str] = None
+    bit_rate: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    duration: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    path: str
+    duration: float
+    format_name: Optional[str] = None
+    bit_rate: Optional[int] = None
+    size: int = 0
+    streams: Tuple[StreamInfo, ...] = ()
+
+    @property
+    def audio(self) -> Optional[StreamInfo]:
+        """첫 번째 오디오 스트림"""
+        return next((stream for stream in self.streams if stream.codec_type == "audio"), None)
+
+    @property
+    def video(self) -> Optional[StreamInfo]:
+        return next((stream for stream in self.streams if stream.codec_type == "video"), None)
+
+    @property
+    def sample_rate(self) -> Optional[int]:
+        return self.audio.sample_rate if self.audio else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MediaInfo":
+        streams = tuple(StreamInfo(**stream) for stream in data.get("streams", ()))
+        return cls(**{**data, "streams": streams})
+
+
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_ffprobe_json(path: str, data: Dict[str, Any]) -> MediaInfo:
+    """``ffprobe -show_format -show_streams -of json`` 출력 해석"""
+    fmt = data.get("format") or {}
+    streams = tuple(
+        StreamInfo(
+            index=_int(stream.get("index")) or 0,
+            codec_type=stream.get("codec_type") or "unknown",
+            codec_name=stream.get("codec_name"),
+            sample_rate=_int(stream.get("sample_rate")),
+            channels=_int(stream.get("channels")),
+            channel_layout=stream.get("channel_layout"),
+            bit_rate=_int(stream.get("bit_rate")),
+            width=_int(stream.get("width")),
+            height=_int(stream.get("height")),
+            duration=_float(stream.get("duration")),
+        )
+        for stream in data.get("streams") or ()
+    )
+    duration = _float(fmt.get("duration"))
+    if duration is None:
+        # 일부 컨테이너는 format 길이가 없고 스트림 길이만 있음
+        duration = max((stream.duration or 0.0 for stream in streams), default=0.0)
+    return MediaInfo(
+        path=path,
+        duration=duration,
+        format_name=fmt.get("format_name"),
+        bit_rate=_int(fmt.get("bit_rate")),
+        size=_int(fmt.get("size")) or 0,
+        streams=streams,
+    )
+
+
+class MediaProbe:
+    """ffprobe 결과 캐시 (메모리 LRU + SQLite 디스크 캐시, 같은 파일을 동시에 요청하면 한 번만 실행)"""
+
+    def __init__(self, cache_path: Optional[str] = MEDIA_PROBE_CACHE_PATH,
+                 memory_entries: int = MEMORY_CACHE_ENTRIES, disk_entries: int = DISK_CACHE_ENTRIES):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory: "OrderedDict[ProbeKey, MediaInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[ProbeKey, threading.Lock] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if cache_path:
+            try:
+                self._conn = self._open_disk_cache(cache_path)
+            except sqlite3.Error as e:
+                print(f"[WARN] 미디어 정보 디스크 캐시를 열 수 없어 메모리 캐시만 사용: {e}")
+
+    @staticmethod
+    def _open_disk_cache(cache_path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        conn = sqlite3.connect(cache_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS probes ("
+            "path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "info TEXT NOT NULL, probed_at REAL NOT NULL, PRIMARY KEY (path, size, mtime_ns))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS probes_probed_at ON probes (probed_at)")
+        return conn
+
+    @staticmethod
+    def _key(path: str) -> ProbeKey:
+        abs_path = os.path.abspath(path)
+        stat = os.stat(abs_path)
+        return abs_path, stat.st_size, stat.st_mtime_ns
+
+    def probe(self, path: str) -> MediaInfo:
+        """파일의 미디어 정보 (캐시에 없을 때만 ffprobe 실행)"""
+        try:
+            key = self._key(path)
+        except OSError as e:
+            raise MediaProbeError(f"파일을 찾을 수 없습니다: {path}") from e
+
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            inflight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with inflight:
+                # 같은 파일을 먼저 검사하던 스레드가 끝났으면 그 결과 사용
+                cached = self._cached(key)
+                if cached is not None:
+                    return cached
+                info = parse_ffprobe_json(key[0], self._run_ffprobe(key[0]))
+                self._remember(key, info)
+                self._store_disk(key, info)
+            return info
+        finally:
+            # ffprobe가 실패해도 잠금 항목이 남지 않도록 정리
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _cached(self, key: ProbeKey) -> Optional[MediaInfo]:
+        with self._lock:
+            info = self._memory.get(key)
+            if info is not None:
+                self._memory.move_to_end(key)
+                return info
+        info = self._load_disk(key)
+        if info is not None:
+            self._remember(key, info)
+        return info
+
+    def _remember(self, key: ProbeKey, info: MediaInfo) -> None:
+        with self._lock:
+            self._memory[key] = info
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _load_disk(self, key: ProbeKey) -> Optional[MediaInfo]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT info FROM probes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                                         key).fetchone()
+            return MediaInfo.from_dict(json.loads(row[0])) if row else None
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            print(f"[WARN] 미디어 정보 캐시 읽기 실패: {e}")
+            return None
+
+    def _store_disk(self, key: ProbeKey, info: MediaInfo) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                # 같은 경로의 예전 버전(크기/수정 시각이 다른 항목)은 더 이상 쓰이지 않음
+                self._conn.execute("DELETE FROM probes WHERE path = ?", (key[0],))
+                self._conn.execute("INSERT INTO probes (path, size, mtime_ns, info, probed_at) VALUES (?, ?, ?, ?, ?)",
+                                   (*key, json.dumps(info.to_dict()), time.time()))
+                self._conn.execute("DELETE FROM probes WHERE rowid IN (SELECT rowid FROM probes "
+                                   "ORDER BY probed_at DESC LIMIT -1 OFFSET ?)", (self.disk_entries,))
+        except sqlite3.Error as e:
+            print(f"[WARN] 미디어 정보 캐시 저장 실패: {e}")
+
+    @staticmethod
+    def _run_ffprobe(path: str) -> Dict[str, Any]:
+        cmd = [
+            FFPROBE_PATH,
+            "-v", "error",
+            "-show_format",
+            "-show_streams",
+            "-of", "json",
+            path,
+        ]
+        try:
+            with span("ffprobe"):
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return json.loads(result.stdout or "{}")
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            raise MediaProbeError(f"ffprobe 실행 실패 ({path}): {e}") from e
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM probes")
+
+
+_media_probe: Optional[MediaProbe] = None
+_probe_lock = threading.Lock()
+
+
+def get_media_probe() -> MediaProbe:
+    """프로세스 전역 미디어 정보 캐시"""
+    global _media_probe
+    with _probe_lock:
+        if _media_probe is None:
+            _media_probe = MediaProbe()
+        return _media_probe
+
+
+def probe_media(path: str) -> MediaInfo:
+    return get_media_probe().probe(path)
+
+
+def get_audio_duration(audio_path: str) -> float:
+    """오디오 파일 길이(초), 확인할 수 없으면 0.0"""
+    try:
+        return probe_media(audio_path).duration
+    except MediaProbeError as e:
+        print(f"[ERROR] 오디오 길이 확인 실패: {e}")
+        return 0.0
+
+
+def main(argv: Optional[list] = None) -> int:
+    """``python -m app.media.media_probe FILE...``: 미디어 정보를 JSON으로 출력"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.media.media_probe", description="ffprobe 결과 캐시 조회")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+    status = 0
+    for path in args.files:
+        try:
+            print(json.dumps(probe_media(path).to_dict(), ensure_ascii=False))
+        except MediaProbeError as e:
+            print(f"[ERROR] {e}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""FFmpeg overlay-based compositing for lyric videos.
+
+가사 줄마다 전체 1080p 프레임을 만드는 대신, 텍스트만 잘라낸 투명 스프라이트를
+정적인 배경 한 장 위에 FFmpeg ``overlay`` 필터로 배치한다. 각 스프라이트의 표시 구간은
+``enable`` 표현식으로, 페이드는 알파 ``fade`` 필터로 타임라인에서 처리된다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+
+@dataclass
+class SpritePlacement:
+    """스프라이트 이미지 경로와 프레임 내 위치, 표시 구간(초)"""
+    path: str
+    x: int
+    y: int
+    start: float
+    end: float
+
+
+def _sprite_chain(input_index: int, label: str, sprite: SpritePlacement, fps: int, fade: float) -> str:
+    if fade <= 0:
+        # 한 장짜리 입력을 시작 시간으로 옮기면 overlay가 마지막 프레임을 계속 재사용한다
+        return f"[{input_index}:v]setpts=PTS-STARTPTS+{sprite.start:.3f}/TB[{label}]"
+
+    clip_duration = sprite.end - sprite.start
+    fade = min(fade, clip_duration / 2)
+    frame_count = max(int(round(clip_duration * fps)), 1)
+    return (
+        f"[{input_index}:v]format=rgba,"
+        f"loop=loop={frame_count - 1}:size=1:start=0,"
+        f"setpts=N/({fps}*TB)+{sprite.start:.3f}/TB,"
+        f"fade=t=in:st={sprite.start:.3f}:d={fade:.3f}:alpha=1,"
+        f"fade=t=out:st={sprite.end - fade:.3f}:d={fade:.3f}:alpha=1[{label}]"
+    )
+
+
+def build_overlay_filtergraph(sprites: Sequence[SpritePlacement], duration: float, fps: int,
+                              fade: float = 0.0, background_input: int = 0,
+                              first_sprite_input: int = 2, drop_duplicates: bool = False) -> str:
+    """배경 입력 위에 스프라이트들을 순서대로 overlay하는 filter_complex 스크립트 생성.
+
+    결과 비디오 스트림 라벨은 ``[vout]``이다. drop_duplicates가 참이면 변화 없는 프레임을
+    제거하여 VFR 출력용으로 가사 변경 시점의 프레임만 남긴다.
+    """
+    chains: List[str] = [
+        f"[{background_input}:v]loop=loop=-1:size=1:start=0,fps={fps},"
+        f"trim=duration={duration:.3f},setpts=PTS-STARTPTS[bg]"
+    ]
+
+    previous = "bg"
+    for offset, sprite in enumerate(sprites):
+        sprite_label = f"s{offset}"
+        output_label = f"v{offset}"
+        chains.append(_sprite_chain(first_sprite_input + offset, sprite_label, sprite, fps, fade))
+        # between()은 양 끝을 포함하므로 반열린 구간으로 이어지는 가사가 겹치지 않게 함
+        chains.append(
+            f"[{previous}][{sprite_label}]overlay=x={sprite.x}:y={sprite.y}:"
+            f"enable='gte(t,{sprite.start:.3f})*lt(t,{sprite.end:.3f})'[{output_label}]"
+        )
+        previous = output_label
+
+    decimate = "mpdecimate=hi=1:lo=1:frac=0:max=0," if drop_duplicates else ""
+    chains.append(f"[{previous}]{decimate}format=yuv420p[vout]")
+    return ";\n".join(chains)
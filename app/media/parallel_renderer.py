@@ -0,0 +1,97 @@
+"""Process-pool lyric frame renderer.
+
+프레임 생성(줄바꿈, 외곽선 텍스트, RGBA→RGB 변환)을 여러 CPU 코어로 분산한다.
+각 워커는 기본 프레임과 폰트를 한 번만 로드하고, 결과는 타임라인 순서대로 반환되므로
+직렬 경로와 바이트 단위로 동일한 출력을 만든다.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from PIL import Image
+
+BytesLike = Union[bytes, memoryview]
+
+# LYRIC_RENDER_WORKERS가 없을 때 렌더링 프로세스 예산의 상한 (나머지 코어는 FFmpeg 인코더가 사용)
+DEFAULT_RENDER_WORKER_CAP = 4
+
+_worker_state: Dict[str, object] = {}
+
+
+def resolve_render_workers(workers: Optional[int] = None, concurrent_jobs: int = 1) -> int:
+    """렌더링 워커 수 결정 (인자 > LYRIC_RENDER_WORKERS 환경변수 > CPU 코어의 절반, 최대 4)
+
+    환경변수와 기본값은 프로세스 전체의 예산이므로 동시에 렌더링하는 작업 수(배치의 cpu 제한)로 나눈다.
+    """
+    if workers is not None:
+        return max(1, workers)
+    budget = None
+    env_workers = os.getenv("LYRIC_RENDER_WORKERS")
+    if env_workers and env_workers.strip().isdigit():
+        budget = int(env_workers)
+    if budget is None:
+        budget = min(DEFAULT_RENDER_WORKER_CAP, (os.cpu_count() or 1) // 2)
+    return max(1, budget // max(1, concurrent_jobs))
+
+
+def _init_worker(base_bytes: bytes, size: Tuple[int, int], mode: str) -> None:
+    from app.media.video_maker import BandFrameRenderer, prepare_fonts
+
+    base_frame = Image.frombytes(mode, size, base_bytes)
+    _worker_state["renderer"] = BandFrameRenderer(base_frame, prepare_fonts())
+
+
+def _render_in_worker(lyric: dict) -> bytes:
+    return _worker_state["renderer"].render(lyric).tobytes()
+
+
+class ParallelFrameRenderer:
+    """가사 프레임을 프로세스 풀에서 생성하고 raw RGB 데이터로 순서대로 돌려준다.
+
+    워커가 1개일 때는 현재 프로세스에서 직접 렌더링하며, 이때 yield되는 값은
+    재사용되는 프레임 버퍼이므로 다음 프레임을 요청하기 전에 소비해야 한다.
+    """
+
+    def __init__(self, base_frame: Image.Image, fonts, workers: Optional[int] = None):
+        self.base_frame = base_frame
+        self.fonts = fonts
+        self.workers = resolve_render_workers(workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelFrameRenderer":
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.base_frame.tobytes(), self.base_frame.size, self.base_frame.mode),
+            )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def render(self, lyrics: Iterable[dict]) -> Iterator[BytesLike]:
+        """가사 목록을 렌더링하여 입력 순서대로 RGB 프레임 데이터를 yield"""
+        if self._executor is None:
+            from app.media.video_maker import BandFrameRenderer
+
+            renderer = BandFrameRenderer(self.base_frame, self.fonts)
+            for lyric in lyrics:
+                yield memoryview(renderer.render(lyric)).cast('B')
+            return
+
+        # 완료 대기 중인 프레임 수를 제한해 메모리 사용량을 워커 수에 비례하도록 유지
+        max_in_flight = self.workers * 2
+        pending: Deque[Future] = deque()
+        for lyric in lyrics:
+            pending.append(self._executor.submit(_render_in_worker, lyric))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
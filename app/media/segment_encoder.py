@@ -0,0 +1,177 @@
+"""Segment-parallel H.264 encoding for lyric videos.
+
+타임라인을 가사 경계에서 여러 구간으로 나누어 구간마다 별도의 FFmpeg 프로세스로 동시에
+인코딩한 뒤, concat demuxer의 ``-c copy``로 이어 붙이면서 오디오를 한 번만 입힌다.
+구간은 Matroska로 저장한다(MP4 구간은 B-프레임 지연을 edit list로 보정하므로 ``-c copy``로 이어 붙이면
+구간 경계의 타임스탬프가 어긋날 수 있음).
+이어 붙인 결과는 비디오 패킷 타임스탬프를 검사해 빈 구간이 없는지 확인하고, 문제가 있으면 RuntimeError로
+호출자가 단일 인코딩으로 다시 만들게 한다.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from app.config.paths import FFMPEG_PATH
+
+BytesLike = Union[bytes, memoryview]
+# (가사 인덱스 또는 None, 프레임 수)
+FrameRun = Tuple[Optional[int], int]
+FrameSource = Callable[[Optional[int]], BytesLike]
+
+
+def split_frame_runs(runs: Sequence[FrameRun], segments: int) -> List[List[FrameRun]]:
+    """프레임 수가 비슷하도록 가사 경계에서 구간을 나눔"""
+    runs = [run for run in runs if run[1] > 0]
+    total_frames = sum(count for _, count in runs)
+    segments = max(1, min(segments, len(runs)))
+    if segments == 1 or total_frames == 0:
+        return [list(runs)] if runs else []
+
+    chunks: List[List[FrameRun]] = []
+    current: List[FrameRun] = []
+    accumulated = 0
+    for run in runs:
+        current.append(run)
+        accumulated += run[1]
+        boundary = total_frames * (len(chunks) + 1) / segments
+        if accumulated >= boundary and len(chunks) < segments - 1:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _encode_segment(runs: Sequence[FrameRun], frame_source: FrameSource, frame_size: Tuple[int, int],
+                    fps: int, video_args: Sequence[str], segment_path: str) -> None:
+    width, height = frame_size
+    cmd = [
+        FFMPEG_PATH,
+        "-y",
+        "-v", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-r", str(fps),
+        "-i", "pipe:0",
+        "-an",
+        *video_args,
+        "-f", "matroska",
+        segment_path,
+    ]
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        for index, frame_count in runs:
+            frame_bytes = frame_source(index)
+            for _ in range(frame_count):
+                process.stdin.write(frame_bytes)
+    except BrokenPipeError:
+        # FFmpeg이 먼저 종료된 경우: 아래에서 종료 코드로 처리
+        pass
+    except BaseException:
+        # 프레임 생성 실패/중단: FFmpeg을 종료하고 원래 예외를 그대로 전달
+        process.kill()
+        raise
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        return_code = process.wait()
+
+    if return_code != 0:
+        raise subprocess.CalledProcessError(return_code, cmd)
+
+
+def verify_video_timestamps(video_path: str, fps: int, expected_frames: int) -> None:
+    """비디오 패킷 타임스탬프가 끊김 없이 이어지는지 확인 (문제가 있으면 RuntimeError)"""
+    cmd = [FFMPEG_PATH, "-v", "error", "-i", video_path, "-map", "0:v:0", "-c", "copy", "-f", "framemd5", "-"]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+
+    time_base = None
+    pts_values: List[int] = []
+    for line in result.stdout.splitlines():
+        if line.startswith("#tb"):
+            match = re.search(r"(\d+)/(\d+)", line)
+            if match:
+                time_base = int(match.group(1)) / int(match.group(2))
+            continue
+        if not line or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in line.split(",")]
+        if len(fields) >= 3:
+            pts_values.append(int(fields[2]))
+
+    if time_base is None or not pts_values:
+        raise RuntimeError(f"비디오 패킷 정보를 읽을 수 없습니다: {video_path}")
+    if len(pts_values) != expected_frames:
+        raise RuntimeError(f"프레임 수 불일치: 예상 {expected_frames}, 실제 {len(pts_values)}")
+
+    pts_values.sort()
+    frame_interval = 1.0 / fps
+    for previous, current in zip(pts_values, pts_values[1:]):
+        gap = (current - previous) * time_base
+        if gap > frame_interval * 1.5 or gap <= 0:
+            raise RuntimeError(
+                f"타임스탬프 불연속 감지: {previous * time_base:.3f}s -> {current * time_base:.3f}s"
+            )
+
+
+def encode_segments_parallel(runs: Sequence[FrameRun], frame_source_factory: Callable[[], FrameSource],
+                             frame_size: Tuple[int, int], fps: int, audio_path: str, output_path: str,
+                             work_dir: str, video_args: Sequence[str], audio_args: Sequence[str],
+                             container_args: Sequence[str], concurrency: int) -> None:
+    """구간별 동시 인코딩 후 stream copy로 이어 붙이고 오디오를 한 번에 mux"""
+    segments_dir = os.path.join(work_dir, "segments")
+    os.makedirs(segments_dir, exist_ok=True)
+    for f in os.listdir(segments_dir):
+        os.remove(os.path.join(segments_dir, f))
+
+    chunks = split_frame_runs(runs, concurrency)
+    segment_paths = [os.path.join(segments_dir, f"segment_{i:03d}.mkv") for i in range(len(chunks))]
+    print(f"[DEBUG] 구간 병렬 인코딩: {len(chunks)}개 구간, 동시 {concurrency}개")
+
+    def encode(chunk_index: int) -> None:
+        # 렌더러의 프레임 버퍼는 스레드 간에 공유하지 않음
+        frame_source = frame_source_factory()
+        _encode_segment(chunks[chunk_index], frame_source, frame_size, fps, video_args,
+                        segment_paths[chunk_index])
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(encode, i) for i in range(len(chunks))]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            # 한 구간이 실패하면 아직 시작하지 않은 구간은 인코딩하지 않음
+            for future in futures:
+                future.cancel()
+            raise
+
+    concat_list_path = os.path.join(segments_dir, "segments.txt")
+    with open(concat_list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"file '{path.replace(os.sep, '/')}'" for path in segment_paths))
+
+    cmd = [
+        FFMPEG_PATH,
+        "-y",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", concat_list_path,
+        "-i", audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "copy",
+        *audio_args,
+        *container_args,
+        output_path,
+    ]
+    print(f"[DEBUG] FFmpeg 실행 (segment concat): {' '.join(cmd)}")
+    subprocess.run(cmd, check=True)
+
+    verify_video_timestamps(output_path, fps, sum(count for _, count in runs))
@@ -1,32 +1,120 @@
 import os
 import json
+import math
 import traceback
 import subprocess
+import time
 import numpy as np
-from typing import List, Tuple, Optional, Sequence, Dict
+from dataclasses import dataclass, replace
+from typing import List, Literal, Tuple, Optional, Sequence, Dict
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
-from app.config.paths import TEMP_DIR, ensure_data_dirs, FFMPEG_PATH, FFPROBE_PATH
+from app.config.paths import ensure_data_dirs, FFMPEG_PATH
+from app.media.base_frame_cache import get_or_create_base_frame
+from app.media.font_metrics import get_font_metrics_cache
+from app.media.media_probe import get_audio_duration
+from app.media.overlay_compositor import SpritePlacement, build_overlay_filtergraph
+from app.media.parallel_renderer import ParallelFrameRenderer
+from app.media.segment_encoder import encode_segments_parallel
+from app.pipeline.metrics import get_metrics
+from app.pipeline.timing import accumulate, span
+from app.pipeline.workspace import JobWorkspace
+
+RenderMode = Literal["stream", "concat", "overlay"]
+EncodeProfile = Literal["standard", "still", "preview"]
+
+# 미리보기(초안) 렌더링 기본값: 480p, 낮은 프레임레이트
+PREVIEW_HEIGHT = 480
+PREVIEW_FPS = 10
+# still 프로필의 키프레임 간격(초), 탐색 정밀도와 파일 크기 사이의 절충
+STILL_KEYFRAME_INTERVAL = 5
+
+
+@dataclass
+class RenderOptions:
+    """비디오 렌더링 옵션.
+
+    render_mode:
+        "stream" - 프레임을 raw RGB로 FFmpeg 파이프에 직접 전달 (PNG 인코딩/임시 파일 없음,
+                   still 프로필은 가사마다 한 프레임만 만드는 concat으로 처리)
+        "concat" - 프레임을 PNG로 저장 후 concat demuxer 사용 (기존 방식, 폴백용)
+        "overlay" - 가사 텍스트 스프라이트만 만들고 FFmpeg overlay로 배경 위에 합성
+    """
+    render_mode: RenderMode = "stream"
+    stream_fps: int = 25
+    # 중간 파일(프레임, 구간, 잘라낸 오디오) 폴더. None이면 렌더링마다 TEMP_DIR/jobs 아래 임시 폴더를 만들고 끝나면 삭제
+    work_dir: Optional[str] = None
+    # 프레임 렌더링 프로세스 수 (None이면 resolve_render_workers 기본값, 1이면 직렬)
+    render_workers: Optional[int] = None
+    # overlay 모드에서 가사 스프라이트 페이드 인/아웃 시간(초), 0이면 페이드 없음
+    sprite_fade: float = 0.0
+    # stream 모드에서 동시에 실행할 FFmpeg 구간 인코더 수 (1이면 단일 프로세스 인코딩)
+    segment_workers: int = 1
+    # "standard": 고정 프레임레이트 / "still": 가사 변경 시점에만 프레임을 내보내는 VFR 정지 화면 프로필
+    # "preview": 싱크/번역 확인용 ultrafast 초안
+    encode_profile: EncodeProfile = "standard"
+    # 출력 세로 해상도 (None이면 원본 1080p). 레이아웃은 1080p로 그린 뒤 축소 (stream/concat 모드)
+    output_height: Optional[int] = None
+    # (시작, 끝) 초 단위 렌더링 구간, None이면 전체 곡
+    time_window: Optional[Tuple[float, float]] = None
+
+
+def preview_render_options(time_window: Optional[Tuple[float, float]] = None,
+                           work_dir: Optional[str] = None) -> RenderOptions:
+    """싱크/번역 확인용 초안 렌더링 옵션 (480p, ultrafast, 선택적 구간)"""
+    return RenderOptions(
+        render_mode="stream",
+        stream_fps=PREVIEW_FPS,
+        work_dir=work_dir,
+        encode_profile="preview",
+        output_height=PREVIEW_HEIGHT,
+        time_window=time_window,
+    )
+
+
+@dataclass(frozen=True)
+class TextOutline:
+    """가사 텍스트 외곽선 스타일 (softness > 0이면 외곽선을 가우시안 블러로 부드럽게 처리)"""
+    width: int = 3
+    color: Tuple[int, int, int] = (0, 0, 0)
+    softness: float = 0.0
+
+
+DEFAULT_OUTLINE = TextOutline()
 
-def get_audio_duration(audio_path: str) -> float:
-    """ffprobe를 사용하여 오디오 파일의 길이를 초 단위로 반환"""
-    try:
-        cmd = [
-            FFPROBE_PATH,
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            audio_path
-        ]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-        return float(result.stdout.strip())
-    except Exception as e:
-        print(f"[ERROR] 오디오 길이 확인 실패: {e}")
-        return 0.0
 
 def draw_outlined_text(draw: ImageDraw.ImageDraw, pos: Tuple[float, float], text: str, font: ImageFont.ImageFont,
-                       text_color=(255, 255, 255), outline_color=(0, 0, 0), outline_width=3) -> None:
-    """테두리가 있는 텍스트 그리기"""
+                       text_color=(255, 255, 255), outline_color=(0, 0, 0), outline_width=3,
+                       outline_softness: float = 0.0) -> None:
+    """테두리가 있는 텍스트 그리기 (Pillow stroke로 한 번에 래스터화)"""
+    x, y = pos
+    x = int(round(x))
+    y = int(round(y))
+
+    if outline_width <= 0:
+        draw.text((x, y), text, font=font, fill=text_color)
+        return
+
+    if outline_softness <= 0:
+        draw.text((x, y), text, font=font, fill=text_color,
+                  stroke_width=outline_width, stroke_fill=outline_color)
+        return
+
+    # 부드러운 외곽선: 외곽선 마스크만 따로 만들어 블러 후 합성
+    pad = outline_width + int(math.ceil(outline_softness * 3))
+    left, top, right, bottom = draw.textbbox((x, y), text, font=font, stroke_width=outline_width)
+    mask = Image.new('L', (right - left + pad * 2, bottom - top + pad * 2), 0)
+    ImageDraw.Draw(mask).text((x - left + pad, y - top + pad), text, font=font, fill=255,
+                              stroke_width=outline_width, stroke_fill=255)
+    mask = mask.filter(ImageFilter.GaussianBlur(radius=outline_softness))
+    draw.bitmap((left - pad, top - pad), mask, fill=outline_color)
+    draw.text((x, y), text, font=font, fill=text_color)
+
+
+def _draw_outlined_text_offsets(draw: ImageDraw.ImageDraw, pos: Tuple[float, float], text: str,
+                                font: ImageFont.ImageFont, text_color=(255, 255, 255), outline_color=(0, 0, 0),
+                                outline_width=3) -> None:
+    """기존 방식: 오프셋마다 텍스트를 다시 그려 외곽선 흉내 ((2w+1)^2회 래스터화, 벤치마크 비교용)"""
     x, y = pos
     x = int(round(x))
     y = int(round(y))
@@ -86,6 +174,8 @@ def prepare_fonts() -> Tuple[ImageFont.ImageFont, ImageFont.ImageFont]:
 
 
 def _text_width(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont) -> float:
+    if hasattr(font, "getlength"):
+        return get_font_metrics_cache().text_width(text, font)
     if hasattr(draw, "textlength"):
         return draw.textlength(text, font=font)
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -100,15 +190,20 @@ def _text_height(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont
 def _split_long_token(token: str, draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, max_width: float) -> List[str]:
     if not token:
         return [""]
+    metrics = get_font_metrics_cache()
     buffer = ""
+    buffer_width = 0.0
     lines: List[str] = []
     for char in token:
-        tentative = buffer + char
-        if _text_width(draw, tentative, font) <= max_width or not buffer:
-            buffer = tentative
+        # 접두 문자열 전체를 다시 재지 않고 캐시된 글자 폭 + 커닝으로 증분 계산
+        tentative_width = metrics.joined_width(buffer, buffer_width, char, font)
+        if tentative_width <= max_width or not buffer:
+            buffer += char
+            buffer_width = tentative_width
         else:
             lines.append(buffer)
             buffer = char
+            buffer_width = metrics.text_width(char, font)
     if buffer:
         lines.append(buffer)
     return lines
@@ -118,20 +213,28 @@ def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont,
     if not text:
         return [""]
 
+    metrics = get_font_metrics_cache()
     words = text.split()
     lines: List[str] = []
     current_line = ""
+    current_width = 0.0
 
     for word in words:
-        tentative = word if not current_line else f"{current_line} {word}"
-        if _text_width(draw, tentative, font) <= max_width:
+        if current_line:
+            tentative = f"{current_line} {word}"
+            tentative_width = metrics.joined_width(current_line, current_width, f" {word}", font)
+        else:
+            tentative = word
+            tentative_width = metrics.text_width(word, font)
+        if tentative_width <= max_width:
             current_line = tentative
+            current_width = tentative_width
             continue
 
         if current_line:
             lines.append(current_line)
 
-        if _text_width(draw, word, font) <= max_width:
+        if metrics.text_width(word, font) <= max_width:
             current_line = word
         else:
             split_tokens = _split_long_token(word, draw, font, max_width)
@@ -140,6 +243,7 @@ def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont,
                 current_line = split_tokens[-1]
             else:
                 current_line = word
+        current_width = metrics.text_width(current_line, font)
 
     if current_line:
         lines.append(current_line)
@@ -149,79 +253,236 @@ def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont,
     return lines
 
 
-def _draw_multiline_centered(draw: ImageDraw.ImageDraw, lines: List[str], font: ImageFont.ImageFont,
-                             frame_width: int, center_y: float, spacing_ratio: float = 0.3) -> None:
+def _multiline_metrics(draw: ImageDraw.ImageDraw, lines: List[str], font: ImageFont.ImageFont,
+                       spacing_ratio: float = 0.3) -> Tuple[List[str], List[float], int, float]:
+    """여러 줄 텍스트의 줄 높이, 줄 간격, 전체 높이 계산"""
     lines = [line for line in lines if line is not None]
     if not lines:
-        return
+        return [], [], 0, 0.0
 
     heights = [_text_height(draw, line, font) for line in lines]
-    if not heights:
-        return
-
     base_spacing = max(int(heights[0] * spacing_ratio), 10)
     total_height = sum(heights) + base_spacing * (len(lines) - 1)
+    return lines, heights, base_spacing, total_height
+
+
+def _draw_multiline_centered(draw: ImageDraw.ImageDraw, lines: List[str], font: ImageFont.ImageFont,
+                             frame_width: int, center_y: float, spacing_ratio: float = 0.3,
+                             outline: TextOutline = DEFAULT_OUTLINE) -> None:
+    lines, heights, base_spacing, total_height = _multiline_metrics(draw, lines, font, spacing_ratio)
+    if not lines:
+        return
+
     start_y = center_y - total_height / 2
     y_cursor = start_y
 
     for line, height in zip(lines, heights):
         width = _text_width(draw, line, font)
         x = (frame_width - width) / 2
-        draw_outlined_text(draw, (x, y_cursor), line, font)
+        draw_outlined_text(draw, (x, y_cursor), line, font, outline_color=outline.color,
+                           outline_width=outline.width, outline_softness=outline.softness)
         y_cursor += height + base_spacing
 
 
+# Layout Calculation:
+# Total Height approx: 500 (Art) + 50 (Gap) + 70 (Kor) + 30 (Gap) + 65 (Eng) = ~715
+# Frame Height: 1080
+# Margin = (1080 - 715) / 2 = ~182
+ART_SIZE = (500, 500)
+ART_TOP = 180  # Top margin
+# Art Bottom is 180 + 500 = 680
+# Gap 50 -> Korean Top 730. Center approx 730 + 35 = 765
+# Gap 30 -> English Top 730 + 70 + 30 = 830. Center approx 830 + 32 = 862
+KOREAN_CENTER_Y = 765
+ENGLISH_CENTER_Y = 870
+# 가사 텍스트가 그려질 수 있는 영역의 시작 (앨범 아트 아래)
+TEXT_BAND_TOP = ART_TOP + ART_SIZE[1]
+FRAME_SIZE = (1920, 1080)
+BACKGROUND_BLUR_RADIUS = 30
+BACKGROUND_DIM_ALPHA = 160
+# 배경 프레임 생성 방식이 바뀌면 올려서 기존 캐시를 무효화
+BASE_FRAME_LAYOUT_VERSION = 1
+# 가사 텍스트 배치/외곽선 방식이 바뀌면 올려서 저장된 렌더링 결과를 무효화
+TEXT_LAYOUT_VERSION = 1
+
+
+def render_cache_params(options: RenderOptions) -> Tuple[object, ...]:
+    """렌더링 결과에 영향을 주는 설정값 (작업 폴더, 워커 수 등 출력과 무관한 값 제외)"""
+    return (
+        BASE_FRAME_LAYOUT_VERSION,
+        TEXT_LAYOUT_VERSION,
+        FRAME_SIZE,
+        resolve_font_path(),
+        options.render_mode,
+        options.stream_fps,
+        options.sprite_fade,
+        options.encode_profile,
+        options.output_height,
+        options.time_window,
+        tuple(_video_encode_args(options.encode_profile)),
+    )
+
+
 def prepare_base_frame(background_img: Image.Image) -> Image.Image:
     frame = background_img.convert('RGBA')
     # Increased blur radius for minimalist look
-    blurred = frame.filter(ImageFilter.GaussianBlur(radius=30))
+    blurred = frame.filter(ImageFilter.GaussianBlur(radius=BACKGROUND_BLUR_RADIUS))
     # Darker overlay for better contrast
-    overlay = Image.new('RGBA', frame.size, (0, 0, 0, 160))
+    overlay = Image.new('RGBA', frame.size, (0, 0, 0, BACKGROUND_DIM_ALPHA))
     base = Image.alpha_composite(blurred, overlay)
     
     # Draw Album Art
     # Resize album art to be smaller (e.g., 500x500)
-    art_size = (500, 500)
-    art_img = background_img.resize(art_size, Image.Resampling.LANCZOS).convert('RGBA')
-    
-    # Layout Calculation:
-    # Total Height approx: 500 (Art) + 50 (Gap) + 70 (Kor) + 30 (Gap) + 65 (Eng) = ~715
-    # Frame Height: 1080
-    # Margin = (1080 - 715) / 2 = ~182
+    art_img = background_img.resize(ART_SIZE, Image.Resampling.LANCZOS).convert('RGBA')
     
-    art_x = (frame.width - art_size[0]) // 2
-    art_y = 180 # Top margin
+    art_x = (frame.width - ART_SIZE[0]) // 2
     
-    base.paste(art_img, (art_x, art_y), art_img)
+    base.paste(art_img, (art_x, ART_TOP), art_img)
     
     return base
 
 
-def create_lyric_frame(base_frame: Image.Image, lyric: Dict[str, str], fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont],
-                       max_width_ratio: float = 0.86) -> Image.Image:
-    """각 가사 프레임 생성"""
-    frame = base_frame.copy()
-    draw = ImageDraw.Draw(frame)
+LyricTextBlocks = List[Tuple[List[str], ImageFont.ImageFont, float]]
 
+
+def _layout_lyric_text(draw: ImageDraw.ImageDraw, lyric: Dict[str, str],
+                       fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont], frame_width: int,
+                       max_width_ratio: float = 0.86) -> LyricTextBlocks:
+    """한글/영어 가사를 줄바꿈하여 (줄 목록, 폰트, 중심 y) 블록으로 반환"""
     korean_font, english_font = fonts
-    max_text_width = frame.width * max_width_ratio
+    max_text_width = frame_width * max_width_ratio
 
     original_text = lyric.get('original', '')
     translated_text = lyric.get('english', '')
 
     korean_lines = _wrap_text(draw, original_text, korean_font, max_text_width)
     english_lines = _wrap_text(draw, translated_text, english_font, max_text_width)
+    return [
+        (korean_lines, korean_font, KOREAN_CENTER_Y),
+        (english_lines, english_font, ENGLISH_CENTER_Y),
+    ]
 
-    # Position lyrics based on calculated layout
-    # Art Bottom is 180 + 500 = 680
-    # Gap 50 -> Korean Top 730. Center approx 730 + 35 = 765
-    # Gap 30 -> English Top 730 + 70 + 30 = 830. Center approx 830 + 32 = 862
-    
-    _draw_multiline_centered(draw, korean_lines, korean_font, frame.width, 765)
-    _draw_multiline_centered(draw, english_lines, english_font, frame.width, 870)
 
+def _lyric_text_top(draw: ImageDraw.ImageDraw, blocks: LyricTextBlocks,
+                    outline: TextOutline = DEFAULT_OUTLINE) -> float:
+    """가사 블록이 차지하는 가장 위쪽 y 좌표 (외곽선 포함)"""
+    top = float('inf')
+    for lines, font, center_y in blocks:
+        lines, _, _, total_height = _multiline_metrics(draw, lines, font)
+        if lines:
+            top = min(top, center_y - total_height / 2)
+    return top - outline.width - math.ceil(outline.softness * 3)
+
+
+def _draw_lyric_blocks(draw: ImageDraw.ImageDraw, blocks: LyricTextBlocks, frame_width: int,
+                       offset_y: float = 0.0, outline: TextOutline = DEFAULT_OUTLINE) -> None:
+    """레이아웃된 가사 블록 그리기 (offset_y로 잘린 캔버스에도 동일 배치)"""
+    for lines, font, center_y in blocks:
+        _draw_multiline_centered(draw, lines, font, frame_width, center_y + offset_y, outline=outline)
+
+
+def _draw_lyric_text(draw: ImageDraw.ImageDraw, lyric: Dict[str, str],
+                     fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont], frame_width: int,
+                     offset_y: float = 0.0, max_width_ratio: float = 0.86,
+                     outline: TextOutline = DEFAULT_OUTLINE) -> None:
+    """한글/영어 가사를 레이아웃 위치에 그리기"""
+    blocks = _layout_lyric_text(draw, lyric, fonts, frame_width, max_width_ratio)
+    _draw_lyric_blocks(draw, blocks, frame_width, offset_y, outline)
+
+
+def _build_base_frame(album_art_path: str, frame_size: Tuple[int, int] = FRAME_SIZE) -> Image.Image:
+    # 앨범아트 로드 및 크기 조정
+    with Image.open(album_art_path) as album_image:
+        background_img = album_image.convert('RGB')
+        background_img = background_img.resize(frame_size, Image.Resampling.LANCZOS)
+    return prepare_base_frame(background_img)
+
+
+def load_base_frame(album_art_path: str, frame_size: Tuple[int, int] = FRAME_SIZE,
+                    use_cache: bool = True) -> Image.Image:
+    """앨범 아트로 배경 프레임 준비 (앨범 아트 해시 기반 디스크 캐시 사용)"""
+    if not use_cache:
+        return _build_base_frame(album_art_path, frame_size)
+
+    layout_params = (BASE_FRAME_LAYOUT_VERSION, frame_size, ART_SIZE, ART_TOP,
+                     BACKGROUND_BLUR_RADIUS, BACKGROUND_DIM_ALPHA)
+    return get_or_create_base_frame(album_art_path, layout_params,
+                                    lambda: _build_base_frame(album_art_path, frame_size))
+
+
+def create_lyric_frame(base_frame: Image.Image, lyric: Dict[str, str], fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont],
+                       max_width_ratio: float = 0.86, outline: TextOutline = DEFAULT_OUTLINE) -> Image.Image:
+    """각 가사 프레임 생성"""
+    frame = base_frame.copy()
+    draw = ImageDraw.Draw(frame)
+    _draw_lyric_text(draw, lyric, fonts, frame.width, max_width_ratio=max_width_ratio, outline=outline)
     return frame.convert('RGB')
 
+
+def create_lyric_sprite(lyric: Dict[str, str], fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont],
+                        frame_size: Tuple[int, int], max_width_ratio: float = 0.86,
+                        outline: TextOutline = DEFAULT_OUTLINE) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+    """가사 텍스트만 담은 투명 스프라이트와 프레임 내 위치 반환 (그릴 내용이 없으면 None)"""
+    frame_width, frame_height = frame_size
+    measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+    blocks = _layout_lyric_text(measure, lyric, fonts, frame_width, max_width_ratio)
+    # 줄 수가 많아 앨범 아트 영역까지 올라가는 경우에도 잘리지 않도록 캔버스 확장
+    band_top = max(0, min(TEXT_BAND_TOP, int(_lyric_text_top(measure, blocks, outline))))
+
+    band = Image.new('RGBA', (frame_width, frame_height - band_top), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(band)
+    _draw_lyric_blocks(draw, blocks, frame_width, offset_y=-band_top, outline=outline)
+
+    bbox = band.getchannel('A').getbbox()
+    if not bbox:
+        return None
+    return band.crop(bbox), (bbox[0], band_top + bbox[1])
+
+
+class BandFrameRenderer:
+    """가사 텍스트 밴드만 다시 그리는 프레임 렌더러.
+
+    앨범 아트 아래 텍스트 밴드를 제외한 정적 영역은 미리 RGB로 변환해 둔 버퍼에 그대로 두고,
+    가사마다 밴드만 래스터화/RGB 변환하여 버퍼에 붙여 넣는다. 결과는 create_lyric_frame과 동일하다.
+    render()가 반환하는 배열은 내부 버퍼이므로 다음 호출 전에 사용해야 한다.
+    """
+
+    def __init__(self, base_frame: Image.Image, fonts: Tuple[ImageFont.ImageFont, ImageFont.ImageFont],
+                 band_top: int = TEXT_BAND_TOP, max_width_ratio: float = 0.86,
+                 outline: TextOutline = DEFAULT_OUTLINE):
+        self.base_frame = base_frame
+        self.fonts = fonts
+        self.band_top = band_top
+        self.max_width_ratio = max_width_ratio
+        self.outline = outline
+        self.size = base_frame.size
+
+        width, height = base_frame.size
+        self._static_rgb = np.asarray(base_frame.convert('RGB'))
+        self._band_base = base_frame.crop((0, band_top, width, height))
+        self._buffer = self._static_rgb.copy()
+        self._band_view = self._buffer[band_top:]
+        self._static_dirty = False
+
+    def render(self, lyric: Dict[str, str]) -> np.ndarray:
+        band = self._band_base.copy()
+        draw = ImageDraw.Draw(band)
+        blocks = _layout_lyric_text(draw, lyric, self.fonts, self.size[0], self.max_width_ratio)
+
+        if _lyric_text_top(draw, blocks, self.outline) < self.band_top:
+            # 텍스트가 밴드 위로 넘치는 드문 경우: 전체 프레임으로 렌더링
+            full = create_lyric_frame(self.base_frame, lyric, self.fonts, self.max_width_ratio, self.outline)
+            self._buffer[:] = np.asarray(full)
+            self._static_dirty = True
+            return self._buffer
+
+        if self._static_dirty:
+            self._buffer[:self.band_top] = self._static_rgb[:self.band_top]
+            self._static_dirty = False
+        _draw_lyric_blocks(draw, blocks, self.size[0], offset_y=-self.band_top, outline=self.outline)
+        self._band_view[:] = np.asarray(band.convert('RGB'))
+        return self._buffer
+
 def parse_srt_file(srt_path: str):
     """SRT 파일 파싱"""
     with open(srt_path, 'r', encoding='utf-8') as f:
@@ -245,133 +506,467 @@ def parse_srt_file(srt_path: str):
     
     return lyrics_data
 
-def make_lyric_video(audio_path: str, album_art_path: str, lyrics_json_path: str, output_path: str):
+def _build_timeline(lyrics_data: List[dict], duration: float) -> List[Tuple[Optional[int], float]]:
+    """가사 인덱스(공백 구간은 None)와 표시 시간(초)의 타임라인 생성"""
+    timeline: List[Tuple[Optional[int], float]] = []
+    current_time = 0.0
+
+    for index, lyric in enumerate(lyrics_data):
+        start_time = float(lyric.get('start_time', 0.0))
+
+        # 가사 시작 전 공백 구간 처리
+        if start_time > current_time:
+            timeline.append((None, start_time - current_time))
+            current_time = start_time
+
+        # 다음 가사 시작 시간 또는 오디오 끝까지
+        if index < len(lyrics_data) - 1:
+            next_start = float(lyrics_data[index + 1].get('start_time', duration))
+        else:
+            next_start = duration
+
+        # 최소 지속 시간 보장
+        next_start = max(next_start, start_time + 0.1)
+        timeline.append((index, next_start - start_time))
+        current_time = next_start
+
+    # 남은 시간 처리
+    if current_time < duration:
+        timeline.append((None, duration - current_time))
+
+    return timeline
+
+
+def _clip_timeline(timeline: List[Tuple[Optional[int], float]],
+                   start: float, end: float) -> List[Tuple[Optional[int], float]]:
+    """타임라인에서 [start, end) 구간만 잘라 0초부터 시작하는 타임라인으로 반환"""
+    clipped: List[Tuple[Optional[int], float]] = []
+    current_time = 0.0
+    for index, clip_duration in timeline:
+        clip_start = max(current_time, start)
+        clip_end = min(current_time + clip_duration, end)
+        if clip_end > clip_start:
+            clipped.append((index, clip_end - clip_start))
+        current_time += clip_duration
+    return clipped
+
+
+def _cut_audio_window(audio_path: str, start: float, length: float, work_dir: str) -> str:
+    """렌더링 구간만큼 오디오를 잘라 WAV로 저장 (재인코딩 없이 빠르게 처리)"""
+    window_audio_path = os.path.join(work_dir, "window_audio.wav")
+    cmd = [
+        FFMPEG_PATH,
+        "-y",
+        "-v", "error",
+        "-ss", f"{start:.3f}",
+        "-t", f"{length:.3f}",
+        "-i", audio_path,
+        "-vn",
+        "-c:a", "pcm_s16le",
+        window_audio_path,
+    ]
+    subprocess.run(cmd, check=True)
+    return window_audio_path
+
+
+def _scaled_size(frame_size: Tuple[int, int], height: Optional[int]) -> Tuple[int, int]:
+    """세로 해상도에 맞춘 출력 크기 (yuv420p를 위해 짝수로 맞춤)"""
+    width, frame_height = frame_size
+    if not height or height >= frame_height:
+        return frame_size
+    scaled_width = int(round(width * height / frame_height / 2)) * 2
+    return scaled_width, height - height % 2
+
+
+def _scale_frame_bytes(frame_bytes, frame_size: Tuple[int, int], output_size: Tuple[int, int]):
+    if output_size == frame_size:
+        return frame_bytes
+    frame = Image.frombytes('RGB', frame_size, frame_bytes)
+    # reducing_gap: 정수 배 박스 축소를 먼저 적용해 1080p→480p 축소 비용을 줄임
+    return frame.resize(output_size, Image.Resampling.BILINEAR, reducing_gap=1.0).tobytes()
+
+
+def _video_encode_args(profile: EncodeProfile = "standard") -> List[str]:
+    if profile == "still":
+        # 가사 변경 시점마다 한 프레임만 인코딩되므로 느린 프리셋도 부담이 적음
+        return [
+            "-c:v", "libx264",
+            "-profile:v", "main",
+            "-level", "4.0",
+            "-pix_fmt", "yuv420p",
+            "-preset", "medium",
+            "-tune", "stillimage",
+            "-crf", "18",
+            # 프레임 수 기준(-g)이면 가사 한 줄에 한 프레임인 VFR 출력에서 키프레임이 거의 없으므로 시간 기준
+            "-force_key_frames", f"expr:gte(t,n_forced*{STILL_KEYFRAME_INTERVAL})",
+        ]
+    if profile == "preview":
+        return [
+            "-c:v", "libx264",
+            "-pix_fmt", "yuv420p",
+            "-preset", "ultrafast",
+            "-crf", "28",
+        ]
+    return [
+        "-c:v", "libx264",
+        "-profile:v", "main",
+        "-level", "4.0",
+        "-pix_fmt", "yuv420p",
+        "-preset", "fast",
+        "-crf", "18",
+    ]
+
+
+def _vfr_args(profile: EncodeProfile) -> List[str]:
+    """still 프로필: 입력 프레임의 시각을 그대로 쓰는 VFR 출력 옵션"""
+    return ["-fps_mode", "vfr"] if profile == "still" else []
+
+
+def _audio_encode_args(profile: EncodeProfile = "standard") -> List[str]:
+    if profile == "preview":
+        # 싱크 확인용: 모노/낮은 샘플레이트로 AAC 인코딩 시간을 크게 줄임
+        return ["-c:a", "aac", "-b:a", "64k", "-ac", "1", "-ar", "22050"]
+    return ["-c:a", "aac", "-b:a", "192k"]
+
+
+def _container_args() -> List[str]:
+    return ["-movflags", "+faststart"]
+
+
+def _encode_args(output_path: str, profile: EncodeProfile = "standard") -> List[str]:
+    """출력 인코딩 옵션 (concat/stream 공통)"""
+    # VFR 출력은 마지막 프레임 이후 구간이 비디오 길이에 포함되지 않아 -shortest를 쓰면 오디오가 잘림
+    duration_args = [] if profile == "still" else ["-shortest"]
+    return [
+        *_video_encode_args(profile),
+        *_audio_encode_args(profile),
+        *_container_args(),
+        *duration_args,
+        output_path
+    ]
+
+
+def _frame_runs(timeline: List[Tuple[Optional[int], float]], fps: int) -> List[Tuple[Optional[int], int]]:
+    """타임라인 구간별 프레임 수 계산 (누적 시간 기준 반올림으로 오차가 쌓이지 않음)"""
+    runs: List[Tuple[Optional[int], int]] = []
+    elapsed = 0.0
+    written_frames = 0
+    for index, clip_duration in timeline:
+        elapsed += clip_duration
+        frame_count = max(int(round(elapsed * fps)) - written_frames, 0)
+        runs.append((index, frame_count))
+        written_frames += frame_count
+    return runs
+
+
+def _render_with_concat(audio_path: str, output_path: str, timeline: List[Tuple[Optional[int], float]],
+                        lyrics_data: List[dict], base_frame: Image.Image, fonts, work_dir: str,
+                        workers: Optional[int] = None, profile: EncodeProfile = "standard",
+                        output_height: Optional[int] = None) -> None:
+    """프레임을 PNG로 저장한 뒤 concat demuxer로 인코딩 (폴백 경로)"""
+    output_size = _scaled_size(base_frame.size, output_height)
+    # 임시 프레임 디렉토리 생성
+    frames_dir = os.path.join(work_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+
+    # 기존 프레임 정리
+    for f in os.listdir(frames_dir):
+        os.remove(os.path.join(frames_dir, f))
+
+    # FFmpeg concat demuxer용 리스트 작성
+    concat_list_path = os.path.join(work_dir, "concat_list.txt")
+    concat_entries = []
+
+    # 기본 배경 이미지 저장
+    base_frame_path = os.path.join(frames_dir, "base_frame.png")
+    base_frame.resize(output_size, Image.Resampling.BILINEAR, reducing_gap=1.0).save(base_frame_path)
+
+    with span("frame_render", mode="concat") as render_span, \
+            ParallelFrameRenderer(base_frame, fonts, workers) as renderer:
+        rendered = renderer.render(lyrics_data[index] for index, _ in timeline if index is not None)
+        for index, clip_duration in timeline:
+            if index is None:
+                frame_path = base_frame_path
+            else:
+                # 가사 프레임 생성 및 저장
+                frame = Image.frombytes('RGB', base_frame.size, next(rendered))
+                if output_size != base_frame.size:
+                    frame = frame.resize(output_size, Image.Resampling.BILINEAR, reducing_gap=1.0)
+                frame_path = os.path.join(frames_dir, f"frame_{index:04d}.png")
+                frame.save(frame_path)
+                render_span.add_bytes(os.path.getsize(frame_path))
+
+            concat_entries.append(f"file '{frame_path.replace(os.sep, '/')}'")
+            concat_entries.append(f"duration {clip_duration:.3f}")
+
+    # 마지막 프레임 반복 (FFmpeg concat 버그 방지)
+    concat_entries.append(f"file '{base_frame_path.replace(os.sep, '/')}'")
+
+    # concat 리스트 파일 저장
+    with open(concat_list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(concat_entries))
+
+    # FFmpeg 명령 실행
+    cmd = [
+        FFMPEG_PATH,
+        "-y",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", concat_list_path,
+        "-i", audio_path,
+        *_vfr_args(profile),
+        *_encode_args(output_path, profile)
+    ]
+
+    print(f"[DEBUG] FFmpeg 실행: {' '.join(cmd)}")
+    with span("encode", mode="concat", profile=profile) as encode_span:
+        subprocess.run(cmd, check=True)
+        encode_span.add_bytes(os.path.getsize(output_path))
+
+
+def _render_with_stream(audio_path: str, output_path: str, timeline: List[Tuple[Optional[int], float]],
+                        lyrics_data: List[dict], base_frame: Image.Image, fonts, fps: int,
+                        workers: Optional[int] = None, profile: EncodeProfile = "standard",
+                        output_height: Optional[int] = None) -> None:
+    """렌더링한 프레임을 raw RGB로 FFmpeg stdin에 바로 전달 (중간 이미지 파일 없음)"""
+    output_size = _scaled_size(base_frame.size, output_height)
+    width, height = output_size
+    cmd = [
+        FFMPEG_PATH,
+        "-y",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-r", str(fps),
+        "-i", "pipe:0",
+        "-i", audio_path,
+        *_vfr_args(profile),
+        *_encode_args(output_path, profile)
+    ]
+
+    base_bytes = _scale_frame_bytes(base_frame.convert('RGB').tobytes(), base_frame.size, output_size)
+    print(f"[DEBUG] FFmpeg 실행 (stream): {' '.join(cmd)}")
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    # 프레임 렌더링과 인코딩이 번갈아 진행되므로 프레임을 기다린 시간과 파이프에 쓰며 막힌 시간을 따로 합산
+    with accumulate("frame_render", mode="stream") as render_timer, \
+            accumulate("encode", mode="stream", profile=profile) as encode_timer:
+        try:
+            with ParallelFrameRenderer(base_frame, fonts, workers) as renderer:
+                rendered = renderer.render(lyrics_data[index] for index, _ in timeline if index is not None)
+                for index, frame_count in _frame_runs(timeline, fps):
+                    if index is None:
+                        frame_bytes = base_bytes
+                    else:
+                        with render_timer:
+                            frame_bytes = _scale_frame_bytes(next(rendered), base_frame.size, output_size)
+                    with encode_timer:
+                        for _ in range(frame_count):
+                            process.stdin.write(frame_bytes)
+                    encode_timer.add_bytes(len(frame_bytes) * frame_count)
+        except BrokenPipeError:
+            # FFmpeg이 먼저 종료된 경우: 아래에서 종료 코드로 처리
+            pass
+        except BaseException:
+            # 렌더링 실패/중단: FFmpeg이 입력을 기다리며 멈추지 않도록 종료한 뒤 원래 예외를 그대로 전달
+            process.kill()
+            raise
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            with encode_timer:
+                return_code = process.wait()
+
+    if return_code != 0:
+        raise subprocess.CalledProcessError(return_code, cmd)
+
+
+def _render_with_overlay(audio_path: str, output_path: str, timeline: List[Tuple[Optional[int], float]],
+                         lyrics_data: List[dict], base_frame: Image.Image, fonts, fps: int, work_dir: str,
+                         fade: float = 0.0, profile: EncodeProfile = "standard") -> None:
+    """가사 스프라이트를 정적 배경 위에 FFmpeg overlay로 합성"""
+    overlay_dir = os.path.join(work_dir, "overlay")
+    os.makedirs(overlay_dir, exist_ok=True)
+    for f in os.listdir(overlay_dir):
+        os.remove(os.path.join(overlay_dir, f))
+
+    base_frame_path = os.path.join(overlay_dir, "base_frame.png")
+    base_frame.convert('RGB').save(base_frame_path)
+
+    sprites: List[SpritePlacement] = []
+    current_time = 0.0
+    with span("frame_render", mode="overlay") as render_span:
+        for index, clip_duration in timeline:
+            start_time = current_time
+            current_time += clip_duration
+            if index is None:
+                continue
+
+            sprite = create_lyric_sprite(lyrics_data[index], fonts, base_frame.size)
+            if sprite is None:
+                continue
+            sprite_image, (x, y) = sprite
+            sprite_path = os.path.join(overlay_dir, f"sprite_{index:04d}.png")
+            sprite_image.save(sprite_path)
+            render_span.add_bytes(os.path.getsize(sprite_path))
+            sprites.append(SpritePlacement(sprite_path, x, y, start_time, current_time))
+
+    # 가사 줄 수만큼 필터가 길어지므로 명령줄 대신 스크립트 파일로 전달
+    filter_script_path = os.path.join(overlay_dir, "filtergraph.txt")
+    with open(filter_script_path, "w", encoding="utf-8") as f:
+        f.write(build_overlay_filtergraph(sprites, current_time, fps, fade=fade,
+                                          drop_duplicates=(profile == "still")))
+
+    cmd = [FFMPEG_PATH, "-y", "-i", base_frame_path, "-i", audio_path]
+    for sprite in sprites:
+        cmd.extend(["-i", sprite.path])
+    cmd.extend([
+        "-filter_complex_script", filter_script_path,
+        "-map", "[vout]",
+        "-map", "1:a",
+        *_vfr_args(profile),
+        *_encode_args(output_path, profile)
+    ])
+
+    print(f"[DEBUG] FFmpeg 실행 (overlay, 스프라이트 {len(sprites)}개)")
+    with span("encode", mode="overlay", profile=profile) as encode_span:
+        subprocess.run(cmd, check=True)
+        encode_span.add_bytes(os.path.getsize(output_path))
+
+
+def _render_with_segments(audio_path: str, output_path: str, timeline: List[Tuple[Optional[int], float]],
+                          lyrics_data: List[dict], base_frame: Image.Image, fonts, fps: int, work_dir: str,
+                          concurrency: int) -> None:
+    """타임라인을 가사 경계에서 나누어 여러 FFmpeg 프로세스로 동시에 인코딩"""
+    base_bytes = base_frame.convert('RGB').tobytes()
+
+    def frame_source_factory():
+        renderer = BandFrameRenderer(base_frame, fonts)
+
+        def frame_source(index: Optional[int]):
+            if index is None:
+                return base_bytes
+            return memoryview(renderer.render(lyrics_data[index])).cast('B')
+
+        return frame_source
+
+    # 구간별 워커가 렌더링과 인코딩을 함께 하므로 하나의 구간으로 기록
+    with span("encode", mode="segments", workers=concurrency) as encode_span:
+        encode_segments_parallel(
+            _frame_runs(timeline, fps), frame_source_factory, base_frame.size, fps, audio_path, output_path,
+            work_dir, _video_encode_args(), _audio_encode_args(), _container_args(), concurrency
+        )
+        encode_span.add_bytes(os.path.getsize(output_path))
+
+
+def make_lyric_video(audio_path: str, album_art_path: str, lyrics_json_path: str, output_path: str,
+                     options: Optional[RenderOptions] = None):
     """리릭 비디오 생성 (FFmpeg 직접 사용)"""
+    options = options or RenderOptions()
+    if options.work_dir is not None:
+        return _make_lyric_video(audio_path, album_art_path, lyrics_json_path, output_path, options)
+    with JobWorkspace("render") as workspace:
+        return _make_lyric_video(audio_path, album_art_path, lyrics_json_path, output_path,
+                                 replace(options, work_dir=workspace.dir))
+
+
+def _make_lyric_video(audio_path: str, album_art_path: str, lyrics_json_path: str, output_path: str,
+                      options: RenderOptions):
     try:
         print("[DEBUG] 리릭 비디오 생성 시작")
 
         os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         ensure_data_dirs()
-        os.makedirs(TEMP_DIR, exist_ok=True)
-        
-        # 임시 프레임 디렉토리 생성
-        frames_dir = os.path.join(TEMP_DIR, "frames")
-        os.makedirs(frames_dir, exist_ok=True)
-        
-        # 기존 프레임 정리
-        for f in os.listdir(frames_dir):
-            os.remove(os.path.join(frames_dir, f))
+        os.makedirs(options.work_dir, exist_ok=True)
 
-        try:
-            # 오디오 길이 확인
-            duration = get_audio_duration(audio_path)
-            if duration <= 0:
-                raise ValueError("오디오 길이를 확인할 수 없습니다.")
-
-            # 앨범아트 로드 및 크기 조정
-            with Image.open(album_art_path) as album_image:
-                background_img = album_image.convert('RGB')
-                background_img = background_img.resize((1920, 1080), Image.Resampling.LANCZOS)
-            lyric_base_frame = prepare_base_frame(background_img)
-            fonts = prepare_fonts()
+        # 오디오 길이 확인
+        duration = get_audio_duration(audio_path)
+        if duration <= 0:
+            raise ValueError("오디오 길이를 확인할 수 없습니다.")
 
-            # 가사 JSON 로드 및 정렬
-            with open(lyrics_json_path, 'r', encoding='utf-8') as f:
-                lyrics_data = json.load(f)
-
-            if not lyrics_data:
-                raise ValueError("가사 데이터가 비어 있습니다.")
-
-            lyrics_data.sort(key=lambda item: float(item.get('start_time', 0.0)))
-
-            # FFmpeg concat demuxer용 리스트 작성
-            concat_list_path = os.path.join(TEMP_DIR, "concat_list.txt")
-            concat_entries = []
-            
-            current_time = 0.0
-            
-            # 기본 배경 이미지 저장
-            base_frame_path = os.path.join(frames_dir, "base_frame.png")
-            lyric_base_frame.save(base_frame_path)
-            
-            for index, lyric in enumerate(lyrics_data):
-                start_time = float(lyric.get('start_time', 0.0))
-                
-                # 가사 시작 전 공백 구간 처리
-                if start_time > current_time:
-                    gap_duration = start_time - current_time
-                    concat_entries.append(f"file '{base_frame_path.replace(os.sep, '/')}'")
-                    concat_entries.append(f"duration {gap_duration:.3f}")
-                    current_time = start_time
-                
-                # 다음 가사 시작 시간 또는 오디오 끝까지
-                if index < len(lyrics_data) - 1:
-                    next_start = float(lyrics_data[index + 1].get('start_time', duration))
-                else:
-                    next_start = duration
-                
-                # 최소 지속 시간 보장
-                next_start = max(next_start, start_time + 0.1)
-                clip_duration = next_start - start_time
-                
-                # 가사 프레임 생성 및 저장
-                frame = create_lyric_frame(lyric_base_frame, lyric, fonts)
-                frame_path = os.path.join(frames_dir, f"frame_{index:04d}.png")
-                frame.save(frame_path)
-                
-                concat_entries.append(f"file '{frame_path.replace(os.sep, '/')}'")
-                concat_entries.append(f"duration {clip_duration:.3f}")
-                
-                current_time = next_start
-
-            # 남은 시간 처리
-            if current_time < duration:
-                remaining_duration = duration - current_time
-                concat_entries.append(f"file '{base_frame_path.replace(os.sep, '/')}'")
-                concat_entries.append(f"duration {remaining_duration:.3f}")
-            
-            # 마지막 프레임 반복 (FFmpeg concat 버그 방지)
-            concat_entries.append(f"file '{base_frame_path.replace(os.sep, '/')}'")
-
-            # concat 리스트 파일 저장
-            with open(concat_list_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(concat_entries))
-
-            # FFmpeg 명령 실행
-            cmd = [
-                FFMPEG_PATH,
-                "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_list_path,
-                "-i", audio_path,
-                "-c:v", "libx264",
-                "-profile:v", "main",
-                "-level", "4.0",
-                "-c:a", "aac",
-                "-b:a", "192k",
-                "-pix_fmt", "yuv420p",
-                "-movflags", "+faststart",
-                "-shortest",
-                "-preset", "fast",
-                "-crf", "18",
-                output_path
-            ]
-            
-            print(f"[DEBUG] FFmpeg 실행: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True)
-
-            print(f"[DEBUG] 리릭 비디오 생성 완료: {output_path}")
+        with span("base_frame"):
+            lyric_base_frame = load_base_frame(album_art_path)
+            fonts = prepare_fonts()
 
-        finally:
-            # 임시 파일 정리 (선택 사항, 디버깅 위해 남겨둘 수도 있음)
-            pass
+        # 가사 JSON 로드 및 정렬
+        with open(lyrics_json_path, 'r', encoding='utf-8') as f:
+            lyrics_data = json.load(f)
+
+        if not lyrics_data:
+            raise ValueError("가사 데이터가 비어 있습니다.")
+
+        lyrics_data.sort(key=lambda item: float(item.get('start_time', 0.0)))
+        timeline = _build_timeline(lyrics_data, duration)
+
+        if options.time_window is not None:
+            window_start = max(0.0, float(options.time_window[0]))
+            window_end = min(duration, float(options.time_window[1]))
+            if window_end <= window_start:
+                raise ValueError(f"렌더링 구간이 올바르지 않습니다: {options.time_window}")
+            print(f"[DEBUG] 렌더링 구간: {window_start:.2f}s ~ {window_end:.2f}s")
+            timeline = _clip_timeline(timeline, window_start, window_end)
+            audio_path = _cut_audio_window(audio_path, window_start, window_end - window_start,
+                                           options.work_dir)
+
+        # 지표용 명목 프레임 수 (재생 시간 × fps, 실제 모드별 프레임 수와 무관하게 처리 속도 비교용)
+        frame_total = sum(frame_count for _, frame_count in _frame_runs(timeline, options.stream_fps))
+        encode_started = time.perf_counter()
+        used_mode = _render_timeline(audio_path, output_path, timeline, lyrics_data, lyric_base_frame, fonts,
+                                     options)
+        get_metrics().record_encode(used_mode, frame_total, time.perf_counter() - encode_started)
+        print(f"[DEBUG] 리릭 비디오 생성 완료: {output_path}")
 
     except Exception as e:
         print(f"[ERROR] 비디오 생성 실패: {str(e)}")
         traceback.print_exc()
         raise e
 
+
+def _render_timeline(audio_path: str, output_path: str, timeline: List[Tuple[Optional[int], float]],
+                     lyrics_data: List[dict], lyric_base_frame: Image.Image, fonts,
+                     options: RenderOptions) -> str:
+    """렌더링 모드에 맞는 경로로 인코딩하고 실제로 사용한 방식(overlay/segments/stream/concat) 반환"""
+    render_mode = options.render_mode
+    if render_mode == "overlay" and options.output_height:
+        # overlay 필터 그래프는 1080p 좌표 기준이므로 축소 출력은 stream 경로로 처리
+        render_mode = "stream"
+    if render_mode == "stream" and options.encode_profile == "still":
+        # 고정 프레임레이트 프레임을 모두 만들어 파이프로 보내지 않고, 가사가 바뀔 때만 프레임을 만들어
+        # concat 목록의 duration으로 표시 시간을 지정
+        render_mode = "concat"
+
+    if render_mode == "overlay":
+        _render_with_overlay(audio_path, output_path, timeline, lyrics_data, lyric_base_frame, fonts,
+                             options.stream_fps, options.work_dir, options.sprite_fade,
+                             options.encode_profile)
+        return "overlay"
+
+    # still 프로필은 프레임 수가 적어 인코딩이 빠르고, 구간 검사(CFR 기준)와 맞지 않으므로 제외
+    if (render_mode == "stream" and options.segment_workers > 1
+            and options.encode_profile == "standard" and not options.output_height):
+        try:
+            _render_with_segments(audio_path, output_path, timeline, lyrics_data, lyric_base_frame, fonts,
+                                  options.stream_fps, options.work_dir, options.segment_workers)
+            return "segments"
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as segment_error:
+            print(f"[WARN] 구간 병렬 인코딩 실패, 단일 인코딩으로 재시도: {segment_error}")
+
+    if render_mode == "stream":
+        try:
+            _render_with_stream(audio_path, output_path, timeline, lyrics_data, lyric_base_frame, fonts,
+                                options.stream_fps, options.render_workers, options.encode_profile,
+                                options.output_height)
+            return "stream"
+        except (OSError, subprocess.CalledProcessError) as stream_error:
+            print(f"[WARN] 스트리밍 렌더링 실패, concat 방식으로 재시도: {stream_error}")
+
+    _render_with_concat(audio_path, output_path, timeline, lyrics_data, lyric_base_frame, fonts,
+                        options.work_dir, options.render_workers, options.encode_profile,
+                        options.output_height)
+    return "concat"
+
 def convert_timestamp_to_seconds(timestamp: str) -> float:
     """SRT 타임스탬프를 초 단위로 변환"""
     hours, minutes, seconds = timestamp.replace(',', '.').split(':')
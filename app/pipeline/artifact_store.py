@@ -0,0 +1,264 @@
+"""Persistent content-addressed store for pipeline artifacts.
+
+다운로드한 오디오, 앨범 아트, 번역된 가사 JSON, 렌더링 결과를 입력값(URL, LRC 내용 해시,
+번역 모델, 레이아웃 버전 등)의 해시를 키로 ``DATA_DIR/artifacts/<종류>/``에 보관한다.
+같은 작업을 다시 실행하면 각 단계가 저장소를 먼저 확인하여 다운로드/번역/렌더링을 건너뛴다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제한다.
+
+CLI: ``python -m app.pipeline.artifact_store {list,stats,prune,clear}``
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from app.config.paths import ARTIFACT_DIR
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024
+META_SUFFIX = ".meta.json"
+# 메타 파일에 확장자를 기록하기 전에 저장된 항목의 확장자 후보
+_LEGACY_EXTENSIONS = (".mp3", ".jpg", ".json", ".mp4", ".png", ".xml", ".wav", "")
+
+
+def _max_store_bytes() -> int:
+    env_value = os.getenv("LYRIC_ARTIFACT_CACHE_MB")
+    if env_value and env_value.strip().isdigit():
+        return int(env_value) * 1024 * 1024
+    return DEFAULT_MAX_BYTES
+
+
+def artifact_key(*parts: object) -> str:
+    """입력값들로 저장소 키 생성"""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ArtifactEntry:
+    kind: str
+    key: str
+    path: str
+    size: int
+    last_used: float
+    meta: Dict[str, object] = field(default_factory=dict)
+
+
+class ArtifactStore:
+    """종류(kind)와 키로 파일을 보관/복원하는 디스크 저장소"""
+
+    def __init__(self, root: str = ARTIFACT_DIR, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = _max_store_bytes() if max_bytes is None else max_bytes
+
+    def _kind_dir(self, kind: str) -> str:
+        return os.path.join(self.root, kind)
+
+    def _find(self, kind: str, key: str) -> Optional[str]:
+        """메타 파일에 기록된 확장자로 경로를 바로 만들어 확인 (저장소 크기와 무관하게 파일 몇 개만 접근)"""
+        meta = self._read_meta(kind, key)
+        if not meta:
+            return None
+        extension = meta.get("extension")
+        candidates = [extension] if isinstance(extension, str) else _LEGACY_EXTENSIONS
+        for candidate in candidates:
+            path = os.path.join(self._kind_dir(kind), f"{key}{candidate}")
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def lookup(self, kind: str, key: str) -> Optional[str]:
+        """저장된 파일 경로 (없으면 None). 찾으면 LRU용 사용 시각 갱신"""
+        path = self._find(kind, key)
+        if path is None:
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, kind: str, key: str, dest_path: str) -> bool:
+        """저장된 파일을 dest_path로 복사 (있으면 True)"""
+        path = self.lookup(kind, key)
+        if path is None:
+            return False
+        try:
+            os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+            shutil.copyfile(path, dest_path)
+        except OSError as e:
+            print(f"[WARN] 아티팩트 복원 실패 ({kind}/{key[:12]}): {e}")
+            return False
+        print(f"[DEBUG] 아티팩트 재사용: {kind}/{key[:12]}")
+        return True
+
+    def store(self, kind: str, key: str, source_path: str,
+              meta: Optional[Dict[str, object]] = None) -> Optional[str]:
+        """source_path를 복사하여 저장 (출력 파일이 나중에 덮어써져도 저장본은 유지됨)"""
+        try:
+            kind_dir = self._kind_dir(kind)
+            os.makedirs(kind_dir, exist_ok=True)
+            extension = os.path.splitext(source_path)[1]
+            path = os.path.join(kind_dir, f"{key}{extension}")
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, path)
+
+            meta_record = {"kind": kind, "key": key, "extension": extension, "stored_at": time.time(),
+                           **(meta or {})}
+            with open(os.path.join(kind_dir, f"{key}{META_SUFFIX}"), "w", encoding="utf-8") as f:
+                json.dump(meta_record, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"[WARN] 아티팩트 저장 실패 ({kind}/{key[:12]}): {e}")
+            return None
+
+        self.prune(self.max_bytes)
+        return path
+
+    def entries(self, kind: Optional[str] = None) -> List[ArtifactEntry]:
+        """저장된 항목 목록 (오래 사용하지 않은 순)"""
+        if not os.path.isdir(self.root):
+            return []
+        kinds: Iterable[str] = [kind] if kind else sorted(os.listdir(self.root))
+        result: List[ArtifactEntry] = []
+        for entry_kind in kinds:
+            kind_dir = self._kind_dir(entry_kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in os.listdir(kind_dir):
+                if name.endswith(META_SUFFIX) or name.endswith(".tmp"):
+                    continue
+                path = os.path.join(kind_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                key = os.path.splitext(name)[0]
+                result.append(ArtifactEntry(entry_kind, key, path, stat.st_size, stat.st_mtime,
+                                            self._read_meta(entry_kind, key)))
+        result.sort(key=lambda entry: entry.last_used)
+        return result
+
+    def _read_meta(self, kind: str, key: str) -> Dict[str, object]:
+        try:
+            with open(os.path.join(self._kind_dir(kind), f"{key}{META_SUFFIX}"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def remove(self, entry: ArtifactEntry) -> None:
+        for path in (entry.path, os.path.join(self._kind_dir(entry.kind), f"{entry.key}{META_SUFFIX}")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def prune(self, max_bytes: Optional[int] = None, kind: Optional[str] = None,
+              older_than: Optional[float] = None) -> int:
+        """크기 한도/사용 시각 기준으로 오래된 항목 삭제, 삭제한 개수 반환"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries(kind)
+        total = sum(entry.size for entry in entries)
+        now = time.time()
+        removed = 0
+        for entry in entries:
+            expired = older_than is not None and now - entry.last_used > older_than
+            if total <= max_bytes and not expired:
+                if older_than is None:
+                    break
+                continue
+            self.remove(entry)
+            total -= entry.size
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """종류별 항목 수와 크기(바이트)"""
+        result: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries():
+            kind_stats = result.setdefault(entry.kind, {"count": 0, "bytes": 0})
+            kind_stats["count"] += 1
+            kind_stats["bytes"] += entry.size
+        return result
+
+
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """프로세스 전역 아티팩트 저장소 반환"""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.pipeline.artifact_store",
+                                     description="아티팩트 저장소 조회/정리")
+    parser.add_argument("--root", default=ARTIFACT_DIR, help="저장소 경로")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="저장된 항목 목록 (오래 사용하지 않은 순)")
+    list_parser.add_argument("--kind", help="audio, album_art, lyrics, render 등")
+    commands.add_parser("stats", help="종류별 항목 수와 크기")
+    prune_parser = commands.add_parser("prune", help="크기 한도/기간 기준으로 오래된 항목 삭제")
+    prune_parser.add_argument("--max-mb", type=int, help="남길 최대 크기(MB), 기본값은 저장소 한도")
+    prune_parser.add_argument("--older-than-days", type=float, help="이 기간 동안 사용하지 않은 항목 삭제")
+    prune_parser.add_argument("--kind", help="특정 종류만 정리")
+    clear_parser = commands.add_parser("clear", help="항목 전체 삭제")
+    clear_parser.add_argument("--kind", help="특정 종류만 삭제")
+
+    args = parser.parse_args(argv)
+    store = ArtifactStore(args.root)
+
+    if args.command == "list":
+        for entry in store.entries(args.kind):
+            label = entry.meta.get("label", "")
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.last_used))
+            print(f"{entry.kind:<10} {entry.key[:12]}  {_format_size(entry.size):>10}  {used}  {label}")
+    elif args.command == "stats":
+        stats = store.stats()
+        for kind, kind_stats in sorted(stats.items()):
+            print(f"{kind:<10} {kind_stats['count']:5d}개  {_format_size(kind_stats['bytes']):>10}")
+        total = sum(kind_stats["bytes"] for kind_stats in stats.values())
+        print(f"{'total':<10} {sum(s['count'] for s in stats.values()):5d}개  {_format_size(total):>10}"
+              f"  (한도 {_format_size(store.max_bytes)})")
+    elif args.command == "prune":
+        max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None else None
+        older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+        removed = store.prune(max_bytes, kind=args.kind, older_than=older_than)
+        print(f"{removed}개 항목 삭제")
+    elif args.command == "clear":
+        entries = store.entries(args.kind)
+        for entry in entries:
+            store.remove(entry)
+        print(f"{len(entries)}개 항목 삭제")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,271 @@
+"""Bounded-concurrency batch scheduler for lyric video jobs.
+
+여러 곡을 한 이벤트 루프에서 동시에 처리하되, 자원 종류별 동시 실행 수(ResourcePools)로
+다운로드·번역·렌더링이 서로 겹치며 파이프라인처럼 흘러가게 한다. 동시에 진행 중인 작업 수도
+제한하여 다운로드한 임시 파일이 한꺼번에 쌓이지 않도록 한다. 끝나면 곡별 상태와 소요 시간을 보고한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Literal, Optional, Sequence
+
+from app.config.paths import TEMP_DIR
+from app.pipeline.job_journal import JobJournal, config_from_record, job_id_for
+from app.pipeline.metrics import get_metrics
+from app.pipeline.process_manager import OutputMode, ProcessConfig, ProcessManager, StageEvent
+from app.pipeline.resources import RESOURCE_KINDS, ResourceLimits, ResourcePools
+from app.pipeline.sources import PipelineSources, write_synthetic_lrc
+from app.pipeline.timing import JobTrace, write_batch_reports
+from app.pipeline.workspace import CleanupPolicy, cleanup_stale_workspaces
+
+JobStatus = Literal["success", "failed", "skipped"]
+# (작업 이름, 진행 메시지, 진행률)
+BatchProgress = Callable[[str, str, int], None]
+# (작업 이름, 단계 이벤트)
+BatchStageListener = Callable[[str, StageEvent], None]
+
+
+@dataclass
+class BatchJob:
+    """배치 작업 하나 (name은 보고서/로그 표시용)"""
+    name: str
+    config: ProcessConfig
+    skip_reason: Optional[str] = None
+
+
+@dataclass
+class BatchJobResult:
+    name: str
+    status: JobStatus
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    # 작업 시작(슬롯 획득)부터 종료까지 걸린 시간(초)
+    elapsed: float = 0.0
+    # 배치 시작부터 작업 시작까지 대기한 시간(초)
+    queued: float = 0.0
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    trace: Optional[JobTrace] = None
+
+
+class BatchScheduler:
+    """자원별 동시 실행 제한을 공유하는 ProcessManager들로 배치 작업을 처리"""
+
+    def __init__(self, limits: Optional[ResourceLimits] = None, max_active_jobs: int = 8,
+                 sources: Optional[PipelineSources] = None,
+                 on_progress: Optional[BatchProgress] = None, journal: Optional[JobJournal] = None,
+                 on_stage: Optional[BatchStageListener] = None,
+                 on_job_done: Optional[Callable[[BatchJobResult], None]] = None,
+                 trace_dir: Optional[str] = None, workspace_cleanup: Optional[CleanupPolicy] = None,
+                 segment_workers: Optional[int] = None):
+        self.limits = limits or ResourceLimits()
+        self.max_active_jobs = max(1, max_active_jobs)
+        self.sources = sources
+        self.on_progress = on_progress
+        # job_id가 있는 작업은 단계 완료/결과를 기록하여 중단 후 재실행 시 이어서 처리
+        self.journal = journal
+        self.on_stage = on_stage
+        self.on_job_done = on_job_done
+        # 지정하면 작업별 구간 기록과 배치 집계 보고서/Chrome trace를 이 폴더에 저장
+        self.trace_dir = trace_dir
+        # 지정하면 모든 작업의 작업 폴더 정리 정책을 이 값으로 설정 (작업 ID에는 영향 없음)
+        self.workspace_cleanup = workspace_cleanup
+        # 지정하면 모든 작업의 구간 병렬 인코딩 프로세스 수를 이 값으로 설정
+        self.segment_workers = segment_workers
+        self.pools: Optional[ResourcePools] = None
+
+    async def run(self, jobs: Sequence[BatchJob]) -> List[BatchJobResult]:
+        """모든 작업을 처리하고 입력 순서대로 결과 반환 (실패한 작업이 있어도 계속 진행)"""
+        self.pools = ResourcePools(self.limits)
+        active = asyncio.Semaphore(self.max_active_jobs)
+        cleanup_stale_workspaces()
+        batch_started = time.perf_counter()
+        for job in jobs:
+            if self.trace_dir:
+                job.config.trace_dir = job.config.trace_dir or self.trace_dir
+            if self.workspace_cleanup:
+                job.config.workspace_cleanup = self.workspace_cleanup
+            if self.segment_workers:
+                job.config.segment_workers = self.segment_workers
+        if self.journal:
+            for job in jobs:
+                if job.config.job_id and not job.skip_reason:
+                    self.journal.add(job.config.job_id, job.config)
+
+        async def run_job(job: BatchJob) -> BatchJobResult:
+            result = await process_job(job)
+            if self.on_job_done:
+                self.on_job_done(result)
+            return result
+
+        async def process_job(job: BatchJob) -> BatchJobResult:
+            if job.skip_reason:
+                print(f"[WARN] 작업 건너뜀 ({job.name}): {job.skip_reason}")
+                return BatchJobResult(job.name, "skipped", error=job.skip_reason)
+
+            # 동시 진행 상한(max_active_jobs) 때문에 아직 시작하지 못한 작업 수
+            queue_depth = get_metrics().queue_depth
+            queue_depth.inc(queue="batch")
+            try:
+                await active.acquire()
+            finally:
+                queue_depth.dec(queue="batch")
+            try:
+                started = time.perf_counter()
+                on_stage = (lambda event, name=job.name: self.on_stage(name, event)) if self.on_stage else None
+                manager = ProcessManager(self._progress_callback(job.name), resources=self.pools,
+                                         sources=self.sources, journal=self.journal, on_stage=on_stage)
+                validation_error = manager.validate_config(job.config)
+                if validation_error:
+                    get_metrics().jobs_total.inc(status="failed")
+                    if self.journal and job.config.job_id:
+                        self.journal.fail(job.config.job_id, validation_error)
+                    return BatchJobResult(job.name, "failed", error=validation_error,
+                                          queued=started - batch_started)
+                try:
+                    output_path = await manager.process_async(job.config)
+                    status: JobStatus = "success"
+                    error = None
+                except Exception as e:
+                    print(f"[ERROR] 배치 작업 실패 ({job.name}): {e}")
+                    traceback.print_exc()
+                    output_path, status, error = None, "failed", str(e)
+
+                return BatchJobResult(
+                    job.name, status, output_path=output_path, error=error,
+                    elapsed=time.perf_counter() - started, queued=started - batch_started,
+                    stage_timings=dict(manager.stage_timings), trace=manager.trace,
+                )
+            finally:
+                active.release()
+
+        results = list(await asyncio.gather(*(run_job(job) for job in jobs)))
+        if self.trace_dir:
+            traces = [result.trace for result in results if result.trace is not None]
+            write_batch_reports(traces, self.trace_dir)
+        return results
+
+    def _progress_callback(self, name: str) -> Callable[[str, int], None]:
+        def report(message: str, value: int) -> None:
+            if self.on_progress:
+                self.on_progress(name, message, value)
+        return report
+
+
+def load_batch_jobs(jobs_path: str, output_mode: OutputMode = "video") -> List[BatchJob]:
+    """batch_jobs.json 형식(title/artist/album_art_url/youtube_url/lrc_path 목록)의 작업 읽기
+
+    lrc_path가 없으면 genie_id(선택)와 아티스트/제목으로 가사 색인에서 LRC를 찾는다.
+    """
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+
+    batch_jobs = []
+    for job in jobs:
+        config = ProcessConfig(
+            title=job["title"],
+            artist=job["artist"],
+            album_art_url=job["album_art_url"],
+            youtube_url=job["youtube_url"],
+            lrc_path=job.get("lrc_path"),
+            genie_song_id=job.get("genie_id"),
+            output_mode=output_mode,
+            prefer_youtube=True,
+            segment_workers=job.get("segment_workers"),
+        )
+        skip_reason = None
+        if not job["album_art_url"]:
+            skip_reason = "Missing album_art_url. Please fill it in batch_jobs.json"
+        batch_jobs.append(BatchJob(f"{job['artist']} - {job['title']}", config, skip_reason))
+    return batch_jobs
+
+
+def synthetic_batch_jobs(count: int, output_mode: OutputMode = "video") -> List[BatchJob]:
+    """오프라인 시험용 가짜 작업 (LRC 파일은 TEMP_DIR/offline에 생성)"""
+    lrc_dir = os.path.join(TEMP_DIR, "offline")
+    batch_jobs = []
+    for index in range(count):
+        title = f"Offline Song {index + 1:02d}"
+        lrc_path = write_synthetic_lrc(os.path.join(lrc_dir, f"{title}.lrc"))
+        config = ProcessConfig(
+            title=title,
+            artist="Batch Test",
+            album_art_url=f"offline://art/{index}",
+            youtube_url=f"offline://audio/{index}",
+            lrc_path=lrc_path,
+            output_mode=output_mode,
+            prefer_youtube=True,
+        )
+        batch_jobs.append(BatchJob(f"Batch Test - {title}", config))
+    return batch_jobs
+
+
+def resumable_batch_jobs(journal: JobJournal) -> List[BatchJob]:
+    """작업 기록에서 끝나지 않은(중단/실패) 작업 복원"""
+    batch_jobs = []
+    for record in journal.unfinished():
+        config = config_from_record(record, ProcessConfig)
+        batch_jobs.append(BatchJob(f"{config.artist} - {config.title}", config))
+    return batch_jobs
+
+
+def apply_journal(jobs: Sequence[BatchJob], journal: JobJournal, fresh: bool = False) -> None:
+    """작업마다 ID를 부여하고, 이미 완료된 작업은 건너뜀 (fresh면 기록을 지우고 처음부터)"""
+    for job in jobs:
+        if job.config.job_id is None:
+            job.config.job_id = job_id_for(job.config)
+        if fresh:
+            journal.remove(job.config.job_id)
+            continue
+        record = journal.get(job.config.job_id)
+        if job.skip_reason is None and record and record.status == "done" \
+                and record.output_path and os.path.exists(record.output_path):
+            job.skip_reason = f"이미 완료됨 ({record.output_path})"
+
+
+def format_batch_report(results: Sequence[BatchJobResult], total_elapsed: Optional[float] = None,
+                        pools: Optional[ResourcePools] = None,
+                        translation: Optional[Dict[str, float]] = None) -> str:
+    """곡별 상태/소요 시간과 자원별 사용 현황을 표 형태 문자열로 정리"""
+    stage_names: List[str] = []
+    for result in results:
+        for name in result.stage_timings:
+            if name not in stage_names:
+                stage_names.append(name)
+
+    name_width = max([len("job")] + [len(result.name) for result in results])
+    header = f"{'job':<{name_width}}  {'status':<7}  {'queued':>7}  {'total':>7}"
+    header += "".join(f"  {name:>11}" for name in stage_names)
+    lines = [header, "-" * len(header)]
+    for result in results:
+        line = (f"{result.name:<{name_width}}  {result.status:<7}  {result.queued:6.1f}s  "
+                f"{result.elapsed:6.1f}s")
+        for name in stage_names:
+            value = result.stage_timings.get(name)
+            line += f"  {value:10.1f}s" if value is not None else f"  {'-':>11}"
+        lines.append(line)
+        if result.error:
+            lines.append(f"    -> {result.error}")
+
+    counts = {status: sum(1 for r in results if r.status == status) for status in ("success", "failed", "skipped")}
+    summary = f"성공 {counts['success']} / 실패 {counts['failed']} / 건너뜀 {counts['skipped']}"
+    if total_elapsed is not None:
+        busy = sum(result.elapsed for result in results)
+        summary += f", 전체 {total_elapsed:.1f}s (작업 시간 합계 {busy:.1f}s)"
+    lines.append(summary)
+
+    if pools is not None:
+        for kind in RESOURCE_KINDS:
+            usage = pools.usage[kind]
+            limit = getattr(pools.limits, kind) or "∞"
+            lines.append(f"  {kind:<8} 동시 {limit}  사용 {usage.acquisitions}회  "
+                         f"사용 시간 {usage.busy_seconds:6.1f}s  대기 {usage.wait_seconds:6.1f}s")
+    if translation and translation["lines"]:
+        lines.append(f"  번역 줄 {translation['lines']:.0f}개 중 {translation['sent']:.0f}개 전송 "
+                     f"(중복 제거 {translation['dedupe_ratio']:.0%})")
+    return "\n".join(lines)
@@ -0,0 +1,226 @@
+"""Crash-safe append-only journal of pipeline jobs.
+
+작업 추가/시작/단계 완료/완료/실패/삭제를 JSONL 한 줄씩 추가 기록하고 매번 fsync한다.
+앱이 중간에 종료되어도 다시 읽어 들이면 작업마다 완료된 단계와 결과 파일(키, 경로)을 알 수 있어,
+재시작 시 미완료 작업을 첫 번째 미완료 단계부터 이어서 처리할 수 있다.
+마지막 줄이 쓰다 만 상태로 남아 있으면 무시한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Literal, Optional
+
+from app.config.paths import BATCH_JOURNAL_PATH
+
+JobState = Literal["pending", "running", "done", "failed"]
+UNFINISHED_STATES = ("pending", "running", "failed")
+
+
+@dataclass
+class JobRecord:
+    job_id: str
+    config: Dict[str, Any]
+    status: JobState = "pending"
+    # 단계 이름 -> {"key": 아티팩트 키, "path": 결과 파일 경로}
+    stages: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    updated_at: float = 0.0
+
+
+# 결과물을 결정하는 설정만 작업 ID에 반영 (trace_dir, workspace_cleanup, use_artifact_cache, segment_workers 등
+# 실행 방식만 바꾸는 값이 달라도 --resume/완료 작업 건너뛰기가 같은 기록을 찾도록)
+JOB_ID_FIELDS = (
+    "title",
+    "artist",
+    "album_art_url",
+    "youtube_url",
+    "prefer_youtube",
+    "lrc_path",
+    "genie_song_id",
+    "output_mode",
+    "encode_profile",
+    "preview_window",
+)
+
+
+def job_id_for(config: Any) -> str:
+    """작업 설정(ProcessConfig 또는 dict)으로 안정적인 작업 ID 생성 (같은 곡을 다시 넣으면 같은 ID)"""
+    values = asdict(config) if not isinstance(config, dict) else dict(config)
+    identity = {name: values.get(name) for name in JOB_ID_FIELDS}
+    encoded = json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def config_from_record(record: JobRecord, config_cls):
+    """기록된 설정으로 config_cls(ProcessConfig) 복원 (모르는 필드는 무시)"""
+    known = {f.name for f in fields(config_cls)}
+    values = {key: value for key, value in record.config.items() if key in known}
+    if isinstance(values.get("preview_window"), list):
+        values["preview_window"] = tuple(values["preview_window"])
+    values["job_id"] = record.job_id
+    return config_cls(**values)
+
+
+class JobJournal:
+    """작업 상태를 JSONL로 누적 기록하고 재생하여 현재 상태를 유지"""
+
+    def __init__(self, path: str = BATCH_JOURNAL_PATH, compact_threshold: int = 500):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._records: Dict[str, JobRecord] = {}
+        self._line_count = 0
+        self._load()
+        if self._line_count > self.compact_threshold and self._line_count > 4 * len(self._records):
+            self.compact()
+
+    # 기록 재생 ---------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        complete_size = data.rfind(b"\n") + 1
+        if complete_size < len(data):
+            # 기록 중 종료되어 잘린 마지막 줄은 잘라내어 다음 기록이 이어 붙지 않도록 함
+            print(f"[WARN] 작업 기록의 잘린 마지막 줄을 제거합니다: {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(complete_size)
+        for line in data[:complete_size].decode("utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                print(f"[WARN] 작업 기록의 손상된 줄을 건너뜁니다: {self.path}")
+                continue
+            self._line_count += 1
+            self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        job_id = event.get("job_id")
+        kind = event.get("event")
+        if not job_id or not kind:
+            return
+        timestamp = event.get("ts", 0.0)
+
+        if kind == "add":
+            record = self._records.get(job_id)
+            if record is None:
+                record = JobRecord(job_id, event.get("config", {}))
+                self._records[job_id] = record
+            else:
+                record.config = event.get("config", record.config)
+            record.status = "pending"
+            record.error = None
+        elif kind == "remove":
+            self._records.pop(job_id, None)
+            return
+        else:
+            record = self._records.get(job_id)
+            if record is None:
+                return
+            if kind == "start":
+                record.status = "running"
+            elif kind == "stage":
+                record.stages[event["stage"]] = {"key": event.get("key", ""), "path": event.get("path", "")}
+            elif kind == "done":
+                record.status = "done"
+                record.output_path = event.get("output_path")
+                record.error = None
+            elif kind == "failed":
+                record.status = "failed"
+                record.error = event.get("error")
+        record.updated_at = timestamp
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        event = {**event, "ts": time.time()}
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._line_count += 1
+            self._apply(event)
+
+    # 기록 API ---------------------------------------------------------------
+
+    def add(self, job_id: str, config: Any) -> None:
+        """작업 추가 (이미 있으면 완료된 단계 정보는 유지한 채 대기 상태로)"""
+        values = asdict(config) if not isinstance(config, dict) else dict(config)
+        values.pop("job_id", None)
+        self._append({"event": "add", "job_id": job_id, "config": values})
+
+    def start(self, job_id: str) -> None:
+        self._append({"event": "start", "job_id": job_id})
+
+    def record_stage(self, job_id: str, stage: str, key: str, path: str) -> None:
+        self._append({"event": "stage", "job_id": job_id, "stage": stage, "key": key, "path": path})
+
+    def complete(self, job_id: str, output_path: Optional[str]) -> None:
+        self._append({"event": "done", "job_id": job_id, "output_path": output_path})
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._append({"event": "failed", "job_id": job_id, "error": error})
+
+    def remove(self, job_id: str) -> None:
+        self._append({"event": "remove", "job_id": job_id})
+
+    # 조회 -------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            return self._records.get(job_id)
+
+    def stage(self, job_id: str, stage: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            record = self._records.get(job_id)
+            return dict(record.stages[stage]) if record and stage in record.stages else None
+
+    def records(self) -> List[JobRecord]:
+        """추가된 순서대로 모든 작업"""
+        with self._lock:
+            return list(self._records.values())
+
+    def unfinished(self) -> List[JobRecord]:
+        """대기/실행 중(비정상 종료 포함)/실패 상태의 작업"""
+        return [record for record in self.records() if record.status in UNFINISHED_STATES]
+
+    def compact(self) -> None:
+        """현재 상태만 남기도록 기록 파일을 다시 작성 (원자적 교체)"""
+        with self._lock:
+            lines: List[str] = []
+            for record in self._records.values():
+                events: List[Dict[str, Any]] = [{"event": "add", "job_id": record.job_id, "config": record.config}]
+                for stage, info in record.stages.items():
+                    events.append({"event": "stage", "job_id": record.job_id, "stage": stage, **info})
+                if record.status == "running":
+                    events.append({"event": "start", "job_id": record.job_id})
+                elif record.status == "done":
+                    events.append({"event": "done", "job_id": record.job_id, "output_path": record.output_path})
+                elif record.status == "failed":
+                    events.append({"event": "failed", "job_id": record.job_id, "error": record.error})
+                for event in events:
+                    event["ts"] = record.updated_at
+                    lines.append(json.dumps(event, ensure_ascii=False, default=str))
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._line_count = len(lines)
@@ -0,0 +1,379 @@
+"""Prometheus-style metrics for long-running pipeline workers.
+
+파이프라인을 서비스처럼 계속 돌릴 때 로그를 파싱하지 않고도 처리량을 볼 수 있도록,
+진행 중인 작업 수, 대기열 길이, 단계별 소요 시간 히스토그램, 번역 캐시 적중 수, FFmpeg 인코딩 fps,
+임시 폴더 사용량을 Prometheus 텍스트 형식(text exposition format 0.0.4)으로 내보낸다.
+
+- :func:`start_metrics_server` - 로컬 HTTP 엔드포인트 (``GET /metrics``)
+- :class:`MetricsFileWriter` - 주기적으로 ``.prom`` 파일 기록 (node_exporter textfile collector용)
+
+외부 패키지 없이 동작하며, 엔드포인트/파일 기록을 켜지 않아도 값은 메모리에만 쌓인다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config.paths import TEMP_DIR
+
+LabelValues = Tuple[str, ...]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 단계 소요 시간(초) 기본 구간: 캐시 복원(수 ms)부터 긴 곡 인코딩(수 분)까지
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} != {list(self.label_names)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, label_names, label_values, value in self.samples():
+            lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """단조 증가 값 (요청 수, 처리한 프레임 수 등)"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {} if labels else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counter는 감소할 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, self.label_names, key, value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """오르내리는 현재 값 (진행 중인 작업 수, 대기열 길이 등)
+
+    ``set_function``으로 수집 시점에 값을 계산하는 함수를 등록할 수도 있다.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {} if labels else {(): 0.0}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        if self._function is not None:
+            return float(self._function())
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        if self._function is not None:
+            try:
+                return [(self.name, (), (), float(self._function()))]
+            except Exception as e:
+                print(f"[WARN] 지표 계산 실패 ({self.name}): {e}")
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, self.label_names, key, value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """관측값 분포 (누적 버킷 + 합계 + 개수)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # 레이블 값 -> (버킷별 개수, 합계, 개수)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        bucket_labels = self.label_names + ("le",)
+        result = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                result.append((f"{self.name}_bucket", bucket_labels, key + (_format_value(bound),), cumulative))
+            result.append((f"{self.name}_bucket", bucket_labels, key + ("+Inf",), count))
+            result.append((f"{self.name}_sum", self.label_names, key, total))
+            result.append((f"{self.name}_count", self.label_names, key, count))
+        return result
+
+
+class MetricsRegistry:
+    """등록된 지표 묶음 (같은 이름은 한 번만 등록)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"이미 다른 종류로 등록된 지표입니다: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def metrics(self) -> Iterable[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def expose(self) -> str:
+        """Prometheus 텍스트 형식"""
+        return "\n".join(metric.expose() for metric in self.metrics()) + "\n"
+
+
+def directory_size(path: str) -> int:
+    """폴더 아래 파일 크기 합계(바이트), 없으면 0"""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                # 집계 중에 지워진 임시 파일
+                continue
+    return total
+
+
+class PipelineMetrics:
+    """파이프라인이 갱신하는 지표들"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.jobs_in_flight = r.gauge("lyric_jobs_in_flight", "Jobs currently being processed.")
+        self.jobs_total = r.counter("lyric_jobs_total", "Finished jobs by outcome.", ("status",))
+        self.job_duration = r.histogram("lyric_job_duration_seconds", "End-to-end job duration.")
+        self.queue_depth = r.gauge("lyric_queue_depth", "Jobs waiting to start.", ("queue",))
+        self.stage_duration = r.histogram("lyric_stage_duration_seconds", "Pipeline stage duration.",
+                                          ("stage",))
+        self.translation_cache = r.counter("lyric_translation_cache_lookups_total",
+                                           "Translation cache lookups by result.", ("result",))
+        self.translation_lines = r.counter("lyric_translation_lines_total",
+                                           "Lyric lines requested for translation and sent to the model "
+                                           "after duplicate-line removal.", ("kind",))
+        self.encoded_frames = r.counter("lyric_encoded_frames_total", "Video frames encoded.", ("mode",))
+        self.encode_seconds = r.counter("lyric_encode_seconds_total", "Time spent rendering and encoding.",
+                                        ("mode",))
+        self.encode_fps = r.gauge("lyric_encode_fps", "Frames per second of the most recent render.", ("mode",))
+        self.temp_disk = r.gauge("lyric_temp_disk_bytes", "Bytes used under the temp directory.")
+        self.temp_disk.set_function(lambda: directory_size(TEMP_DIR))
+
+    def record_translation_lines(self, requested: int, sent: int) -> None:
+        self.translation_lines.inc(requested, kind="requested")
+        self.translation_lines.inc(sent, kind="sent")
+
+    def translation_line_counts(self) -> Tuple[int, int]:
+        """지금까지 (번역 요청 줄 수, 중복 제거 후 모델에 보낸 줄 수)"""
+        return (int(self.translation_lines.value(kind="requested")),
+                int(self.translation_lines.value(kind="sent")))
+
+    def record_encode(self, mode: str, frames: int, seconds: float) -> None:
+        self.encoded_frames.inc(frames, mode=mode)
+        self.encode_seconds.inc(seconds, mode=mode)
+        if seconds > 0:
+            self.encode_fps.set(frames / seconds, mode=mode)
+
+
+def translation_dedupe_stats(before: Tuple[int, int], after: Tuple[int, int]) -> Dict[str, float]:
+    """두 translation_line_counts() 사이의 번역 줄 수와 중복 제거 비율"""
+    lines, sent = after[0] - before[0], after[1] - before[1]
+    return {"lines": lines, "sent": sent, "dedupe_ratio": round(1 - sent / lines, 3) if lines else 0.0}
+
+
+_pipeline_metrics: Optional[PipelineMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> PipelineMetrics:
+    """프로세스 전역 파이프라인 지표"""
+    global _pipeline_metrics
+    with _metrics_lock:
+        if _pipeline_metrics is None:
+            _pipeline_metrics = PipelineMetrics()
+        return _pipeline_metrics
+
+
+# 내보내기 --------------------------------------------------------------------
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # 수집기가 주기적으로 호출하므로 요청 로그는 남기지 않음
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 /metrics HTTP 엔드포인트 시작 (종료는 server.shutdown())"""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry or get_metrics().registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    print(f"[DEBUG] 지표 엔드포인트 시작: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+class MetricsFileWriter:
+    """주기적으로 지표를 텍스트 파일에 기록 (임시 파일에 쓴 뒤 교체하므로 수집기가 반쯤 쓴 파일을 읽지 않음)"""
+
+    def __init__(self, path: str, interval: float = 15.0, registry: Optional[MetricsRegistry] = None):
+        self.path = path
+        self.interval = max(0.5, interval)
+        self.registry = registry or get_metrics().registry
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.expose())
+        os.replace(temp_path, self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write_safely()
+
+    def _write_safely(self) -> None:
+        try:
+            self.write()
+        except OSError as e:
+            print(f"[WARN] 지표 파일 기록 실패: {e}")
+
+    def start(self) -> "MetricsFileWriter":
+        self._write_safely()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        print(f"[DEBUG] 지표 파일 기록 시작: {self.path} ({self.interval:g}초마다)")
+        return self
+
+    def stop(self) -> None:
+        """기록 중단 후 마지막 값을 한 번 더 기록"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval + 1.0)
+            self._thread = None
+        self._write_safely()
+
+
+def start_metrics_exporters(port: Optional[int] = None, path: Optional[str] = None,
+                            interval: float = 15.0, host: str = "127.0.0.1") -> Callable[[], None]:
+    """설정된 내보내기(HTTP/파일)를 시작하고, 모두 정리하는 함수를 반환"""
+    server = start_metrics_server(port, host) if port is not None else None
+    writer = MetricsFileWriter(path, interval).start() if path else None
+
+    def stop() -> None:
+        if writer is not None:
+            writer.stop()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    return stop
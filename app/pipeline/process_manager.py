@@ -1,23 +1,52 @@
 import os
+import shutil
+import time
 import traceback
-import asyncio
-from dataclasses import dataclass
-from typing import Callable, Literal, Optional
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Literal, Optional, Tuple
 
 from app.config.paths import (
     LYRICS_DIR,
     OUTPUT_DIR,
     TEMP_DIR,
     ensure_data_dirs,
-    LEGACY_LYRICS_DIR,
 )
 from app.export.premiere_exporter import export_premiere_xml
-from app.lyrics.openai_handler import parse_lrc_and_translate
-from app.media.video_maker import make_lyric_video, get_audio_duration
-from app.sources.album_art_finder import download_album_art
-from app.sources.youtube_handler import download_youtube_audio
+from app.lyrics.lyrics_index import get_lyrics_index
+from app.lyrics.openai_handler import lrc_has_timestamps
+from app.media.media_probe import get_audio_duration
+from app.media.parallel_renderer import resolve_render_workers
+from app.media.video_maker import (
+    EncodeProfile,
+    RenderOptions,
+    make_lyric_video,
+    preview_render_options,
+    render_cache_params,
+)
+from app.pipeline.artifact_store import ArtifactStore, artifact_key, file_digest, get_artifact_store
+from app.pipeline.job_journal import JobJournal
+from app.pipeline.metrics import get_metrics
+from app.pipeline.resources import ResourcePools
+from app.pipeline.sources import PipelineSources, default_sources
+from app.pipeline.stages import Stage, StageGraph, run_blocking
+from app.pipeline.timing import JobTrace, job_trace, record_bytes, span, write_job_reports
+from app.pipeline.workspace import CleanupPolicy, JobWorkspace
 
-OutputMode = Literal["video", "premiere_xml"]
+OutputMode = Literal["video", "premiere_xml", "preview"]
+OUTPUT_MODES = ("video", "premiere_xml", "preview")
+
+
+@dataclass
+class StageEvent:
+    """단계 시작/완료 알림 (CLI 진행 이벤트 등 외부 모니터링용)"""
+    stage: str
+    status: Literal["started", "done"]
+    # 완료 시 단계 실행 시간(초)과 결과 파일 경로
+    seconds: float = 0.0
+    path: Optional[str] = None
+
+
+StageEventListener = Callable[[StageEvent], None]
 
 
 @dataclass
@@ -31,14 +60,86 @@ class ProcessConfig:
     output_dir: str = OUTPUT_DIR
     lrc_path: Optional[str] = None
     prefer_youtube: bool = False
+    encode_profile: EncodeProfile = "standard"
+    # 구간 병렬 인코딩 FFmpeg 프로세스 수 (None이면 설정/LYRIC_SEGMENT_WORKERS, 1이면 단일 인코딩)
+    segment_workers: Optional[int] = None
+    # preview 모드에서 렌더링할 (시작, 끝) 초 구간, None이면 전체 곡
+    preview_window: Optional[Tuple[float, float]] = None
+    # 아티팩트 저장소에서 이전 결과(오디오/앨범 아트/번역/렌더링)를 재사용할지 여부
+    use_artifact_cache: bool = True
+    # Genie 곡 ID, lrc_path가 없을 때 가사 색인에서 LRC를 찾는 데 사용
+    genie_song_id: Optional[str] = None
+    # 작업 기록(JobJournal)에서 이 작업을 식별하는 ID, None이면 기록하지 않음
+    job_id: Optional[str] = None
+    # 지정하면 단계별 구간 기록(<파일명>.trace.json, <파일명>.chrome.json)을 이 폴더에 저장
+    trace_dir: Optional[str] = None
+    # 작업 폴더(TEMP_DIR/jobs/<ID>) 정리 정책: always, on_success(실패/취소 시 중간 파일 유지), never
+    workspace_cleanup: CleanupPolicy = "always"
 
 class ProcessManager:
-    def __init__(self, update_progress: Callable[[str, int], None]):
+    def __init__(self, update_progress: Callable[[str, int], None],
+                 resources: Optional[ResourcePools] = None, sources: Optional[PipelineSources] = None,
+                 artifacts: Optional[ArtifactStore] = None, journal: Optional[JobJournal] = None,
+                 on_stage: Optional[StageEventListener] = None):
         self.update_progress = update_progress
+        self.on_stage = on_stage
+        self.artifacts = artifacts or get_artifact_store()
+        # 완료한 단계를 기록해 두었다가 비정상 종료 후 다시 실행하면 그 단계를 건너뜀
+        self.journal = journal
+        # 배치 실행 시 여러 ProcessManager가 같은 ResourcePools를 공유해 자원별 동시 실행 수를 제한
+        self.resources = resources or ResourcePools.unlimited()
+        self.sources = sources or default_sources()
+        self._progress_value = 0
+        self._graph: Optional[StageGraph] = None
+        # 마지막 process_async 실행의 단계별 소요 시간(초)
+        self.stage_timings: Dict[str, float] = {}
+        # 마지막 process_async 실행의 구간 기록
+        self.trace: Optional[JobTrace] = None
+        # 작업 폴더로 복사해 사용한 사용자 파일(수동 싱크 오디오), 작업이 성공한 뒤에만 삭제
+        self._consumed_inputs: List[str] = []
 
     async def process_async(self, config: ProcessConfig):
-        temp_files_to_cleanup = []
+        journal = self.journal if config.job_id else None
+        metrics = get_metrics()
+        if journal:
+            await run_blocking(journal.start, config.job_id)
+        metrics.jobs_in_flight.inc()
+        started = time.perf_counter()
+        self._consumed_inputs = []
+        try:
+            with job_trace(f"{config.artist} - {config.title}") as trace:
+                self.trace = trace
+                with JobWorkspace(f"{config.artist} - {config.title}", config.workspace_cleanup) as workspace:
+                    result = await self._run_pipeline(config, workspace)
+        except Exception as e:
+            metrics.jobs_total.inc(status="failed")
+            if journal:
+                await run_blocking(journal.fail, config.job_id, str(e))
+            raise
+        finally:
+            metrics.jobs_in_flight.dec()
+            metrics.job_duration.observe(time.perf_counter() - started)
+            if config.trace_dir:
+                await run_blocking(write_job_reports, self.trace, config.trace_dir,
+                                   self._sanitize_filename(f"{config.artist} - {config.title}"))
+        metrics.jobs_total.inc(status="success")
+        # 미리보기 뒤 실제 렌더링에서도 같은 원본을 다시 사용
+        if config.output_mode != "preview":
+            await run_blocking(self._remove_consumed_inputs)
+        if journal:
+            await run_blocking(journal.complete, config.job_id, result)
+        return result
 
+    def _remove_consumed_inputs(self) -> None:
+        for path in self._consumed_inputs:
+            try:
+                os.remove(path)
+                print(f"[DEBUG] 사용한 원본 파일 삭제: {path}")
+            except OSError as e:
+                print(f"[WARN] 사용한 원본 파일 삭제 실패 ({path}): {e}")
+        self._consumed_inputs = []
+
+    async def _run_pipeline(self, config: ProcessConfig, workspace: JobWorkspace):
         try:
             print("[DEBUG] 작업 프로세스 시작")
             
@@ -60,14 +161,17 @@ class ProcessManager:
             print(f"[DEBUG] 디렉토리 확인: {TEMP_DIR}")
             print(f"[DEBUG] 디렉토리 확인: {OUTPUT_DIR}")
             print(f"[DEBUG] 디렉토리 확인: {LYRICS_DIR}")
+            print(f"[DEBUG] 작업 폴더: {workspace.dir}")
                 
-            # 파일명 생성
+            # 파일명 생성 (중간 파일은 작업 폴더에만 써서 같은 곡을 동시에 처리해도 겹치지 않음)
             filename = self._sanitize_filename(f"{config.artist} - {config.title}")
-            audio_path = os.path.join(TEMP_DIR, f"{filename}.mp3")
-            image_path = os.path.join(TEMP_DIR, f"{filename}.jpg")
-            json_path = os.path.join(TEMP_DIR, f"{filename}_lyrics.json")
+            audio_path = workspace.path(f"{filename}.mp3")
+            image_path = workspace.path(f"{filename}.jpg")
+            json_path = workspace.path(f"{filename}_lyrics.json")
             output_path = os.path.join(OUTPUT_DIR, f"{filename}.mp4")
             premiere_xml_path = os.path.join(OUTPUT_DIR, f"{filename}.xml")
+            preview_path = os.path.join(OUTPUT_DIR, f"{filename}_preview.mp4")
+            render_dir = workspace.path("render")
             
             print("[DEBUG] 파일 경로 설정 완료:")
             print(f"- 오디오: {audio_path}")
@@ -75,103 +179,84 @@ class ProcessManager:
             print(f"- 가사: {json_path}")
             print(f"- 출력: {output_path}")
             
-            # 오디오 다운로드 (spotDL 우선, 실패 시 YouTube 폴백)
-            self.update_progress("고품질 오디오 다운로드 중...", 20)
-            
-            audio_downloaded = False
-            
-            # Check if audio already exists (e.g. from manual sync)
-            if os.path.exists(audio_path) and os.path.getsize(audio_path) > 0:
-                print(f"[DEBUG] 기존 오디오 파일 사용: {audio_path}")
-                audio_downloaded = True
-            else:
-                # Try spotDL unless prefer_youtube is True
-                spotdl_success = False
-                if not config.prefer_youtube:
-                    print(f"[DEBUG] spotDL 다운로드 시도: {config.artist} - {config.title}")
-                    from app.sources.spotdl_handler import download_audio_simple
-                    spotdl_result = download_audio_simple(config.artist, config.title, TEMP_DIR)
-                    
-                    if spotdl_result and os.path.exists(spotdl_result):
-                        print(f"[DEBUG] spotDL 다운로드 성공: {spotdl_result}")
-                        # spotDL이 생성한 파일을 원하는 경로로 이동/복사
-                        if spotdl_result != audio_path:
-                            import shutil
-                            shutil.move(spotdl_result, audio_path)
-                        spotdl_success = True
-                        audio_downloaded = True
-                
-                if not spotdl_success:
-                    print("[WARN] spotDL 다운로드 건너뜀/실패, YouTube 다운로드로 폴백")
-                    self.update_progress("YouTube 오디오 다운로드 중...", 25)
-                    print(f"[DEBUG] YouTube 다운로드 시작: {config.youtube_url}")
-                    if download_youtube_audio(config.youtube_url, filename):
-                        audio_downloaded = True
-                        print(f"[DEBUG] YouTube 다운로드 완료")
-            
-            if audio_downloaded:
-                temp_files_to_cleanup.append(audio_path)
-            else:
-                raise Exception("오디오 다운로드 실패 (spotDL 및 YouTube 모두 실패)")
-            print(f"[DEBUG] 오디오 다운로드 완료: {audio_path}")
-            
-            # 앨범 아트 다운로드
-            self.update_progress("앨범 아트 다운로드 중...", 40)
-            print(f"[DEBUG] 앨범 아트 다운로드 시작: {config.album_art_url}")
-            if not download_album_art(config.album_art_url, image_path):
-                raise Exception("앨범 아트 다운로드 실패")
-            print("[DEBUG] 앨범 아트 다운로드 완료")
-            temp_files_to_cleanup.append(image_path)
-            
-            # LRC 파일 찾기
-            self.update_progress("가사 파일 처리 중...", 60)
-            lrc_path = None
-            if config.lrc_path:
-                if os.path.exists(config.lrc_path):
-                    lrc_path = config.lrc_path
-                    print(f"[DEBUG] 지정된 LRC 파일 사용: {lrc_path}")
-                else:
-                    print(f"[WARN] 지정된 LRC 파일을 찾을 수 없습니다: {config.lrc_path}")
-
-            if lrc_path is None:
-                search_dirs = [LYRICS_DIR]
-                if os.path.isdir(LEGACY_LYRICS_DIR) and LEGACY_LYRICS_DIR not in search_dirs:
-                    search_dirs.append(LEGACY_LYRICS_DIR)
-
-                lrc_files = []
-                for lyrics_dir in search_dirs:
-                    try:
-                        lrc_files.extend(
-                            [
-                                os.path.join(lyrics_dir, f)
-                                for f in os.listdir(lyrics_dir)
-                                if f.endswith(".lrc")
-                            ]
-                        )
-                    except FileNotFoundError:
-                        continue
-                if not lrc_files:
-                    raise Exception("가사 파일을 찾을 수 없습니다")
-                lrc_files.sort(key=lambda path: os.path.getmtime(path), reverse=True)
-                lrc_path = lrc_files[0]
-                print(f"[DEBUG] 최신 LRC 파일 사용: {lrc_path}")
-            
-            # 가사 번역
-            try:
-                self.update_progress("가사 번역 중...", 80)
+            # 오디오/앨범 아트/가사 준비는 서로 독립적이므로 동시에 실행하고, 렌더링만 모두를 기다림
+            self._progress_value = 10
+
+            label = f"{config.artist} - {config.title}"
+
+            async def audio_stage(_):
+                # 수동 싱크 때 받아 둔 오디오(TEMP_DIR/<파일명>.mp3)는 저장소 사본 대신 작업 폴더로 복사해 사용
+                # (작업이 실패해도 하나뿐인 원본은 남도록 성공한 뒤에만 삭제)
+                synced_audio_path = os.path.join(TEMP_DIR, f"{filename}.mp3")
+                if os.path.exists(synced_audio_path) and os.path.getsize(synced_audio_path) > 0:
+                    print(f"[DEBUG] 기존 오디오 파일 사용: {synced_audio_path}")
+                    await run_blocking(shutil.copy2, synced_audio_path, audio_path)
+                    self._consumed_inputs.append(synced_audio_path)
+                    return audio_path
+                audio_key = artifact_key("audio", self.sources.name, config.youtube_url, config.artist,
+                                         config.title, config.prefer_youtube)
+                if await run_blocking(self._restore_artifact, config, "audio", audio_key, audio_path):
+                    return audio_path
+                async with self.resources.slot("network"):
+                    await run_blocking(self._download_audio, config, filename, audio_path)
+                await run_blocking(self._store_artifact, config, "audio", audio_key, audio_path, label)
+                return audio_path
+
+            async def album_art_stage(_):
+                art_key = artifact_key("album_art", self.sources.name, config.album_art_url)
+                if await run_blocking(self._restore_artifact, config, "album_art", art_key, image_path):
+                    return image_path
+                print(f"[DEBUG] 앨범 아트 다운로드 시작: {config.album_art_url}")
+                async with self.resources.slot("network"):
+                    downloaded = await run_blocking(self._download_album_art, config.album_art_url, image_path)
+                if not downloaded:
+                    raise Exception("앨범 아트 다운로드 실패")
+                print("[DEBUG] 앨범 아트 다운로드 완료")
+                await run_blocking(self._store_artifact, config, "album_art", art_key, image_path, label)
+                return image_path
+
+            async def lrc_stage(_):
+                return await run_blocking(self._find_lrc_file, config)
+
+            async def translation_stage(inputs):
+                lrc_path = inputs["lrc"]
+                duration = 0.0
+                # 타임스탬프 없는 가사만 오디오 길이로 배분하므로 그때만 오디오를 기다림
+                if not await run_blocking(lrc_has_timestamps, lrc_path):
+                    downloaded_audio = await graph.result("audio")
+                    duration = await run_blocking(get_audio_duration, downloaded_audio)
+
+                lyrics_key = await run_blocking(self._lyrics_artifact_key, config, lrc_path, duration)
+                if await run_blocking(self._restore_artifact, config, "lyrics", lyrics_key, json_path):
+                    return json_path
+
                 print("[DEBUG] 가사 번역 시작")
-                os.environ['CURRENT_ARTIST'] = config.artist
-                os.environ['CURRENT_TITLE'] = config.title
-                
-                # 오디오 길이 확인 (가사 배분을 위해)
-                duration = get_audio_duration(audio_path)
-                
-                lyrics_json_path = await parse_lrc_and_translate(lrc_path, json_path, duration=duration)
-                temp_files_to_cleanup.append(lyrics_json_path)
-                print(f"[DEBUG] 가사 번역 완료: {lyrics_json_path}")
+                async with self.resources.slot("llm"):
+                    translated_json = await self.sources.translate_lrc(
+                        lrc_path, json_path, duration, config.artist, config.title
+                    )
+                print(f"[DEBUG] 가사 번역 완료: {translated_json}")
+                if os.path.exists(translated_json):
+                    record_bytes(os.path.getsize(translated_json))
+                await run_blocking(self._store_artifact, config, "lyrics", lyrics_key, translated_json, label)
+                return translated_json
+
+            graph = StageGraph(
+                [
+                    Stage("audio", "고품질 오디오 다운로드 중...", audio_stage),
+                    Stage("album_art", "앨범 아트 다운로드 중...", album_art_stage),
+                    Stage("lrc", "가사 파일 처리 중...", lrc_stage),
+                    Stage("translation", "가사 번역 중...", translation_stage, depends_on=("lrc",)),
+                ],
+                on_stage_start=self._report_stage_started,
+                on_stage_done=self._report_stage_done,
+            )
+            self._graph = graph
+            try:
+                results = await graph.run()
             finally:
-                os.environ.pop('CURRENT_ARTIST', None)
-                os.environ.pop('CURRENT_TITLE', None)
+                self.stage_timings = dict(graph.timings)
+            lyrics_json_path = results["translation"]
             
             try:
                 for file_path in [audio_path, image_path, lyrics_json_path]:
@@ -181,30 +266,41 @@ class ProcessManager:
                 if config.output_mode == "premiere_xml":
                     self.update_progress("Premiere XML 내보내는 중...", 90)
                     print("[DEBUG] Premiere XML 전용 모드 시작")
-                    xml_result = export_premiere_xml(
+                    xml_result = await self._run_timed(
+                        "premiere_xml", None, export_premiere_xml,
                         audio_path=audio_path,
                         album_art_path=image_path,
                         lyrics_json_path=lyrics_json_path,
                         output_xml_path=premiere_xml_path,
                     )
                     print(f"[DEBUG] Premiere XML 생성 완료: {xml_result}")
-                    self._cleanup_temp_files(temp_files_to_cleanup)
                     return xml_result
 
+                if config.output_mode == "preview":
+                    self.update_progress("미리보기 렌더링 중...", 90)
+                    print("[DEBUG] 미리보기 렌더링 시작")
+                    await self._render_video(
+                        config, audio_path, image_path, lyrics_json_path, preview_path,
+                        preview_render_options(config.preview_window, work_dir=render_dir),
+                    )
+                    print(f"[DEBUG] 미리보기 생성 완료: {preview_path}")
+                    # 이어서 실제 렌더링할 때는 아티팩트 저장소의 오디오/앨범 아트/번역을 재사용
+                    return preview_path
+
                 self.update_progress("리릭 비디오 생성 중...", 90)
                 print("[DEBUG] 비디오 생성 시작")
 
-                make_lyric_video(
-                    audio_path=audio_path,
-                    album_art_path=image_path,
-                    lyrics_json_path=lyrics_json_path,
-                    output_path=output_path
+                await self._render_video(
+                    config, audio_path, image_path, lyrics_json_path, output_path,
+                    RenderOptions(encode_profile=config.encode_profile, work_dir=render_dir,
+                                  segment_workers=self._segment_workers(config)),
                 )
                 print(f"[DEBUG] 비디오 생성 완료: {output_path}")
 
                 try:
                     self.update_progress("Premiere XML 내보내는 중...", 95)
-                    xml_result = export_premiere_xml(
+                    xml_result = await self._run_timed(
+                        "premiere_xml", None, export_premiere_xml,
                         audio_path=audio_path,
                         album_art_path=image_path,
                         lyrics_json_path=lyrics_json_path,
@@ -214,7 +310,6 @@ class ProcessManager:
                 except Exception as xml_error:
                     print(f"[WARN] Premiere XML 생성 실패: {xml_error}")
 
-                self._cleanup_temp_files(temp_files_to_cleanup)
                 return output_path
 
             except Exception as e:
@@ -227,32 +322,214 @@ class ProcessManager:
             traceback.print_exc()
             raise
 
+    async def _run_timed(self, name: str, resource: Optional[str], func, *args, **kwargs):
+        """블로킹 작업을 (필요하면 자원 슬롯을 잡고) 스레드에서 실행하며 소요 시간 기록"""
+        self._emit_stage(StageEvent(name, "started"))
+        started = time.perf_counter()
+        with span(name) as stage_span:
+            if resource is None:
+                result = await run_blocking(func, *args, **kwargs)
+            else:
+                async with self.resources.slot(resource):
+                    result = await run_blocking(func, *args, **kwargs)
+            path = result if isinstance(result, str) else kwargs.get("output_path")
+            if path and os.path.exists(path):
+                stage_span.add_bytes(os.path.getsize(path))
+        self.stage_timings[name] = time.perf_counter() - started
+        self._emit_stage(StageEvent(name, "done", self.stage_timings[name], path))
+        return result
+
+    async def _render_video(self, config: ProcessConfig, audio_path: str, image_path: str,
+                            lyrics_json_path: str, output_path: str, options: RenderOptions) -> None:
+        """입력 파일 내용과 렌더링 설정이 같은 결과가 저장소에 있으면 복사, 없으면 렌더링 후 저장"""
+        def render_key() -> str:
+            return artifact_key("render", file_digest(audio_path), file_digest(image_path),
+                                file_digest(lyrics_json_path), render_cache_params(options))
+
+        key = await run_blocking(render_key)
+        if await run_blocking(self._restore_artifact, config, "render", key, output_path):
+            self.stage_timings["render"] = 0.0
+            self._emit_stage(StageEvent("render", "started"))
+            self._emit_stage(StageEvent("render", "done", 0.0, output_path))
+            return
+        if options.render_workers is None:
+            # 배치에서 동시에 렌더링하는 작업(cpu 슬롯)끼리 렌더링 프로세스 예산을 나눠 씀
+            concurrent_renders = self.resources.limits.cpu or 1
+            options = replace(options, render_workers=resolve_render_workers(concurrent_jobs=concurrent_renders))
+        await self._run_timed(
+            "render", "cpu", make_lyric_video,
+            audio_path=audio_path,
+            album_art_path=image_path,
+            lyrics_json_path=lyrics_json_path,
+            output_path=output_path,
+            options=options,
+        )
+        await run_blocking(self._store_artifact, config, "render", key, output_path,
+                           f"{config.artist} - {config.title}")
+
+    @staticmethod
+    def _segment_workers(config: ProcessConfig) -> int:
+        if config.segment_workers is not None:
+            return max(1, config.segment_workers)
+        from app.config.config_manager import get_config
+
+        return get_config().get_segment_workers()
+
+    def _lyrics_artifact_key(self, config: ProcessConfig, lrc_path: str, duration: float) -> str:
+        from app.config.config_manager import get_config
+
+        settings = get_config()
+        translation = (settings.get_translation_model(), settings.get_translation_mode(),
+                       settings.get_translation_context_lines())
+        return artifact_key("lyrics", self.sources.name, get_lyrics_index().content_hash(lrc_path), *translation,
+                            config.artist, config.title, round(duration, 2))
+
+    def _restore_artifact(self, config: ProcessConfig, kind: str, key: str, dest_path: str) -> bool:
+        if self._restore_from_journal(config, kind, key, dest_path):
+            return True
+        if not config.use_artifact_cache:
+            return False
+        with span("artifact_fetch", kind=kind) as fetch_span:
+            found = self.artifacts.fetch(kind, key, dest_path)
+            fetch_span.set(hit=found)
+            if not found:
+                return False
+            fetch_span.add_bytes(os.path.getsize(dest_path))
+        self._record_stage(config, kind, key, self.artifacts.lookup(kind, key) or dest_path)
+        return True
+
+    def _restore_from_journal(self, config: ProcessConfig, kind: str, key: str, dest_path: str) -> bool:
+        """작업 기록에 같은 키로 완료된 단계가 있고 결과 파일이 남아 있으면 재사용"""
+        if not self.journal or not config.job_id:
+            return False
+        recorded = self.journal.stage(config.job_id, kind)
+        if not recorded or recorded["key"] != key or not os.path.exists(recorded["path"]):
+            return False
+        try:
+            if os.path.abspath(recorded["path"]) != os.path.abspath(dest_path):
+                with span("artifact_fetch", kind=kind, source="journal") as fetch_span:
+                    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+                    shutil.copyfile(recorded["path"], dest_path)
+                    fetch_span.add_bytes(os.path.getsize(dest_path))
+        except OSError as e:
+            print(f"[WARN] 작업 기록의 결과 파일 복원 실패 ({kind}): {e}")
+            return False
+        print(f"[DEBUG] 완료된 단계 건너뜀 ({kind}): {recorded['path']}")
+        return True
+
+    def _store_artifact(self, config: ProcessConfig, kind: str, key: str, path: str, label: str) -> None:
+        if not os.path.exists(path):
+            return
+        stored_path = None
+        if config.use_artifact_cache:
+            with span("artifact_store", kind=kind) as store_span:
+                stored_path = self.artifacts.store(kind, key, path, {"label": label})
+                store_span.add_bytes(os.path.getsize(path))
+        # 임시 파일은 지워질 수 있으므로 저장소 사본이 있으면 그 경로를 기록
+        self._record_stage(config, kind, key, stored_path or path)
+
+    def _record_stage(self, config: ProcessConfig, kind: str, key: str, path: str) -> None:
+        if self.journal and config.job_id:
+            self.journal.record_stage(config.job_id, kind, key, path)
+
+    def _emit_stage(self, event: StageEvent) -> None:
+        if event.status == "done":
+            get_metrics().stage_duration.observe(event.seconds, stage=event.stage)
+        if self.on_stage:
+            self.on_stage(event)
+
+    def _report_stage_started(self, name: str, label: str, completed: int, total: int) -> None:
+        self._emit_stage(StageEvent(name, "started"))
+        self.update_progress(label, self._progress_value)
+
+    def _report_stage_done(self, name: str, label: str, completed: int, total: int) -> None:
+        """준비 스테이지 진행률을 10~85% 구간에 배분 (동시 실행 중에도 값이 줄지 않음)"""
+        self._progress_value = max(self._progress_value, 10 + int(75 * completed / max(total, 1)))
+        message = f"준비 작업 진행 중... ({completed}/{total})" if completed < total else "리소스 준비 완료"
+        result = self._graph.results.get(name) if self._graph else None
+        seconds = self._graph.timings.get(name, 0.0) if self._graph else 0.0
+        self._emit_stage(StageEvent(name, "done", seconds, result if isinstance(result, str) else None))
+        self.update_progress(message, self._progress_value)
+
+    def _download_audio(self, config: ProcessConfig, filename: str, audio_path: str) -> None:
+        """오디오 다운로드 (spotDL 우선, 실패 시 YouTube 폴백)"""
+        # Try spotDL unless prefer_youtube is True
+        if not config.prefer_youtube:
+            print(f"[DEBUG] spotDL 다운로드 시도: {config.artist} - {config.title}")
+            with span("spotdl") as spotdl_span:
+                spotdl_result = self.sources.download_spotdl(config.artist, config.title,
+                                                             os.path.dirname(audio_path))
+                spotdl_span.set(success=bool(spotdl_result and os.path.exists(spotdl_result)))
+
+            if spotdl_result and os.path.exists(spotdl_result):
+                print(f"[DEBUG] spotDL 다운로드 성공: {spotdl_result}")
+                # spotDL이 생성한 파일을 원하는 경로로 이동/복사
+                if spotdl_result != audio_path:
+                    shutil.move(spotdl_result, audio_path)
+                print(f"[DEBUG] 오디오 다운로드 완료: {audio_path}")
+                return
+
+        print("[WARN] spotDL 다운로드 건너뜀/실패, YouTube 다운로드로 폴백")
+        self.update_progress("YouTube 오디오 다운로드 중...", self._progress_value)
+        print(f"[DEBUG] YouTube 다운로드 시작: {config.youtube_url}")
+        with span("youtube_download") as download_span:
+            if not self.sources.download_youtube(config.youtube_url, filename, os.path.dirname(audio_path)):
+                raise Exception("오디오 다운로드 실패 (spotDL 및 YouTube 모두 실패)")
+            if os.path.exists(audio_path):
+                download_span.add_bytes(os.path.getsize(audio_path))
+        print(f"[DEBUG] 오디오 다운로드 완료: {audio_path}")
+
+    def _download_album_art(self, url: str, image_path: str) -> bool:
+        with span("album_art_download") as download_span:
+            downloaded = self.sources.download_album_art(url, image_path)
+            if downloaded and os.path.exists(image_path):
+                download_span.add_bytes(os.path.getsize(image_path))
+            return downloaded
+
+    @staticmethod
+    def _find_lrc_file(config: ProcessConfig) -> str:
+        """지정된 LRC 파일, 없으면 가사 폴더에서 가장 최근 LRC 파일 경로 반환"""
+        with span("lrc_lookup"):
+            return ProcessManager._lookup_lrc_file(config)
+
+    @staticmethod
+    def _lookup_lrc_file(config: ProcessConfig) -> str:
+        if config.lrc_path:
+            if os.path.exists(config.lrc_path):
+                print(f"[DEBUG] 지정된 LRC 파일 사용: {config.lrc_path}")
+                return config.lrc_path
+            print(f"[WARN] 지정된 LRC 파일을 찾을 수 없습니다: {config.lrc_path}")
+
+        index = get_lyrics_index()
+        lrc_path = index.find(config.genie_song_id, config.artist, config.title)
+        if lrc_path:
+            print(f"[DEBUG] 가사 색인에서 LRC 파일 찾음: {lrc_path}")
+            return lrc_path
+
+        # 곡 정보로 찾지 못하면 예전처럼 가장 최근 LRC 사용 (배치에서는 다른 곡의 가사일 수 있음)
+        lrc_path = index.latest()
+        if not lrc_path:
+            raise Exception("가사 파일을 찾을 수 없습니다")
+        print(f"[WARN] 곡 정보와 일치하는 LRC가 없어 최근 LRC 파일 사용: {lrc_path}")
+        return lrc_path
+
     def process(self, config: ProcessConfig):
-        """동기 래퍼 메서드"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(self.process_async(config))
+        """동기 래퍼 메서드 (곡마다 새 루프를 만들지 않고 앱 전역 파이프라인 워커의 루프에서 실행)"""
+        from app.pipeline.worker import get_pipeline_worker
+        return get_pipeline_worker().run(self.process_async(config))
 
     @staticmethod
     def _sanitize_filename(filename: str) -> str:
         import re
         return re.sub(r'[\\/*?:"<>|]', "_", filename)
 
-    @staticmethod
-    def _cleanup_temp_files(paths):
-        for path in paths:
-            if not path:
-                continue
-            if os.path.exists(path):
-                try:
-                    os.remove(path)
-                    print(f"[DEBUG] 임시 파일 삭제: {path}")
-                except OSError as cleanup_error:
-                    print(f"[WARN] 임시 파일 삭제 실패 ({path}): {cleanup_error}")
-
     def validate_config(self, config: ProcessConfig) -> Optional[str]:
         if not all([config.title, config.artist, config.album_art_url, config.youtube_url]):
             return "제목, 아티스트, 앨범 아트 URL, YouTube URL을 모두 입력해주세요."
-        if config.output_mode not in ("video", "premiere_xml"):
+        if config.output_mode not in OUTPUT_MODES:
             return "출력 형식이 올바르지 않습니다."
+        if config.preview_window is not None:
+            start, end = config.preview_window
+            if start < 0 or end <= start:
+                return "미리보기 구간이 올바르지 않습니다."
         return None
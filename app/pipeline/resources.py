@@ -0,0 +1,75 @@
+"""Per-resource concurrency limits shared by pipeline jobs.
+
+배치 작업에서 서로 다른 곡의 스테이지가 겹쳐 실행되도록, 자원 종류별(네트워크 다운로드,
+LLM 번역 호출, CPU 렌더링/인코딩)로 동시 실행 수를 따로 제한한다. 각 작업은 지금 사용하는
+자원의 슬롯만 잡으므로 한 곡이 인코딩하는 동안 다른 곡은 다운로드/번역을 진행할 수 있다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Literal, Optional
+
+from app.pipeline.timing import span
+
+ResourceKind = Literal["network", "llm", "cpu"]
+RESOURCE_KINDS = ("network", "llm", "cpu")
+
+
+@dataclass
+class ResourceLimits:
+    """자원 종류별 동시 실행 수 (None이면 제한 없음)"""
+    network: Optional[int] = 4
+    llm: Optional[int] = 2
+    # 렌더링 작업 자체가 여러 코어를 사용하므로 기본적으로 한 곡씩 인코딩
+    cpu: Optional[int] = 1
+
+    @classmethod
+    def unlimited(cls) -> "ResourceLimits":
+        return cls(network=None, llm=None, cpu=None)
+
+
+@dataclass
+class ResourceUsage:
+    """자원별 누적 대기 시간 / 사용 시간(초)과 사용 횟수"""
+    acquisitions: int = 0
+    wait_seconds: float = 0.0
+    busy_seconds: float = 0.0
+
+
+class ResourcePools:
+    """자원 종류별 세마포어 묶음. 하나의 이벤트 루프 안에서 여러 작업이 공유한다."""
+
+    def __init__(self, limits: Optional[ResourceLimits] = None):
+        self.limits = limits or ResourceLimits()
+        self._semaphores: Dict[str, Optional[asyncio.Semaphore]] = {}
+        for kind in RESOURCE_KINDS:
+            limit = getattr(self.limits, kind)
+            self._semaphores[kind] = asyncio.Semaphore(max(1, limit)) if limit else None
+        self.usage: Dict[str, ResourceUsage] = {kind: ResourceUsage() for kind in RESOURCE_KINDS}
+
+    @classmethod
+    def unlimited(cls) -> "ResourcePools":
+        return cls(ResourceLimits.unlimited())
+
+    @asynccontextmanager
+    async def slot(self, kind: ResourceKind) -> AsyncIterator[None]:
+        """kind 자원의 슬롯을 잡고 있는 동안 블록 실행"""
+        semaphore = self._semaphores[kind]
+        usage = self.usage[kind]
+        requested = time.perf_counter()
+        if semaphore is not None:
+            with span(f"wait_{kind}"):
+                await semaphore.acquire()
+        acquired = time.perf_counter()
+        usage.acquisitions += 1
+        usage.wait_seconds += acquired - requested
+        try:
+            yield
+        finally:
+            usage.busy_seconds += time.perf_counter() - acquired
+            if semaphore is not None:
+                semaphore.release()
@@ -0,0 +1,113 @@
+"""Pluggable download/translation sources used by ProcessManager.
+
+기본값은 실제 spotDL / YouTube / 앨범 아트 다운로드와 LLM 번역이다. offline_sources()는
+네트워크나 API 키 없이 배치 파이프라인을 시험할 수 있도록 합성 오디오(사인파), 단색 앨범 아트,
+가짜 번역을 만들어 주며, 지연 시간을 흉내 내 동시 실행 효과를 확인할 수 있다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from app.config.paths import FFMPEG_PATH
+
+# (artist, title, output_dir) -> 저장된 파일 경로 또는 None
+SpotdlDownloader = Callable[[str, str, str], Optional[str]]
+# (url, 파일명, output_dir) -> <output_dir>/<파일명>.mp3 경로 또는 None
+YoutubeDownloader = Callable[[str, str, str], Optional[str]]
+# (url, 저장 경로) -> 성공 여부
+AlbumArtDownloader = Callable[[str, str], bool]
+# (lrc 경로, json 경로, 오디오 길이, artist, title) -> json 경로
+LyricsTranslator = Callable[[str, str, float, str, str], Awaitable[str]]
+
+
+@dataclass
+class PipelineSources:
+    """ProcessManager가 외부 자원에 접근할 때 사용하는 함수 묶음"""
+    download_spotdl: SpotdlDownloader
+    download_youtube: YoutubeDownloader
+    download_album_art: AlbumArtDownloader
+    translate_lrc: LyricsTranslator
+    # 아티팩트 저장소 키에 포함되어 합성 소스 결과가 실제 작업에 재사용되지 않도록 함
+    name: str = "default"
+
+
+def default_sources() -> PipelineSources:
+    """실제 다운로드/번역 함수 (무거운 의존성은 처음 사용할 때 import)"""
+
+    def download_spotdl(artist: str, title: str, output_dir: str) -> Optional[str]:
+        from app.sources.spotdl_handler import download_audio_simple
+        return download_audio_simple(artist, title, output_dir)
+
+    def download_youtube(url: str, filename: str, output_dir: str) -> Optional[str]:
+        from app.sources.youtube_handler import download_youtube_audio
+        return download_youtube_audio(url, filename, output_dir)
+
+    def download_art(url: str, filepath: str) -> bool:
+        from app.sources.album_art_finder import download_album_art
+        return download_album_art(url, filepath)
+
+    async def translate_lrc(lrc_path: str, json_path: str, duration: float, artist: str, title: str) -> str:
+        from app.lyrics.openai_handler import parse_lrc_and_translate
+        return await parse_lrc_and_translate(lrc_path, json_path, duration=duration, artist=artist, title=title)
+
+    return PipelineSources(download_spotdl, download_youtube, download_art, translate_lrc)
+
+
+def offline_sources(audio_seconds: float = 30.0, download_latency: float = 0.0,
+                    translation_latency: float = 0.0) -> PipelineSources:
+    """네트워크/LLM 없이 동작하는 합성 소스 (latency 인자로 다운로드/번역 대기 시간을 흉내)"""
+
+    def download_spotdl(artist: str, title: str, output_dir: str) -> Optional[str]:
+        # spotDL은 항상 실패한 것으로 보고 YouTube 스텁으로 넘김
+        return None
+
+    def download_youtube(url: str, filename: str, output_dir: str) -> Optional[str]:
+        time.sleep(download_latency)
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"{filename}.mp3")
+        frequency = 220 + int(hashlib.md5(url.encode("utf-8")).hexdigest()[:4], 16) % 440
+        cmd = [
+            FFMPEG_PATH, "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"sine=frequency={frequency}:duration={audio_seconds}",
+            "-c:a", "libmp3lame", "-b:a", "128k",
+            output_path,
+        ]
+        subprocess.run(cmd, check=True)
+        return output_path
+
+    def download_art(url: str, filepath: str) -> bool:
+        from PIL import Image
+
+        time.sleep(download_latency)
+        digest = hashlib.md5(url.encode("utf-8")).digest()
+        Image.new("RGB", (640, 640), (digest[0], digest[1], digest[2])).save(filepath, format="JPEG")
+        return True
+
+    async def translate_lines(lines: List[str], artist: Optional[str], title: Optional[str]) -> List[str]:
+        await asyncio.sleep(translation_latency)
+        return [f"(EN) {line}" for line in lines]
+
+    async def translate_lrc(lrc_path: str, json_path: str, duration: float, artist: str, title: str) -> str:
+        from app.lyrics.openai_handler import parse_lrc_and_translate
+        return await parse_lrc_and_translate(lrc_path, json_path, duration=duration, artist=artist,
+                                             title=title, translator=translate_lines)
+
+    return PipelineSources(download_spotdl, download_youtube, download_art, translate_lrc,
+                           name=f"offline-{audio_seconds:g}s")
+
+
+def write_synthetic_lrc(path: str, line_count: int = 12, interval: float = 2.5) -> str:
+    """오프라인 시험용 타임스탬프 LRC 파일 생성"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(line_count):
+            seconds = 1.0 + index * interval
+            f.write(f"[{int(seconds // 60):02d}:{seconds % 60:05.2f}]시험용 가사 {index + 1}번째 줄\n")
+    return path
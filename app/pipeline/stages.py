@@ -0,0 +1,120 @@
+"""Small dependency graph for running pipeline stages concurrently.
+
+각 스테이지는 선행 스테이지 결과를 받아 실행되는 코루틴이다. 의존성이 없는 스테이지들은
+``asyncio.gather``로 동시에 실행되고, 블로킹 작업은 :func:`run_blocking`으로 스레드 풀에서
+처리한다. 실행 중 조건에 따라 필요한 결과는 :meth:`StageGraph.result`로 기다릴 수 있다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.pipeline.timing import span
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+StageListener = Callable[[str, str, int, int], None]
+
+
+@dataclass
+class Stage:
+    """이름, 진행 메시지, 선행 스테이지 목록과 실행할 코루틴 함수"""
+    name: str
+    label: str
+    func: StageFunc
+    depends_on: Sequence[str] = ()
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """블로킹 함수를 기본 스레드 풀에서 실행 (contextvars도 함께 전달됨)"""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+class StageGraph:
+    """스테이지 의존성 그래프.
+
+    on_stage_start/on_stage_done은 이벤트 루프 스레드에서
+    (스테이지 이름, 진행 메시지, 완료된 스테이지 수, 전체 스테이지 수)로 호출된다.
+    """
+
+    def __init__(self, stages: Sequence[Stage], on_stage_start: Optional[StageListener] = None,
+                 on_stage_done: Optional[StageListener] = None):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"중복된 스테이지 이름: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"알 수 없는 선행 스테이지: {stage.name} -> {dependency}")
+        self._check_cycles()
+
+        self.on_stage_start = on_stage_start
+        self.on_stage_done = on_stage_done
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._completed = 0
+        # 스테이지별 실행 시간(초, 선행 스테이지 대기 제외)
+        self.timings: Dict[str, float] = {}
+        # 완료된 스테이지 결과 (on_stage_done 호출 시점에 이미 채워져 있음)
+        self.results: Dict[str, Any] = {}
+
+    def _check_cycles(self) -> None:
+        visiting: set = set()
+        visited: set = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"스테이지 의존성 순환: {name}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def result(self, name: str) -> Any:
+        """다른 스테이지 안에서 특정 스테이지 결과가 필요할 때 기다림"""
+        if name not in self._tasks:
+            raise KeyError(f"실행 중이 아닌 스테이지: {name}")
+        return await asyncio.shield(self._tasks[name])
+
+    async def _run_stage(self, stage: Stage) -> Any:
+        dependencies: List[Any] = await asyncio.gather(*(self.result(name) for name in stage.depends_on))
+        inputs = dict(zip(stage.depends_on, dependencies))
+
+        total = len(self.stages)
+        if self.on_stage_start:
+            self.on_stage_start(stage.name, stage.label, self._completed, total)
+        started = time.perf_counter()
+        with span(stage.name):
+            value = await stage.func(inputs)
+        self.timings[stage.name] = time.perf_counter() - started
+        self.results[stage.name] = value
+        self._completed += 1
+        if self.on_stage_done:
+            self.on_stage_done(stage.name, stage.label, self._completed, total)
+        return value
+
+    async def run(self) -> Dict[str, Any]:
+        """모든 스테이지를 실행하고 {스테이지 이름: 결과}를 반환 (하나라도 실패하면 나머지 취소)"""
+        self._completed = 0
+        self.timings = {}
+        self.results = {}
+        self._tasks = {
+            name: asyncio.ensure_future(self._run_stage(stage)) for name, stage in self.stages.items()
+        }
+        try:
+            values = await asyncio.gather(*self._tasks.values())
+        except BaseException:
+            for task in self._tasks.values():
+                task.cancel()
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            raise
+        return dict(zip(self._tasks.keys(), values))
@@ -0,0 +1,291 @@
+"""Lightweight span tracer for pipeline jobs.
+
+``with span("youtube_download") as s: ...``처럼 단계마다 구간을 기록하면 현재 작업의
+:class:`JobTrace`에 벽시계 시간, (스레드) CPU 시간, 하위 프로세스(ffmpeg) CPU 시간, 처리한 바이트 수가
+쌓인다. 작업/부모 구간은 contextvars로 전달되므로 동시에 실행되는 여러 작업과
+``asyncio.to_thread``로 넘긴 블로킹 함수에서도 올바른 작업에 기록된다. 추적 중인 작업이 없으면
+구간은 아무것도 기록하지 않는다.
+
+작업별 JSON 보고서, 배치 집계 보고서, Chrome trace(chrome://tracing, Perfetto) 형식으로 내보낼 수 있다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+@dataclass
+class Span:
+    name: str
+    # 작업 추적 시작 기준 시작 시각(초)
+    start: float
+    wall: float = 0.0
+    # 구간을 실행한 스레드의 CPU 시간 (이벤트 루프에서 await를 감싼 구간은 다른 작업이 섞이므로 None)
+    cpu: Optional[float] = None
+    # 구간 동안 종료된 하위 프로세스(ffmpeg 등)의 CPU 시간 (프로세스 전체 기준)
+    child_cpu: float = 0.0
+    bytes: int = 0
+    # 여러 번 나누어 측정한 구간(accumulate)의 측정 횟수
+    count: int = 1
+    thread: str = ""
+    parent: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def add_bytes(self, size: int) -> None:
+        self.bytes += int(size)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class JobTrace:
+    """작업 하나의 구간 기록"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.wall = 0.0
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """구간 이름별 합계 (횟수, 벽시계/CPU 시간, 바이트)"""
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stats = result.setdefault(span.name, {"count": 0, "wall": 0.0, "cpu": 0.0, "child_cpu": 0.0,
+                                                   "bytes": 0})
+            stats["count"] += span.count
+            stats["wall"] += span.wall
+            stats["cpu"] += span.cpu or 0.0
+            stats["child_cpu"] += span.child_cpu
+            stats["bytes"] += span.bytes
+        return {name: _rounded(stats) for name, stats in result.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return {
+            "job": self.name,
+            "started_at": self.started_at,
+            "wall": round(self.wall, 6),
+            "stages": self.summary(),
+            "spans": [_rounded(asdict(span)) for span in spans],
+        }
+
+
+def _rounded(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in values.items()}
+
+
+_current_trace: ContextVar[Optional[JobTrace]] = ContextVar("lyric_job_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("lyric_span", default=None)
+
+
+def current_trace() -> Optional[JobTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def job_trace(name: str) -> Iterator[JobTrace]:
+    """블록 안(과 거기서 만든 태스크/스레드)의 구간을 새 JobTrace에 기록"""
+    trace = JobTrace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        trace.wall = trace._elapsed()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _children_cpu() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """현재 작업에 구간 기록 (작업 추적 중이 아니면 기록하지 않음)"""
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    record = Span(name, trace._elapsed() if trace else 0.0, thread=threading.current_thread().name,
+                  parent=parent.name if parent else None, attrs=dict(attrs))
+    if trace is None:
+        yield record
+        return
+
+    token = _current_span.set(record)
+    cpu_started = None if _in_event_loop() else time.thread_time()
+    child_started = _children_cpu()
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        record.wall = time.perf_counter() - started
+        if cpu_started is not None:
+            record.cpu = time.thread_time() - cpu_started
+        record.child_cpu = max(0.0, _children_cpu() - child_started)
+        _current_span.reset(token)
+        trace._add(record)
+
+
+def record_bytes(size: int) -> None:
+    """현재 구간에 처리한 바이트 수 추가"""
+    current = _current_span.get()
+    if current is not None:
+        current.add_bytes(size)
+
+
+class SpanAccumulator:
+    """반복문 안에서 여러 번 나누어 측정한 시간을 구간 하나로 합산 (프레임 렌더링/파이프 쓰기 등)"""
+
+    def __init__(self, name: str, **attrs: Any):
+        self._trace = _current_trace.get()
+        parent = _current_span.get()
+        self.span = Span(name, 0.0, cpu=0.0, count=0, thread=threading.current_thread().name,
+                         parent=parent.name if parent else None, attrs=dict(attrs))
+        self._first_start: Optional[float] = None
+        self._started = 0.0
+        self._cpu_started = 0.0
+        self._child_started = 0.0
+
+    def __enter__(self) -> "SpanAccumulator":
+        if self._trace is not None:
+            if self._first_start is None:
+                self._first_start = self._trace._elapsed()
+            self._cpu_started = time.thread_time()
+            self._child_started = _children_cpu()
+            self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._trace is not None:
+            self.span.wall += time.perf_counter() - self._started
+            self.span.cpu += time.thread_time() - self._cpu_started
+            self.span.child_cpu += max(0.0, _children_cpu() - self._child_started)
+            self.span.count += 1
+
+    def add_bytes(self, size: int) -> None:
+        self.span.add_bytes(size)
+
+    def close(self) -> None:
+        if self._trace is not None and self.span.count:
+            self.span.start = self._first_start or 0.0
+            self.span.attrs["accumulated"] = True
+            self._trace._add(self.span)
+            self._trace = None
+
+
+@contextmanager
+def accumulate(name: str, **attrs: Any) -> Iterator[SpanAccumulator]:
+    accumulator = SpanAccumulator(name, **attrs)
+    try:
+        yield accumulator
+    finally:
+        accumulator.close()
+
+
+# 보고서 ---------------------------------------------------------------------
+
+def aggregate_traces(traces: Sequence[JobTrace]) -> Dict[str, Any]:
+    """여러 작업의 구간별 합계/평균/최대 시간"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for trace in traces:
+        for name, stats in trace.summary().items():
+            total = stages.setdefault(name, {"jobs": 0, "count": 0, "wall": 0.0, "wall_max": 0.0,
+                                             "cpu": 0.0, "child_cpu": 0.0, "bytes": 0})
+            total["jobs"] += 1
+            total["count"] += stats["count"]
+            total["wall"] += stats["wall"]
+            total["wall_max"] = max(total["wall_max"], stats["wall"])
+            total["cpu"] += stats["cpu"]
+            total["child_cpu"] += stats["child_cpu"]
+            total["bytes"] += stats["bytes"]
+    for total in stages.values():
+        total["wall_mean"] = total["wall"] / total["jobs"]
+    return {
+        "jobs": len(traces),
+        "wall_total": round(sum(trace.wall for trace in traces), 6),
+        "stages": {name: _rounded(total) for name, total in sorted(stages.items(),
+                                                                   key=lambda item: -item[1]["wall"])},
+        "per_job": [{"job": trace.name, "wall": round(trace.wall, 6)} for trace in traces],
+    }
+
+
+def chrome_trace(traces: Sequence[JobTrace]) -> Dict[str, Any]:
+    """Chrome trace 이벤트 형식 (작업별 pid, 스레드별 tid)"""
+    events: List[Dict[str, Any]] = []
+    origin = min((trace.started_at for trace in traces), default=0.0)
+    for pid, trace in enumerate(traces, start=1):
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": trace.name}})
+        thread_ids: Dict[str, int] = {}
+        offset = (trace.started_at - origin) * 1_000_000
+        for span in sorted(trace.spans, key=lambda item: item.start):
+            if span.thread not in thread_ids:
+                thread_ids[span.thread] = len(thread_ids) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_ids[span.thread],
+                               "args": {"name": span.thread}})
+            args = {"cpu": span.cpu, "child_cpu": span.child_cpu, "bytes": span.bytes, "count": span.count,
+                    **span.attrs}
+            events.append({
+                "name": span.name,
+                "cat": span.parent or "job",
+                "ph": "X",
+                "ts": round(offset + span.start * 1_000_000, 1),
+                "dur": round(span.wall * 1_000_000, 1),
+                "pid": pid,
+                "tid": thread_ids[span.thread],
+                "args": args,
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_json(data: Dict[str, Any], path: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    return path
+
+
+def write_job_reports(trace: JobTrace, trace_dir: str, basename: str) -> None:
+    """<basename>.trace.json(구간 보고서)과 <basename>.chrome.json(Chrome trace) 저장"""
+    write_json(trace.to_dict(), os.path.join(trace_dir, f"{basename}.trace.json"))
+    write_json(chrome_trace([trace]), os.path.join(trace_dir, f"{basename}.chrome.json"))
+    print(f"[DEBUG] 구간 기록 저장: {os.path.join(trace_dir, basename)}.trace.json")
+
+
+def write_batch_reports(traces: Sequence[JobTrace], trace_dir: str) -> None:
+    """배치 집계 보고서(batch_report.json)와 전체 Chrome trace(batch.chrome.json) 저장"""
+    write_json(aggregate_traces(traces), os.path.join(trace_dir, "batch_report.json"))
+    write_json(chrome_trace(traces), os.path.join(trace_dir, "batch.chrome.json"))
+    print(f"[DEBUG] 배치 구간 기록 저장: {trace_dir}")
@@ -0,0 +1,120 @@
+"""Long-lived pipeline worker that owns a single event loop.
+
+백그라운드 스레드에서 하나의 이벤트 루프를 앱(또는 배치)이 끝날 때까지 유지하고, GUI와 CLI는
+이 루프에 작업을 제출한다. 곡마다 루프를 새로 만들지 않으므로 루프에 묶인 번역 모델 클라이언트의
+HTTP 연결, 기본 스레드 풀(과 스레드별 requests 세션), 자원 제한, 소스 객체가 작업 사이에 재사용된다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+from app.pipeline.job_journal import JobJournal
+from app.pipeline.process_manager import ProcessConfig, ProcessManager, StageEventListener
+from app.pipeline.resources import ResourceLimits, ResourcePools
+from app.pipeline.sources import PipelineSources, default_sources
+from app.pipeline.workspace import cleanup_stale_workspaces
+
+
+class PipelineWorker:
+    """작업들이 공유하는 이벤트 루프 스레드와 재사용 자원"""
+
+    def __init__(self, limits: Optional[ResourceLimits] = None, sources: Optional[PipelineSources] = None):
+        self.sources = sources or default_sources()
+        # 기본값은 제한 없음 (GUI는 한 번에 한 곡씩 처리)
+        self.resources = ResourcePools(limits) if limits else ResourcePools.unlimited()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name="pipeline-worker", daemon=True)
+            self._thread.start()
+            ready.wait()
+            print("[DEBUG] 파이프라인 워커 시작")
+            # 이전 프로세스가 비정상 종료되어 남긴 작업 폴더 정리
+            cleanup_stale_workspaces()
+
+    def submit_coroutine(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """코루틴을 워커 루프에서 실행하도록 예약 (어느 스레드에서나 호출 가능)"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("파이프라인 워커 루프 안에서는 await로 직접 실행해야 합니다.")
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """코루틴을 워커 루프에서 실행하고 결과를 기다림"""
+        return self.submit_coroutine(coro).result()
+
+    def create_manager(self, update_progress: Callable[[str, int], None],
+                       journal: Optional[JobJournal] = None,
+                       on_stage: Optional[StageEventListener] = None) -> ProcessManager:
+        """워커의 소스/자원 제한을 공유하는 ProcessManager"""
+        return ProcessManager(update_progress, resources=self.resources, sources=self.sources,
+                              journal=journal, on_stage=on_stage)
+
+    def submit(self, config: ProcessConfig, update_progress: Callable[[str, int], None],
+               journal: Optional[JobJournal] = None,
+               on_stage: Optional[StageEventListener] = None) -> concurrent.futures.Future:
+        """곡 하나를 처리하도록 제출, 결과(출력 경로)는 Future로 받음"""
+        manager = self.create_manager(update_progress, journal=journal, on_stage=on_stage)
+        return self.submit_coroutine(manager.process_async(config))
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """재사용하던 클라이언트 연결과 스레드 풀을 정리하고 루프 종료"""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+
+        async def close() -> None:
+            from app.lyrics.ai_models import close_pooled_models
+            await close_pooled_models()
+            await loop.shutdown_default_executor()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close(), loop).result(timeout)
+        except Exception as e:
+            print(f"[WARN] 파이프라인 워커 정리 실패: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        with self._lock:
+            self._loop = None
+            self._thread = None
+        print("[DEBUG] 파이프라인 워커 종료")
+
+
+_pipeline_worker: Optional[PipelineWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_pipeline_worker() -> PipelineWorker:
+    """프로세스 전역 파이프라인 워커 반환 (프로세스 종료 시 자동 정리)"""
+    global _pipeline_worker
+    with _worker_lock:
+        if _pipeline_worker is None:
+            _pipeline_worker = PipelineWorker()
+            atexit.register(_pipeline_worker.shutdown)
+        return _pipeline_worker
@@ -0,0 +1,100 @@
+"""Per-job scratch directories.
+
+작업마다 ``TEMP_DIR/jobs/<작업 ID>`` 폴더를 만들어 오디오/앨범 아트/가사 JSON/렌더링 중간 파일을
+그 안에만 쓴다. 같은 곡(아티스트/제목)을 동시에 처리하거나 여러 곡을 병렬 렌더링해도 파일이 섞이지 않는다.
+
+작업이 끝나면(성공, 실패, 취소) 정리 정책에 따라 폴더를 지운다.
+
+- ``always``: 항상 삭제 (기본값)
+- ``on_success``: 성공했을 때만 삭제하고 실패/취소한 작업의 중간 파일은 디버깅용으로 남김
+- ``never``: 삭제하지 않음
+
+프로세스가 비정상 종료되어 남은 오래된 폴더는 :func:`cleanup_stale_workspaces`로 정리한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from typing import Literal
+
+from app.config.paths import JOB_WORKSPACE_DIR
+
+CleanupPolicy = Literal["always", "on_success", "never"]
+CLEANUP_POLICIES = ("always", "on_success", "never")
+WorkspaceOutcome = Literal["success", "failed", "cancelled"]
+
+# 이보다 오래된 작업 폴더는 비정상 종료로 남은 것으로 보고 정리 (진행 중인 다른 프로세스의 폴더는 건드리지 않도록 넉넉히)
+STALE_WORKSPACE_SECONDS = 24 * 60 * 60
+
+
+class JobWorkspace:
+    """작업 하나의 전용 임시 폴더 (with 블록을 벗어나면 결과에 따라 정리)"""
+
+    def __init__(self, label: str = "job", cleanup: CleanupPolicy = "always", root: str = JOB_WORKSPACE_DIR):
+        if cleanup not in CLEANUP_POLICIES:
+            raise ValueError(f"알 수 없는 작업 폴더 정리 정책: {cleanup}")
+        # 시작 시각 + 임의 값: 같은 곡을 동시에 처리해도 겹치지 않고, 폴더 이름순이 시작 순서가 됨
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.cleanup = cleanup
+        self.dir = os.path.join(root, self.id)
+        self.closed = False
+        os.makedirs(self.dir)
+
+    def path(self, *parts: str) -> str:
+        """작업 폴더 안의 경로 (하위 폴더는 만들지 않음)"""
+        return os.path.join(self.dir, *parts)
+
+    def subdir(self, name: str) -> str:
+        """작업 폴더 안에 하위 폴더를 만들고 경로 반환"""
+        path = self.path(name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def close(self, outcome: WorkspaceOutcome) -> None:
+        """정리 정책에 따라 작업 폴더 삭제 (여러 번 호출해도 한 번만 처리)"""
+        if self.closed:
+            return
+        self.closed = True
+        remove = self.cleanup == "always" or (self.cleanup == "on_success" and outcome == "success")
+        if not remove:
+            print(f"[DEBUG] 작업 폴더 유지 ({outcome}): {self.dir}")
+            return
+        shutil.rmtree(self.dir, ignore_errors=True)
+        print(f"[DEBUG] 작업 폴더 삭제 ({outcome}): {self.dir}")
+
+    def __enter__(self) -> "JobWorkspace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close("success")
+        elif issubclass(exc_type, (asyncio.CancelledError, KeyboardInterrupt)):
+            self.close("cancelled")
+        else:
+            self.close("failed")
+
+
+def cleanup_stale_workspaces(max_age: float = STALE_WORKSPACE_SECONDS, root: str = JOB_WORKSPACE_DIR) -> int:
+    """수정된 지 max_age초가 지난 작업 폴더 삭제, 삭제한 폴더 수 반환"""
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if not os.path.isdir(path) or os.path.getmtime(path) >= cutoff:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    if removed:
+        print(f"[DEBUG] 오래된 작업 폴더 {removed}개 정리: {root}")
+    return removed
+
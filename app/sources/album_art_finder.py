@@ -1,10 +1,11 @@
 import musicbrainzngs
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import quote
 from typing import Optional
 import traceback
 
+from app.sources.http_session import get_http_session
+
 # MusicBrainz API 설정
 musicbrainzngs.set_useragent(
     "LyricVideoMaker",
@@ -61,7 +62,7 @@ def search_album_art_bugs(artist: str, title: str) -> Optional[str]:
                 "Chrome/91.0.4472.124 Safari/537.36"
             )
         }
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
 
         # HTML 파싱
@@ -85,7 +86,7 @@ def search_album_art_bugs(artist: str, title: str) -> Optional[str]:
 def download_album_art(url: str, filepath: str) -> bool:
     """URL에서 앨범 아트 다운로드"""
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         response.raise_for_status()
 
         with open(filepath, 'wb') as f:
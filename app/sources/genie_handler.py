@@ -1,10 +1,11 @@
 from genieapi import GenieAPI
 from typing import List, Tuple, Optional
-import requests
 import traceback
 import os
 from bs4 import BeautifulSoup
 
+from app.sources.http_session import get_http_session
+
 def search_genie_songs(query: str, limit: int = 4) -> List[Tuple[str, str, str, str, int]]:
     """지니뮤직에서 노래 검색"""
     try:
@@ -97,7 +98,7 @@ def get_song_details(song_id: str) -> Tuple[Optional[str], Optional[int]]:
         
         song_url = f"https://www.genie.co.kr/detail/songInfo?xgnm={song_id}"
         print(f"[DEBUG] 곡 정보 URL: {song_url}")
-        response = requests.get(song_url, headers=headers)
+        response = get_http_session().get(song_url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -150,7 +151,7 @@ def get_album_arts_url(song_id: str) -> List[str]:
         }
         # 곡 정보 페이지
         url = f"https://www.genie.co.kr/detail/songInfo?xgnm={song_id}"
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -165,7 +166,7 @@ def get_album_arts_url(song_id: str) -> List[str]:
         artist_link = soup.select_one('a.artist-info')
         if artist_link and 'href' in artist_link.attrs:
             artist_url = f"https://www.genie.co.kr{artist_link['href']}"
-            artist_response = requests.get(artist_url, headers=headers)
+            artist_response = get_http_session().get(artist_url, headers=headers)
             artist_soup = BeautifulSoup(artist_response.text, 'html.parser')
             album_imgs = artist_soup.select('div.album-list img')[:2]  # 추가로 2개만
             
@@ -188,7 +189,7 @@ def get_song_album_id_and_art_url(song_id: str) -> Optional[Tuple[str, str]]:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
         url = f"https://www.genie.co.kr/detail/songInfo?xgnm={song_id}"
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -0,0 +1,21 @@
+"""Shared HTTP sessions so repeated requests reuse keep-alive connections."""
+
+from __future__ import annotations
+
+import threading
+
+import requests
+
+_local = threading.local()
+
+
+def get_http_session() -> requests.Session:
+    """스레드별 requests.Session 반환 (같은 스레드의 요청끼리 연결을 재사용)
+
+    파이프라인 워커의 스레드 풀은 앱이 끝날 때까지 유지되므로 곡마다 TCP/TLS 연결을 새로 맺지 않는다.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
@@ -116,13 +116,13 @@ def youtube_search(query: str, target_duration: Optional[int] = None) -> List[Di
         print(f"YouTube 검색 실패: {e}")
         return []
 
-def download_youtube_audio(url: str, output_filename: str) -> Optional[str]:
-    """YouTube 동영상의 오디오를 MP3로 바로 다운로드"""
+def download_youtube_audio(url: str, output_filename: str, output_dir: str = TEMP_DIR) -> Optional[str]:
+    """YouTube 동영상의 오디오를 output_dir/<output_filename>.mp3로 바로 다운로드"""
     try:
         # output_filename = os.path.splitext(output_filename)[0]  # 파일명에 점(.)이 포함된 경우 확장자로 오인하여 잘리는 문제 수정
         ensure_data_dirs()
-        os.makedirs(TEMP_DIR, exist_ok=True)
-        base_path = os.path.join(TEMP_DIR, output_filename)
+        os.makedirs(output_dir, exist_ok=True)
+        base_path = os.path.join(output_dir, output_filename)
 
         ydl_opts = {
             'format': 'bestaudio/best',
@@ -3,14 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel,
                            QPushButton, QComboBox, QCheckBox, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QImage
-import requests
 import threading
+from app.sources.http_session import get_http_session
 from app.upload.youtube_uploader import upload_video
 
 def load_image_from_url(url, size=(120, 90)):
     """URL에서 이미지를 로드하여 QPixmap으로 반환"""
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         image = QImage.fromData(response.content)
         pixmap = QPixmap.fromImage(image)
         return pixmap.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio)
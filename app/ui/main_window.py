@@ -13,8 +13,11 @@ import sys
 import traceback
 from datetime import datetime
 
-from app.config.paths import LYRICS_DIR, TEMP_DIR, ensure_data_dirs
-from app.pipeline.process_manager import ProcessConfig, ProcessManager
+from app.config.paths import LYRICS_DIR, QUEUE_JOURNAL_PATH, TEMP_DIR, ensure_data_dirs
+from app.lyrics.lyrics_index import register_lrc
+from app.pipeline.job_journal import JobJournal
+from app.pipeline.process_manager import ProcessConfig
+from app.pipeline.worker import get_pipeline_worker
 from app.sources.genie_handler import get_genie_lyrics, parse_genie_extra_info, search_genie_songs
 from app.sources.youtube_handler import youtube_search, download_youtube_audio
 from app.ui.components import YouTubeUploadDialog, load_image_from_url
@@ -36,7 +39,10 @@ class WorkerThread(QThread):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
-        self.process_manager = ProcessManager(self.update_progress)
+        # 이벤트 루프/번역 클라이언트/HTTP 연결은 앱 전역 파이프라인 워커에서 재사용
+        self.process_manager = get_pipeline_worker().create_manager(
+            self.update_progress, journal=getattr(main_window, 'queue_journal', None)
+        )
 
     def run(self):
         try:
@@ -47,7 +53,10 @@ class WorkerThread(QThread):
                 youtube_url=self.main_window.selected_youtube_url,
                 output_mode=self.main_window.output_mode,
                 lrc_path=self.main_window.selected_lrc_path,
-                prefer_youtube=getattr(self.main_window, 'prefer_youtube', False)
+                prefer_youtube=getattr(self.main_window, 'prefer_youtube', False),
+                genie_song_id=(getattr(self.main_window, 'current_genie_id', None)
+                               or getattr(self.main_window, 'selected_genie_id', None)),
+                job_id=getattr(self.main_window, 'current_job_id', None)
             )
 
             validation_error = self.process_manager.validate_config(config)
@@ -60,7 +69,8 @@ class WorkerThread(QThread):
             if output_path and os.path.exists(output_path):
                 print(f"[DEBUG] 처리 완료. 출력 파일: {output_path}")
                 
-                if self.main_window.youtube_upload_enabled and output_path.endswith('.mp4'):
+                if (self.main_window.youtube_upload_enabled and output_path.endswith('.mp4')
+                        and config.output_mode == "video"):
                     self.upload_requested.emit(output_path, config.title, config.artist)
                 else:
                     self.finished.emit()
@@ -100,11 +110,16 @@ class ModernMainWindow(QMainWindow):
         self.last_progress_message = None
         self.queue_items = []  # Queue for batch processing
         self.current_queue_index = 0
+        # 큐 작업 기록 (비정상 종료 후 재시작 시 미완료 곡을 완료된 단계부터 이어서 처리)
+        self.queue_journal = JobJournal(QUEUE_JOURNAL_PATH)
+        self.current_job_id = None
+        self.current_genie_id = None
         self.is_manual_mode = False
         self.manual_data = None
         
         # Create UI
         self.init_ui()
+        self.restore_queue_from_journal()
         
     def init_ui(self):
         """Initialize the modern UI"""
@@ -220,11 +235,15 @@ class ModernMainWindow(QMainWindow):
         
         self.output_video_radio = QRadioButton("🎬 Video (.mp4)")
         self.output_xml_radio = QRadioButton("📄 Premiere XML")
+        self.output_preview_radio = QRadioButton("👀 Quick Preview (480p)")
         self.output_video_radio.setChecked(True)
-        self.output_video_radio.toggled.connect(lambda: self.set_output_mode("video"))
-        self.output_xml_radio.toggled.connect(lambda: self.set_output_mode("premiere_xml"))
+        # toggled는 선택 해제 시에도 호출되므로 선택된 버튼만 반영
+        self.output_video_radio.toggled.connect(lambda checked: checked and self.set_output_mode("video"))
+        self.output_xml_radio.toggled.connect(lambda checked: checked and self.set_output_mode("premiere_xml"))
+        self.output_preview_radio.toggled.connect(lambda checked: checked and self.set_output_mode("preview"))
         layout.addWidget(self.output_video_radio)
         layout.addWidget(self.output_xml_radio)
+        layout.addWidget(self.output_preview_radio)
         
         # YouTube Upload
         self.youtube_upload_checkbox = QCheckBox("📤 Auto-upload to YouTube")
@@ -481,11 +500,15 @@ class ModernMainWindow(QMainWindow):
         
         self.output_video_radio = QRadioButton("🎬 Video (.mp4)")
         self.output_xml_radio = QRadioButton("📄 Premiere XML")
+        self.output_preview_radio = QRadioButton("👀 Quick Preview (480p)")
         self.output_video_radio.setChecked(True)
-        self.output_video_radio.toggled.connect(lambda: self.set_output_mode("video"))
-        self.output_xml_radio.toggled.connect(lambda: self.set_output_mode("premiere_xml"))
+        # toggled는 선택 해제 시에도 호출되므로 선택된 버튼만 반영
+        self.output_video_radio.toggled.connect(lambda checked: checked and self.set_output_mode("video"))
+        self.output_xml_radio.toggled.connect(lambda checked: checked and self.set_output_mode("premiere_xml"))
+        self.output_preview_radio.toggled.connect(lambda checked: checked and self.set_output_mode("preview"))
         settings_layout.addWidget(self.output_video_radio)
         settings_layout.addWidget(self.output_xml_radio)
+        settings_layout.addWidget(self.output_preview_radio)
         
         # YouTube Upload
         self.youtube_upload_checkbox = QCheckBox("📤 Auto-upload to YouTube")
@@ -620,6 +643,7 @@ class ModernMainWindow(QMainWindow):
                     lrc_path = os.path.join(LYRICS_DIR, f"{filename}.lrc")
                     with open(lrc_path, "w", encoding="utf-8") as f:
                         f.write(lrc_content)
+                    register_lrc(lrc_path, artist=artist, title=title)
                     
                     self.selected_lrc_path = lrc_path
                     self.progress_log.append(f"LRC saved to {lrc_path}")
@@ -845,6 +869,7 @@ class ModernMainWindow(QMainWindow):
                     with open(lrc_path, "w", encoding="utf-8") as lrc_file:
                         lrc_file.write(lyrics.strip() + "\n")
                     self.selected_lrc_path = lrc_path
+                    register_lrc(lrc_path, genie_song_id=song_id, artist=artist, title=title)
                     print(f"[DEBUG] LRC 파일 저장: {lrc_path}")
                 else:
                     print("[WARN] 가사 데이터를 가져오지 못했습니다.")
@@ -1084,6 +1109,7 @@ class ModernMainWindow(QMainWindow):
             self.model_combo,
             self.output_video_radio,
             self.output_xml_radio,
+            self.output_preview_radio,
             self.youtube_upload_checkbox,
         ]
         for control in controls:
@@ -1190,14 +1216,18 @@ class ModernMainWindow(QMainWindow):
                 except Exception as e:
                     print(f"[ERROR] Error cleaning temp dir: {e}")
 
-            # Clean cache
-            from app.config.paths import TRANSLATION_CACHE_PATH
-            if os.path.exists(TRANSLATION_CACHE_PATH):
-                try:
-                    os.unlink(TRANSLATION_CACHE_PATH)
-                    print("[INFO] Translation cache deleted.")
-                except Exception as e:
-                    print(f"[ERROR] Failed to delete cache: {e}")
+            # 처리 중이 아니면 남아 있는 작업 폴더(TEMP_DIR/jobs)도 모두 정리
+            if not self.is_processing:
+                from app.pipeline.workspace import cleanup_stale_workspaces
+                cleanup_stale_workspaces(max_age=0)
+
+            # Clean cache (SQLite 연결이 열려 있으므로 파일을 지우지 않고 비움)
+            from app.lyrics.translation_cache import get_translation_cache
+            try:
+                get_translation_cache().clear()
+                print("[INFO] Translation cache cleared.")
+            except Exception as e:
+                print(f"[ERROR] Failed to clear cache: {e}")
             
             self.progress_log.append("🧹 Cleanup completed. Cache cleared.")
             QMessageBox.information(self, "Success", "Cleanup completed!")
@@ -1,8 +1,11 @@
 """Queue management methods for MainWindow"""
 
 import os
+import uuid
 from PyQt6.QtWidgets import QMessageBox
 
+from app.pipeline.job_journal import job_id_for
+
 
 def check_ready_to_add(self):
     """Check if ready to add to queue"""
@@ -13,7 +16,7 @@ def check_ready_to_add(self):
     self.add_queue_btn.setEnabled(bool(has_genie and has_youtube and has_lrc))
 
 
-def add_to_queue(self):
+def add_to_queue(self, silent=False):
     """Add current song to queue"""
     if not hasattr(self, 'selected_genie_id') or not self.selected_youtube_url or not self.selected_lrc_path:
         return
@@ -26,11 +29,16 @@ def add_to_queue(self):
         'lrc_path': self.selected_lrc_path,
         'genie_id': self.selected_genie_id
     }
+    # 앱이 중간에 종료되어도 다음 실행 때 큐를 복원할 수 있도록 기록
+    # (같은 곡을 두 번 넣어도 기록이 합쳐지지 않도록 추가할 때마다 고유 접미사)
+    queue_item['job_id'] = f"{job_id_for(queue_item)}-{uuid.uuid4().hex[:8]}"
+    self.queue_journal.add(queue_item['job_id'], queue_item)
     
     self.queue_items.append(queue_item)
     self.queue_list.addItem(f"🎵 {queue_item['artist']} - {queue_item['title']}")
     self.update_queue_count()
-    self.append_progress_message(f"✅ Added to queue: {queue_item['artist']} - {queue_item['title']}")
+    if not silent:
+        self.append_progress_message(f"✅ Added to queue: {queue_item['artist']} - {queue_item['title']}")
     
     # Reset selection
     self.selected_youtube_url = ""
@@ -47,8 +55,24 @@ def update_queue_count(self):
     self.start_batch_btn.setEnabled(count > 0)
 
 
+def restore_queue_from_journal(self):
+    """Restore unfinished queue items recorded before the app was closed or crashed"""
+    records = self.queue_journal.unfinished()
+    for record in records:
+        queue_item = dict(record.config)
+        queue_item['job_id'] = record.job_id
+        self.queue_items.append(queue_item)
+        self.queue_list.addItem(f"♻️ {queue_item['artist']} - {queue_item['title']}")
+    if records:
+        self.update_queue_count()
+        self.append_progress_message(f"♻️ Restored {len(records)} unfinished song(s) to queue")
+
+
 def clear_queue(self):
     """Clear all items from queue"""
+    for item in self.queue_items:
+        if item.get('job_id'):
+            self.queue_journal.remove(item['job_id'])
     self.queue_items.clear()
     self.queue_list.clear()
     self.update_queue_count()
@@ -81,6 +105,11 @@ def process_next_in_queue(self):
     self.album_cover_input.setText(item['album_art_url'])
     self.selected_youtube_url = item['youtube_url']
     self.selected_lrc_path = item['lrc_path']
+    self.current_job_id = item.get('job_id')
+    self.current_genie_id = item.get('genie_id')
+    record = self.queue_journal.get(self.current_job_id) if self.current_job_id else None
+    if record and record.stages:
+        self.append_progress_message(f"↻ Resuming (done: {', '.join(record.stages)})")
     
     # Start worker
     from app.ui.main_window import WorkerThread
@@ -94,6 +123,10 @@ def process_next_in_queue(self):
 def on_queue_item_complete(self):
     """Handle completion of one queue item"""
     self.worker = None
+    if self.current_job_id:
+        self.queue_journal.remove(self.current_job_id)
+    self.current_job_id = None
+    self.current_genie_id = None
     self.current_queue_index += 1
     self.process_next_in_queue()
 
@@ -102,6 +135,9 @@ def on_queue_item_error(self, error_message):
     """Handle error in queue item"""
     self.append_progress_message(f"❌ Error processing item {self.current_queue_index + 1}: {error_message}")
     self.worker = None
+    # 실패 기록은 남겨 두어 다음 실행 때 완료된 단계부터 다시 시도
+    self.current_job_id = None
+    self.current_genie_id = None
     
     reply = QMessageBox.question(
         self, "Error", 
@@ -133,6 +169,7 @@ def inject_queue_methods(cls):
     cls.check_ready_to_add = check_ready_to_add
     cls.add_to_queue = add_to_queue
     cls.update_queue_count = update_queue_count
+    cls.restore_queue_from_journal = restore_queue_from_journal
     cls.clear_queue = clear_queue
     cls.start_batch_processing = start_batch_processing
     cls.process_next_in_queue = process_next_in_queue
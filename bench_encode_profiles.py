@@ -0,0 +1,77 @@
+"""인코딩 프로필 벤치마크.
+
+합성 오디오와 가사(일정 간격)로 같은 리릭 비디오를 "standard"(기존 CFR 명령)와
+"still"(VFR 정지 화면 프로필)로 각각 만들어 인코딩 시간과 파일 크기를 비교한다.
+
+사용법: python bench_encode_profiles.py [곡 길이(초)] [render_mode]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.config.paths import FFMPEG_PATH, TEMP_DIR, ensure_data_dirs
+from app.media.video_maker import RenderOptions, make_lyric_video
+
+ALBUM_ART_PATH = os.path.join("temp_test", "dummy_album.jpg")
+LINE_INTERVAL = 3.0
+
+
+def _prepare_inputs(bench_dir: str, duration: float):
+    audio_path = os.path.join(bench_dir, "bench_audio.mp3")
+    subprocess.run(
+        [FFMPEG_PATH, "-y", "-v", "error", "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+         "-c:a", "libmp3lame", "-b:a", "192k", audio_path],
+        check=True,
+    )
+
+    lyrics = []
+    start = 2.0
+    index = 0
+    while start < duration - 2:
+        lyrics.append({
+            "start_time": start,
+            "original": f"벤치마크 가사 {index}번째 줄입니다",
+            "english": f"This is benchmark lyric line number {index}",
+        })
+        start += LINE_INTERVAL
+        index += 1
+
+    lyrics_path = os.path.join(bench_dir, "bench_lyrics.json")
+    with open(lyrics_path, "w", encoding="utf-8") as f:
+        json.dump(lyrics, f, ensure_ascii=False)
+    return audio_path, lyrics_path, len(lyrics)
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    render_mode = sys.argv[2] if len(sys.argv) > 2 else "stream"
+
+    ensure_data_dirs()
+    bench_dir = os.path.join(TEMP_DIR, "bench_encode")
+    os.makedirs(bench_dir, exist_ok=True)
+    audio_path, lyrics_path, line_count = _prepare_inputs(bench_dir, duration)
+    print(f"{duration:.0f}s song, {line_count} lyric lines, render_mode={render_mode}")
+
+    results = {}
+    for profile in ("standard", "still"):
+        output_path = os.path.join(bench_dir, f"bench_{profile}.mp4")
+        options = RenderOptions(render_mode=render_mode, encode_profile=profile, work_dir=bench_dir)
+        start = time.perf_counter()
+        make_lyric_video(audio_path, ALBUM_ART_PATH, lyrics_path, output_path, options)
+        elapsed = time.perf_counter() - start
+        results[profile] = (elapsed, os.path.getsize(output_path))
+
+    for profile, (elapsed, size) in results.items():
+        print(f"{profile:<9} {elapsed:7.2f} s  {size / 1024:9.1f} KiB")
+    standard_time, standard_size = results["standard"]
+    still_time, still_size = results["still"]
+    print(f"still vs standard: {standard_time / still_time:.1f}x faster, {standard_size / still_size:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""외곽선 텍스트 렌더링 마이크로벤치마크.
+
+기존 오프셋 반복 방식((2w+1)^2회 draw.text)과 Pillow stroke 단일 패스 방식을
+같은 가사 줄로 비교하고, 두 결과 이미지의 픽셀 차이를 함께 출력한다.
+
+사용법: python bench_text_outline.py [반복 횟수]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from PIL import Image, ImageChops, ImageDraw
+
+from app.media.video_maker import _draw_outlined_text_offsets, draw_outlined_text, prepare_fonts
+
+SAMPLE_LINES = [
+    "Yo, ZENE놈은 양산 하나 없던 채로 시작해서",
+    "Started from the bottom with nothing in my hands",
+    "여긴 내가 접수해 이젠 내 차례야",
+]
+
+
+def _render(draw_fn, font, **kwargs) -> Image.Image:
+    image = Image.new("RGBA", (1920, 240), (40, 40, 40, 255))
+    draw = ImageDraw.Draw(image)
+    for row, line in enumerate(SAMPLE_LINES):
+        draw_fn(draw, (60, 10 + row * 75), line, font, **kwargs)
+    return image
+
+
+def _bench(label: str, draw_fn, font, iterations: int, **kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _render(draw_fn, font, **kwargs)
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"{label:<28} {elapsed * 1000:8.2f} ms / frame")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    font, _ = prepare_fonts()
+
+    legacy = _bench("offset loop (legacy)", _draw_outlined_text_offsets, font, iterations)
+    stroked = _bench("pillow stroke", draw_outlined_text, font, iterations)
+    _bench("pillow stroke + softness 1.5", draw_outlined_text, font, iterations, outline_softness=1.5)
+    print(f"speedup: {legacy / stroked:.1f}x")
+
+    diff = ImageChops.difference(
+        _render(_draw_outlined_text_offsets, font).convert("RGB"),
+        _render(draw_outlined_text, font).convert("RGB"),
+    ).convert("L")
+    changed = sum(diff.histogram()[33:])
+    print(f"pixels differing by >32 levels: {changed} / {diff.width * diff.height}")
+
+
+if __name__ == "__main__":
+    main()
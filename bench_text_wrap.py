@@ -0,0 +1,89 @@
+"""가사 줄바꿈 측정 비용 벤치마크.
+
+접두 문자열 전체를 매번 draw.textlength로 다시 재던 기존 줄바꿈과
+폰트 메트릭 캐시를 쓰는 현재 _wrap_text를 긴 가사 시트로 비교하고,
+캐시 hit/miss 통계를 출력한다.
+
+사용법: python bench_text_wrap.py [가사 줄 수]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from PIL import Image, ImageDraw
+
+from app.media.font_metrics import get_font_metrics_cache
+from app.media.video_maker import _wrap_text, prepare_fonts
+
+MAX_WIDTH = 1920 * 0.86
+SAMPLE_LINES = [
+    "이건내가처음부터끝까지띄어쓰기없이길게써내려간가사인데화면폭을넘어가게될거야아마도그렇겠지",
+    "Yo, ZENE놈은 양산 하나 없던 채로 시작해서 여기까지 왔지 이제는 내 차례야",
+    "Started from the bottom with nothing in my hands and now the whole scene knows my name",
+]
+
+
+def _legacy_wrap(draw, text, font, max_width, counter):
+    def width(value):
+        counter[0] += 1
+        return draw.textlength(value, font=font)
+
+    def split_token(token):
+        buffer, lines = "", []
+        for char in token:
+            if width(buffer + char) <= max_width or not buffer:
+                buffer += char
+            else:
+                lines.append(buffer)
+                buffer = char
+        if buffer:
+            lines.append(buffer)
+        return lines
+
+    lines, current = [], ""
+    for word in text.split():
+        tentative = word if not current else f"{current} {word}"
+        if width(tentative) <= max_width:
+            current = tentative
+            continue
+        if current:
+            lines.append(current)
+        if width(word) <= max_width:
+            current = word
+        else:
+            tokens = split_token(word)
+            lines.extend(tokens[:-1])
+            current = tokens[-1]
+    if current:
+        lines.append(current)
+    return lines or [text]
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    font, _ = prepare_fonts()
+    draw = ImageDraw.Draw(Image.new("RGB", (8, 8)))
+    sheet = [SAMPLE_LINES[i % len(SAMPLE_LINES)] + f" {i}" for i in range(line_count)]
+
+    counter = [0]
+    start = time.perf_counter()
+    legacy = [_legacy_wrap(draw, line, font, MAX_WIDTH, counter) for line in sheet]
+    legacy_elapsed = time.perf_counter() - start
+
+    cache = get_font_metrics_cache()
+    cache.clear()
+    start = time.perf_counter()
+    cached = [_wrap_text(draw, line, font, MAX_WIDTH) for line in sheet]
+    cached_elapsed = time.perf_counter() - start
+
+    print(f"legacy wrap : {legacy_elapsed * 1000:8.1f} ms, {counter[0]} measurements")
+    print(f"cached wrap : {cached_elapsed * 1000:8.1f} ms, {cache.misses} measurements")
+    print(f"cache stats : {cache.stats()}")
+    print(f"identical line breaks: {legacy == cached}")
+
+
+if __name__ == "__main__":
+    main()
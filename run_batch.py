@@ -1,50 +1,109 @@
-import json
 import asyncio
+import argparse
 import sys
 import os
+import time
 
 # Add current directory to sys.path
 sys.path.append(os.getcwd())
 
-from app.pipeline.process_manager import ProcessManager, ProcessConfig
+from app.config.paths import BATCH_JOURNAL_PATH
+from app.pipeline.batch_scheduler import (
+    BatchScheduler,
+    apply_journal,
+    format_batch_report,
+    load_batch_jobs,
+    resumable_batch_jobs,
+    synthetic_batch_jobs,
+)
+from app.pipeline.job_journal import JobJournal
+from app.pipeline.metrics import get_metrics, start_metrics_exporters, translation_dedupe_stats
+from app.pipeline.resources import ResourceLimits
+from app.pipeline.sources import offline_sources
 
-def progress_callback(status, percent):
-    print(f"[Progress {percent}%] {status}")
+def progress_callback(name, status, percent):
+    print(f"[Progress {percent}%] {name}: {status}")
 
-async def run_jobs():
-    if not os.path.exists('batch_jobs.json'):
-        print("batch_jobs.json not found.")
+def parse_args():
+    parser = argparse.ArgumentParser(description="batch_jobs.json의 곡들을 동시에 처리")
+    parser.add_argument("--jobs", default="batch_jobs.json", help="작업 목록 JSON 경로")
+    parser.add_argument("--network", type=int, default=4, help="동시 다운로드 수")
+    parser.add_argument("--llm", type=int, default=2, help="동시 번역 호출 수")
+    parser.add_argument("--cpu", type=int, default=1, help="동시 렌더링/인코딩 수")
+    parser.add_argument("--max-active", type=int, default=8, help="동시에 진행 중인 곡 수 상한")
+    parser.add_argument("--output-mode", default="video", choices=("video", "premiere_xml", "preview"))
+    parser.add_argument("--offline", action="store_true",
+                        help="네트워크/LLM 없이 합성 오디오·앨범 아트·번역으로 실행")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="작업 파일 대신 가짜 작업 N개 생성 (--offline 포함)")
+    parser.add_argument("--audio-seconds", type=float, default=30.0, help="오프라인 합성 오디오 길이")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="오프라인 모드에서 다운로드/번역 지연 시간(초)")
+    parser.add_argument("--journal", default=BATCH_JOURNAL_PATH, help="작업 기록(JSONL) 경로")
+    parser.add_argument("--no-journal", action="store_true", help="작업 기록 없이 실행")
+    parser.add_argument("--resume", action="store_true",
+                        help="작업 파일 대신 작업 기록에서 중단/실패한 작업을 이어서 처리")
+    parser.add_argument("--fresh", action="store_true",
+                        help="완료/중단 기록을 무시하고 모든 단계를 다시 실행")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="작업별 구간 기록과 배치 집계 보고서/Chrome trace를 저장할 폴더")
+    parser.add_argument("--workspace-cleanup", default="always", choices=("always", "on_success", "never"),
+                        help="작업 폴더(TEMP_DIR/jobs/<ID>) 정리 정책 (on_success: 실패/취소 시 중간 파일 유지)")
+    parser.add_argument("--segment-workers", type=int, metavar="N",
+                        help="구간 병렬 인코딩 FFmpeg 프로세스 수 (기본값: 설정/LYRIC_SEGMENT_WORKERS, 1이면 단일 인코딩)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="실행 중 Prometheus 지표를 http://127.0.0.1:PORT/metrics 로 제공")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="Prometheus 텍스트 형식 지표를 주기적으로 기록할 파일 (textfile collector용)")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, help="지표 파일 기록 간격(초)")
+    return parser.parse_args()
+
+async def run_jobs(args):
+    journal = None if args.no_journal else JobJournal(args.journal)
+    if args.resume:
+        if journal is None:
+            print("--resume은 작업 기록이 필요합니다.")
+            return
+        jobs = resumable_batch_jobs(journal)
+        if not jobs:
+            print("이어서 처리할 작업이 없습니다.")
+            return
+    elif args.synthetic:
+        jobs = synthetic_batch_jobs(args.synthetic, args.output_mode)
+    elif not os.path.exists(args.jobs):
+        print(f"{args.jobs} not found.")
         return
+    else:
+        jobs = load_batch_jobs(args.jobs, args.output_mode)
+    if journal:
+        apply_journal(jobs, journal, args.fresh)
+
+    sources = None
+    if args.offline or args.synthetic:
+        sources = offline_sources(args.audio_seconds, download_latency=args.latency,
+                                  translation_latency=args.latency)
 
-    with open('batch_jobs.json', 'r', encoding='utf-8') as f:
-        jobs = json.load(f)
-
-    manager = ProcessManager(progress_callback)
-
-    for job in jobs:
-        if not job['album_art_url']:
-            print(f"Skipping {job['artist']} - {job['title']}: Missing album_art_url. Please fill it in batch_jobs.json")
-            continue
-
-        print(f"Processing {job['artist']} - {job['title']}...")
-        
-        config = ProcessConfig(
-            title=job['title'],
-            artist=job['artist'],
-            album_art_url=job['album_art_url'],
-            youtube_url=job['youtube_url'],
-            lrc_path=job['lrc_path'],
-            output_mode="video",
-            prefer_youtube=True
-        )
-        
-        try:
-            await manager.process_async(config)
-            print(f"Successfully processed {job['artist']} - {job['title']}")
-        except Exception as e:
-            print(f"Error processing {job['artist']} - {job['title']}: {e}")
-            import traceback
-            traceback.print_exc()
+    scheduler = BatchScheduler(
+        ResourceLimits(network=args.network, llm=args.llm, cpu=args.cpu),
+        max_active_jobs=args.max_active,
+        sources=sources,
+        on_progress=progress_callback,
+        journal=journal,
+        trace_dir=args.trace,
+        workspace_cleanup=args.workspace_cleanup,
+        segment_workers=args.segment_workers,
+    )
+    started = time.perf_counter()
+    lines_before = get_metrics().translation_line_counts()
+    results = await scheduler.run(jobs)
+    translation = translation_dedupe_stats(lines_before, get_metrics().translation_line_counts())
+    print()
+    print(format_batch_report(results, time.perf_counter() - started, scheduler.pools, translation))
 
 if __name__ == "__main__":
-    asyncio.run(run_jobs())
+    args = parse_args()
+    stop_metrics = start_metrics_exporters(args.metrics_port, args.metrics_file, args.metrics_interval)
+    try:
+        asyncio.run(run_jobs(args))
+    finally:
+        stop_metrics()
@@ -0,0 +1,13 @@
+"""공통 테스트 설정.
+
+실행 데이터(캐시, 작업 폴더, 출력, 기록)를 임시 폴더에 두도록 app을 import하기 전에 LYRIC_DATA_DIR을 지정한다.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="lyric-tests-")
+os.environ["LYRIC_DATA_DIR"] = _data_dir
+atexit.register(shutil.rmtree, _data_dir, True)
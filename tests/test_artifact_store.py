@@ -0,0 +1,76 @@
+"""아티팩트 저장소 조회/복원/LRU 정리."""
+
+import json
+import os
+import time
+
+from app.pipeline.artifact_store import META_SUFFIX, ArtifactStore, artifact_key
+
+
+def write_file(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_store_then_lookup_and_fetch(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    key = artifact_key("audio", "https://youtu.be/example")
+    stored = store.store("audio", key, write_file(tmp_path / "song.mp3", 100), meta={"source": "test"})
+
+    assert stored and stored.endswith(".mp3")
+    assert store.lookup("audio", key) == stored
+    assert store.lookup("audio", artifact_key("audio", "other")) is None
+    assert store.lookup("album_art", key) is None
+
+    dest = tmp_path / "workspace" / "song.mp3"
+    assert store.fetch("audio", key, str(dest))
+    assert dest.read_bytes() == b"x" * 100
+    assert not store.fetch("audio", artifact_key("audio", "other"), str(tmp_path / "missing.mp3"))
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"), max_bytes=250)
+    old_path = store.store("audio", "old", write_file(tmp_path / "old.mp3", 100))
+    recent_path = store.store("audio", "recent", write_file(tmp_path / "recent.mp3", 100))
+    now = time.time()
+    os.utime(old_path, (now - 300, now - 300))
+    os.utime(recent_path, (now - 200, now - 200))
+
+    # 조회하면 사용 시각이 갱신되어 가장 오래 사용하지 않은 항목이 바뀜
+    assert store.lookup("audio", "old") == old_path
+    store.store("audio", "new", write_file(tmp_path / "new.mp3", 100))
+
+    assert store.lookup("audio", "recent") is None
+    assert store.lookup("audio", "old") == old_path
+    assert store.lookup("audio", "new") is not None
+    assert store.stats() == {"audio": {"count": 2, "bytes": 200}}
+    assert not os.path.exists(os.path.join(store.root, "audio", f"recent{META_SUFFIX}"))
+
+
+def test_prune_older_than_and_by_kind(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    stale = store.store("render", "stale", write_file(tmp_path / "stale.mp4", 10))
+    store.store("render", "fresh", write_file(tmp_path / "fresh.mp4", 10))
+    store.store("audio", "other", write_file(tmp_path / "other.mp3", 10))
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+
+    assert store.prune(kind="render", older_than=60) == 1
+    assert store.lookup("render", "stale") is None
+    assert store.lookup("render", "fresh") is not None
+    assert store.prune(max_bytes=0, kind="render") == 1
+    assert store.lookup("audio", "other") is not None
+
+
+def test_lookup_entry_stored_without_extension_in_meta(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    kind_dir = tmp_path / "store" / "album_art"
+    kind_dir.mkdir(parents=True)
+    # 확장자를 기록하기 전 형식의 메타 파일
+    path = write_file(kind_dir / "legacy.jpg", 10)
+    (kind_dir / f"legacy{META_SUFFIX}").write_text(json.dumps({"kind": "album_art", "key": "legacy"}))
+
+    assert store.lookup("album_art", "legacy") == path
+    # 메타 파일이 없는 파일은 저장이 끝나지 않은 항목
+    write_file(kind_dir / "partial.jpg", 10)
+    assert store.lookup("album_art", "partial") is None
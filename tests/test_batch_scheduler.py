@@ -0,0 +1,195 @@
+"""오프라인 합성 배치로 스케줄러 동작 확인 (자원별 동시 실행 제한, 작업 기록 재개, 아티팩트 재사용)."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.config.paths import FFMPEG_PATH
+from app.pipeline import process_manager
+from app.pipeline.artifact_store import ArtifactStore
+from app.pipeline.batch_scheduler import (
+    BatchScheduler,
+    apply_journal,
+    resumable_batch_jobs,
+    synthetic_batch_jobs,
+)
+from app.pipeline.job_journal import JobJournal
+from app.pipeline.resources import ResourceLimits
+from app.pipeline.sources import PipelineSources, offline_sources
+
+# 합성 오디오를 FFmpeg lavfi로 만듦
+pytestmark = pytest.mark.skipif(not os.path.exists(FFMPEG_PATH), reason="FFmpeg 필요")
+
+
+class InFlight:
+    """동시에 실행 중인 호출 수의 최댓값과 전체 호출 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+        self.calls = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.current)
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+class CountingSources:
+    """오프라인 소스에 지연 시간과 동시 실행 계측을 붙임 (다운로드는 오디오+앨범 아트 합산)"""
+
+    def __init__(self, latency: float = 0.1):
+        base = offline_sources(audio_seconds=6.0)
+        self.downloads = InFlight()
+        self.translations = InFlight()
+
+        def download_youtube(url, filename, output_dir):
+            with self.downloads:
+                time.sleep(latency)
+                return base.download_youtube(url, filename, output_dir)
+
+        def download_album_art(url, filepath):
+            with self.downloads:
+                time.sleep(latency)
+                return base.download_album_art(url, filepath)
+
+        async def translate_lrc(*args):
+            with self.translations:
+                await asyncio.sleep(latency)
+                return await base.translate_lrc(*args)
+
+        self.sources = PipelineSources(base.download_spotdl, download_youtube, download_album_art,
+                                       translate_lrc, name=base.name)
+
+
+class FakeRenderer:
+    """make_lyric_video 대신 잠시 대기 후 출력 파일만 쓰는 렌더러 (fail_titles의 곡은 한 번 실패)"""
+
+    def __init__(self, seconds: float = 0.1, fail_titles=()):
+        self.seconds = seconds
+        self.fail_titles = set(fail_titles)
+        self.in_flight = InFlight()
+
+    def __call__(self, audio_path, album_art_path, lyrics_json_path, output_path, options=None):
+        with self.in_flight:
+            time.sleep(self.seconds)
+            for title in list(self.fail_titles):
+                if title in os.path.basename(output_path):
+                    self.fail_titles.discard(title)
+                    raise RuntimeError("렌더링 실패 (테스트)")
+            with open(output_path, "wb") as f:
+                f.write(b"video")
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    fake = FakeRenderer()
+    monkeypatch.setattr(process_manager, "make_lyric_video", fake)
+    return fake
+
+
+@pytest.fixture
+def artifacts(monkeypatch, tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    monkeypatch.setattr(process_manager, "get_artifact_store", lambda: store)
+    return store
+
+
+def run_batch(scheduler, jobs):
+    return asyncio.run(scheduler.run(jobs))
+
+
+@pytest.mark.parametrize("network, llm, cpu", [(2, 1, 1), (3, 2, 2)])
+def test_batch_respects_resource_limits(renderer, artifacts, network, llm, cpu):
+    counting = CountingSources()
+    scheduler = BatchScheduler(ResourceLimits(network=network, llm=llm, cpu=cpu), max_active_jobs=6,
+                               sources=counting.sources)
+
+    results = run_batch(scheduler, synthetic_batch_jobs(6))
+
+    assert [result.status for result in results] == ["success"] * 6
+    assert counting.downloads.peak <= network
+    assert counting.translations.peak <= llm
+    assert renderer.in_flight.peak <= cpu
+    # 제한이 병목인 단계는 여러 곡이 실제로 겹쳐 실행됨
+    assert counting.downloads.peak == network
+    assert scheduler.pools.usage["cpu"].acquisitions == 6
+
+
+def test_rerun_reuses_artifacts(renderer, artifacts):
+    counting = CountingSources(latency=0.0)
+    run_batch(BatchScheduler(sources=counting.sources), synthetic_batch_jobs(2))
+    downloads, translations, renders = counting.downloads.calls, counting.translations.calls, renderer.in_flight.calls
+
+    results = run_batch(BatchScheduler(sources=counting.sources), synthetic_batch_jobs(2))
+
+    assert [result.status for result in results] == ["success"] * 2
+    # 오디오/앨범 아트/번역/렌더링 결과를 모두 저장소에서 복원
+    assert counting.downloads.calls == downloads
+    assert counting.translations.calls == translations
+    assert renderer.in_flight.calls == renders
+    assert set(artifacts.stats()) == {"audio", "album_art", "lyrics", "render"}
+
+
+def test_failed_job_resumes_from_journal(monkeypatch, artifacts, tmp_path):
+    renderer = FakeRenderer(fail_titles={"Offline Song 02"})
+    monkeypatch.setattr(process_manager, "make_lyric_video", renderer)
+    counting = CountingSources(latency=0.0)
+    journal = JobJournal(str(tmp_path / "batch.jsonl"))
+    jobs = synthetic_batch_jobs(3)
+    for job in jobs:
+        # 저장소가 아니라 작업 기록만으로 이어서 처리하는지 확인
+        job.config.use_artifact_cache = False
+    apply_journal(jobs, journal)
+
+    results = run_batch(BatchScheduler(sources=counting.sources, journal=journal, workspace_cleanup="on_success"),
+                        jobs)
+
+    assert [result.status for result in results] == ["success", "failed", "success"]
+    failed_id = jobs[1].config.job_id
+    # 비정상 종료 후 다시 읽은 것처럼 파일에서 새로 읽음
+    reloaded = JobJournal(journal.path)
+    record = reloaded.get(failed_id)
+    assert record.status == "failed"
+    assert {"audio", "album_art", "lyrics"} <= set(record.stages)
+
+    resumed = resumable_batch_jobs(reloaded)
+    assert [job.config.job_id for job in resumed] == [failed_id]
+    downloads, translations = counting.downloads.calls, counting.translations.calls
+    results = run_batch(BatchScheduler(sources=counting.sources, journal=reloaded), resumed)
+
+    assert [result.status for result in results] == ["success"]
+    # 완료된 단계(다운로드/번역)는 다시 실행하지 않고 렌더링부터 이어서 처리
+    assert counting.downloads.calls == downloads
+    assert counting.translations.calls == translations
+    assert reloaded.get(failed_id).status == "done"
+    assert reloaded.unfinished() == []
+
+
+def test_completed_jobs_are_skipped_regardless_of_run_options(renderer, artifacts, tmp_path):
+    counting = CountingSources(latency=0.0)
+    journal = JobJournal(str(tmp_path / "batch.jsonl"))
+    jobs = synthetic_batch_jobs(2)
+    apply_journal(jobs, journal)
+    run_batch(BatchScheduler(sources=counting.sources, journal=journal), jobs)
+
+    rerun = synthetic_batch_jobs(2)
+    # 실행 방식만 바꾸는 옵션은 작업 ID에 영향 없음
+    rerun[0].config.trace_dir = str(tmp_path / "trace")
+    rerun[1].config.workspace_cleanup = "never"
+    apply_journal(rerun, journal)
+
+    assert [job.config.job_id for job in rerun] == [job.config.job_id for job in jobs]
+    assert all(job.skip_reason for job in rerun)
+    results = run_batch(BatchScheduler(sources=counting.sources, journal=journal), rerun)
+    assert [result.status for result in results] == ["skipped", "skipped"]
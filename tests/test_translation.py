@@ -0,0 +1,204 @@
+"""번역 캐시 이전, 부분 번역, 구간 나누기, 중복 줄 합치기 (LLM 대신 가짜 모델 사용)."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.lyrics import ai_models, openai_handler
+from app.lyrics.ai_models import ContextLine, TranslationModel
+from app.lyrics.chunked_translator import ChunkedTranslator, ChunkingOptions, chunk_windows
+from app.lyrics.openai_handler import dedupe_lyric_lines, translate_lyrics
+from app.lyrics.translation_cache import TranslationCache
+
+VOCAB = {
+    "하나": "one",
+    "둘": "two",
+    "셋": "three",
+    "넷": "four",
+    "다섯": "five",
+    "사랑해": "I love you",
+}
+
+
+class FakeModel(TranslationModel):
+    """요청을 기록하고 VOCAB대로 번역 (fail=True면 예외, echo=True면 원문 그대로 반환)"""
+
+    def __init__(self, fail=False, echo=False, delay=0.0):
+        self.fail = fail
+        self.echo = echo
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def translate(self, lyrics, artist, title, context=None):
+        self.requests.append((list(lyrics), context))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.fail:
+            raise RuntimeError("번역 서비스 오류 (테스트)")
+        if self.echo:
+            return list(lyrics)
+        return [VOCAB.get(line.strip(), f"T:{line}") for line in lyrics]
+
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    translation_cache = TranslationCache(str(tmp_path / "translations.sqlite3"), legacy_json_path=None)
+    yield translation_cache
+    translation_cache.close()
+
+
+@pytest.fixture
+def use_model(monkeypatch, cache):
+    """translate_lyrics가 가짜 모델과 임시 캐시를 쓰도록 설정"""
+    monkeypatch.setattr(openai_handler, "client", object())
+    monkeypatch.setattr(openai_handler, "get_translation_cache", lambda: cache)
+
+    def install(model):
+        monkeypatch.setattr(ai_models, "get_model", lambda model_id: model)
+        return model
+
+    return install
+
+
+def translate(lyrics, mode="partial", context_lines=1):
+    return asyncio.run(translate_lyrics(lyrics, "Artist", "Title", mode=mode, context_lines=context_lines))
+
+
+def test_cache_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text(json.dumps({"하나": "one", "둘": "", "셋": "three"}), encoding="utf-8")
+    db_path = str(tmp_path / "translations.sqlite3")
+
+    cache = TranslationCache(db_path, legacy_json_path=str(legacy))
+    assert cache.get_many(["하나", "둘", "셋"]) == {"하나": "one", "셋": "three"}
+    assert not legacy.exists()
+    assert (tmp_path / "translation_cache.json.migrated").exists()
+    cache.close()
+
+    # 이전이 끝난 뒤 생긴 JSON 파일은 다시 가져오지 않음
+    legacy.write_text(json.dumps({"넷": "four"}), encoding="utf-8")
+    cache = TranslationCache(db_path, legacy_json_path=str(legacy))
+    assert cache.get("넷") is None
+    assert cache.stats()["lines"] == 2
+    cache.close()
+
+
+def test_cache_skips_empty_translations(cache):
+    cache.put_many([("하나", "one"), ("둘", ""), ("", "x")])
+    assert cache.get_many(["하나", "둘"]) == {"하나": "one"}
+
+
+def test_partial_translation_sends_only_missing_lines_with_context(use_model, cache):
+    model = use_model(FakeModel())
+    cache.put_many([("하나", "one"), ("둘", "two"), ("넷", "four"), ("다섯", "five")])
+
+    result = translate(["하나", "둘", "셋", "", "넷", "다섯"], context_lines=1)
+
+    assert result == ["one", "two", "three", "", "four", "five"]
+    assert len(model.requests) == 1
+    lines, context = model.requests[0]
+    assert lines == ["셋"]
+    # 빈 줄은 문맥에서 빠지고, 캐시된 주변 줄은 번역과 함께 읽기 전용으로 전달
+    assert [list(passage) for passage in context] == [[
+        ContextLine("둘", translated="two"),
+        ContextLine("셋", index=0),
+    ]]
+    assert cache.get("셋") == "three"
+
+
+def test_full_mode_retranslates_whole_song(use_model, cache):
+    model = use_model(FakeModel())
+    cache.put_many([("하나", "cached one")])
+
+    result = translate(["하나", "둘"], mode="full")
+
+    assert result == ["one", "two"]
+    assert model.requests[0][0] == ["하나", "둘"]
+    assert cache.get("하나") == "one"
+
+
+@pytest.mark.parametrize("model", [FakeModel(fail=True), FakeModel(echo=True)], ids=["failure", "echo"])
+def test_untranslated_lines_are_not_cached(use_model, cache, model):
+    use_model(model)
+    cache.put_many([("하나", "one")])
+
+    result = translate(["하나", "둘", "셋"])
+
+    assert result[0] == "one"
+    assert cache.get_many(["둘", "셋"]) == {}
+    # 다음 실행에서 다시 번역을 시도
+    use_model(FakeModel())
+    assert translate(["하나", "둘", "셋"]) == ["one", "two", "three"]
+    assert cache.get_many(["둘", "셋"]) == {"둘": "two", "셋": "three"}
+
+
+def test_chunk_windows_cover_every_line_once():
+    windows = chunk_windows(10, 4, 1)
+    assert windows == [(0, 5, 0, 4), (3, 9, 4, 8), (7, 10, 8, 10)]
+    kept = [idx for _, _, start, end in windows for idx in range(start, end)]
+    assert kept == list(range(10))
+
+
+def test_chunked_translation_stitches_in_order():
+    lyrics = [f"줄 {i}" for i in range(100)]
+    model = FakeModel(delay=0.01)
+    translator = ChunkedTranslator(model, ChunkingOptions(chunk_lines=40, overlap=4, concurrency=2))
+
+    result = asyncio.run(translator.translate(lyrics, "Artist", "Title"))
+
+    assert result == [f"T:{line}" for line in lyrics]
+    assert sorted(len(lines) for lines, _ in model.requests) == [24, 44, 48]
+    assert model.peak <= 2
+
+
+def test_chunk_mismatch_blanks_only_that_chunk():
+    class ShortModel(FakeModel):
+        async def translate(self, lyrics, artist, title, context=None):
+            translated = await super().translate(lyrics, artist, title, context)
+            return translated[:-1] if lyrics[0] == "줄 4" else translated
+
+    lyrics = [f"줄 {i}" for i in range(12)]
+    translator = ChunkedTranslator(ShortModel(), ChunkingOptions(chunk_lines=4, overlap=0, concurrency=4))
+
+    result = asyncio.run(translator.translate(lyrics, "Artist", "Title"))
+
+    assert result[:4] == [f"T:줄 {i}" for i in range(4)]
+    assert result[4:8] == [""] * 4
+    assert result[8:] == [f"T:줄 {i}" for i in range(8, 12)]
+
+
+def test_dedupe_collapses_normalized_lines():
+    unique, slots, context = dedupe_lyric_lines(["사랑해", "하나", " 사랑해  ", "Hey", "hey"])
+    assert unique == ["사랑해", "하나", "Hey"]
+    assert slots == [0, 1, 0, 2, 2]
+    assert context is None
+
+
+def test_dedupe_remaps_context_to_first_occurrence():
+    context = [[ContextLine("하나", index=0), ContextLine("둘", translated="two")],
+               [ContextLine("하나", index=1)]]
+    unique, slots, remapped = dedupe_lyric_lines(["하나", "하나"], context)
+    assert unique == ["하나"] and slots == [0, 0]
+    # 반복된 줄만 있던 두 번째 구절은 빠짐
+    assert remapped == [[ContextLine("하나", index=0), ContextLine("둘", translated="two")]]
+
+
+def test_repeated_lines_are_translated_once_and_spread(use_model, cache):
+    model = use_model(FakeModel())
+    lyrics = ["사랑해", "하나", "사랑해", "둘", "사랑해 ", "하나"]
+
+    result = translate(lyrics)
+
+    assert model.requests[0][0] == ["사랑해", "하나", "둘"]
+    assert result == ["I love you", "one", "I love you", "two", "I love you", "one"]
+    assert cache.get_many(["사랑해", "하나", "둘"]) == {"사랑해": "I love you", "하나": "one", "둘": "two"}